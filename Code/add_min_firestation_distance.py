@@ -1,40 +1,40 @@
+import os
 import pandas as pd
 import numpy as np
 
+from dataset_store import write_dataset
+from datasets import ROAD_NETWORK_PATH, load_buildings
+from nearest_facility import facility_features, hydrant_type_distances, load_facilities, save_facility_snapshot
+
 # 데이터 불러오기
-df_building = pd.read_csv('../Data/건축물대장_v0.2.csv')
-df_hydrant = pd.read_csv('../Data/대구광역시_용수시설_위치.csv')
-df_firestation = pd.read_csv('../Data/대구광역시_소방서_위치.csv')
-
-# 거리계산 함수 정의
-def haversine_min_distance(lat1, lon1, hy_lats, hy_lons):
-    R = 6371000  # 지구 반지름 (m)
-    lat1 = np.radians(lat1)
-    lon1 = np.radians(lon1)
-    
-    dlat = hy_lats - lat1
-    dlon = hy_lons - lon1
-    a = np.sin(dlat / 2)**2 + np.cos(lat1) * np.cos(hy_lats) * np.sin(dlon / 2)**2
-    c = 2 * np.arcsin(np.sqrt(a))
-    distances = R * c
-    return distances.min()
-
-# 위경도 라디안화
-hydrant_lats = np.radians(df_hydrant["위도"].values)
-hydrant_lons = np.radians(df_hydrant["경도"].values)
-station_lats = np.radians(df_firestation["위도"].values)
-station_lons = np.radians(df_firestation["경도"].values)
-
-# 소화전거리 계산 및 추가
-df_building['소방용수시설거리'] = df_building.apply(
-    lambda row: haversine_min_distance(row["위도"], row["경도"], hydrant_lats, hydrant_lons),
-    axis=1
-)
-# 소방서거리 계산 및 추가
-df_building["소방서거리"] = df_building.apply(
-    lambda row: haversine_min_distance(row["위도"], row["경도"], station_lats, station_lons),
-    axis=1
-)
-
-# 결과 저장
-df_building.to_csv('../Data/건축물대장_v0.3.csv', index=False)
\ No newline at end of file
+df_building = load_buildings('v0.3')
+
+# 소화전/소방서 피처 계산 및 추가 (시설별 KD-tree 한 번 조회)
+# - 소방용수시설거리, 소방용수시설수_50m/100m/150m, 최근접소방용수시설(시설번호)
+# - 소방서거리, 소방서2순위거리, 최근접소방서(119안전센터명)
+# 거리는 최근접 후보 중 haversine 거리 → 기존 계산과 같은 값
+facilities = {name: load_facilities(name) for name in ['hydrants', 'stations']}
+features = facility_features(df_building, ['hydrants', 'stations'], facilities=facilities)
+for col, values in features.items():
+    df_building[col] = values
+
+# 소방용수시설 유형별 최근접 거리 (지상식소화전거리, 지하식소화전거리, 급수탑거리 ...)
+# 유형별 KD-tree를 병렬로 조회 → 점수/분석에서 사용 가능한 유형만 골라 쓸 수 있음
+for col, values in hydrant_type_distances(df_building, fac=facilities['hydrants']).items():
+    df_building[col] = values
+
+# 소방서 도로거리/소요시간 (선택: 도로망 파일이 있을 때만)
+# 모든 소방서에서 출발하는 다중 출발점 Dijkstra 한 번 → 건물은 가장 가까운 도로 노드 값 사용
+if os.path.exists(ROAD_NETWORK_PATH):
+    from road_network import load_road_network, station_network_features
+
+    network = load_road_network(ROAD_NETWORK_PATH)
+    for col, values in station_network_features(df_building, network, facilities['stations']).items():
+        df_building[col] = values
+
+# 결과 저장 (이후 단계/시각화는 저장된 거리를 그대로 사용)
+write_dataset(df_building, '../Data/건축물대장_v0.4.csv')
+
+# 계산에 쓴 시설 목록 저장 (시설 파일이 바뀌면 distance_update.py가 변경분만 반영)
+for name, fac in facilities.items():
+    save_facility_snapshot(name, fac)
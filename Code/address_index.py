@@ -0,0 +1,132 @@
+import os
+import re
+import glob
+
+import numpy as np
+import pandas as pd
+
+from address_normalize import normalize_addresses, normalize_address
+
+# 지번 주소 끝부분: [산] 본번[-부번]
+_LOT_PATTERN = r"^(?P<area>.*?)\s*(?P<san>산)?\s*(?P<bon>\d+)(?:\s*-\s*(?P<bu>\d+))?$"
+
+
+# 정규화된 주소 → (지역, 산 여부, 본번, 부번) 분해
+def split_lot(keys):
+    parts = keys.str.extract(_LOT_PATTERN)
+    area = parts["area"].fillna(keys).astype(str)
+    san = parts["san"].notna().to_numpy()
+    bon = pd.to_numeric(parts["bon"], errors="coerce").fillna(-1).astype(np.int64).to_numpy()
+    bu = pd.to_numeric(parts["bu"], errors="coerce").fillna(0).astype(np.int64).to_numpy()
+    return area.to_numpy(dtype=str), san, bon, bu
+
+
+# 지오코딩이 끝난 건축물대장 파일로 만든 오프라인 주소 → 좌표 인덱스
+# - 정확 일치: dict, O(1)
+# - 지역(동/리) 접두어 범위: (지역, 산, 본번, 부번) 정렬 배열에 searchsorted
+# - 근사 일치: 같은 지역 안에서 본번/부번이 가장 가까운 지번
+class AddressIndex:
+    _ARRAYS = ("keys", "area", "san", "bon", "bu", "lat", "lon")
+
+    def __init__(self, keys, lat, lon):
+        keys = pd.Series(keys, dtype="string")
+        area, san, bon, bu = split_lot(keys)
+        order = np.lexsort((bu, bon, san, area))
+        self._set_arrays(
+            keys=keys.to_numpy(dtype=str)[order],
+            area=area[order], san=san[order], bon=bon[order], bu=bu[order],
+            lat=np.asarray(lat, dtype=float)[order],
+            lon=np.asarray(lon, dtype=float)[order],
+        )
+
+    def _set_arrays(self, **arrays):
+        for name in self._ARRAYS:
+            setattr(self, name, arrays[name])
+        self._pos = dict(zip(self.keys.tolist(), range(len(self.keys))))
+
+    def __len__(self):
+        return len(self.keys)
+
+    # 위경도가 채워진 CSV 파일들로부터 생성
+    @classmethod
+    def from_files(cls, paths, addr_col="대지위치"):
+        frames = []
+        for path in paths:
+            cols = pd.read_csv(path, nrows=0).columns
+            if not {addr_col, "위도", "경도"} <= set(cols):
+                continue
+            df = pd.read_csv(path, usecols=[addr_col, "위도", "경도"])
+            frames.append(df.dropna(subset=["위도", "경도"]))
+        df = pd.concat(frames, ignore_index=True)
+        df["_key"] = normalize_addresses(df[addr_col])
+        df = df.dropna(subset=["_key"]).groupby("_key", sort=False)[["위도", "경도"]].first()
+        return cls(df.index, df["위도"], df["경도"])
+
+    @classmethod
+    def from_dir(cls, directory, pattern="*.csv"):
+        return cls.from_files(sorted(glob.glob(os.path.join(directory, pattern))))
+
+    def save(self, path):
+        np.savez(path, **{name: getattr(self, name) for name in self._ARRAYS})
+
+    # 저장된 정렬 배열을 그대로 사용 (재정렬/재분해 없음)
+    @classmethod
+    def load(cls, path):
+        index = cls.__new__(cls)
+        with np.load(path) as z:
+            index._set_arrays(**{name: z[name] for name in cls._ARRAYS})
+        return index
+
+    def _area_range(self, area):
+        lo = np.searchsorted(self.area, area, side="left")
+        hi = np.searchsorted(self.area, area, side="right")
+        return lo, hi
+
+    # 접두어로 시작하는 모든 항목 (예: '대구광역시 달서구 진천동', '... 진천동 83')
+    def prefix(self, prefix):
+        area = re.sub(r"\s*산?\s*[\d-]*$", "", prefix)
+        lo = np.searchsorted(self.area, area, side="left")
+        hi = np.searchsorted(self.area, area + "\uffff", side="left")
+        idx = lo + np.flatnonzero(np.char.startswith(self.keys[lo:hi], prefix))
+        return pd.DataFrame(
+            {"위도": self.lat[idx], "경도": self.lon[idx]},
+            index=pd.Index(self.keys[idx], name="주소"),
+        )
+
+    # 주소 하나 조회 → {"lat", "lon"} 또는 None
+    # fuzzy=True면 같은 지역·같은 산 구분에서 본번 차이 max_gap 이내의 가장 가까운 지번 사용
+    # (다른 지번 좌표이므로 결과에 "matched": 실제로 쓴 주소 키를 붙여 확인할 수 있게 함)
+    def lookup(self, address, fuzzy=False, max_gap=0):
+        key = normalize_address(address)
+        if key is None:
+            return None
+        i = self._pos.get(key)
+        if i is not None:
+            return {"lat": float(self.lat[i]), "lon": float(self.lon[i])}
+        if not fuzzy:
+            return None
+
+        area, san, bon, bu = split_lot(pd.Series([key], dtype="string"))
+        if bon[0] < 0:
+            return None
+        lo, hi = self._area_range(area[0])
+        if lo == hi:
+            return None
+        cand = np.arange(lo, hi)
+        cand = cand[(self.san[lo:hi] == san[0]) & (np.abs(self.bon[lo:hi] - bon[0]) <= max_gap)]
+        if len(cand) == 0:
+            return None
+        dist = np.abs(self.bon[cand] - bon[0]) * 100000 + np.abs(self.bu[cand] - bu[0])
+        j = cand[np.argmin(dist)]
+        return {"lat": float(self.lat[j]), "lon": float(self.lon[j]), "matched": str(self.keys[j])}
+
+
+# 저장된 인덱스가 원본 파일보다 최신이면 로드, 아니면 새로 만들어 저장
+def load_or_build_index(index_path, source_dir, pattern="*.csv"):
+    paths = sorted(glob.glob(os.path.join(source_dir, pattern)))
+    if os.path.exists(index_path) and paths:
+        if os.path.getmtime(index_path) >= max(os.path.getmtime(p) for p in paths):
+            return AddressIndex.load(index_path)
+    index = AddressIndex.from_files(paths)
+    index.save(index_path)
+    return index
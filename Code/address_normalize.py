@@ -0,0 +1,54 @@
+import re
+
+import pandas as pd
+
+# 대지위치 정규화 규칙 (순서대로 적용)
+# '대구광역시  달서구 진천동 0833 - 03번지 외 2필지' → '대구광역시 달서구 진천동 833-3'
+_RULES = [
+    (r"\([^)]*\)", " "),                 # 괄호 주석
+    (r"\s*외\s*\d*\s*필지", ""),          # '외 3필지'
+    (r"\s*번지(?=\s|$)", ""),             # '번지'
+    (r"[,.\s]+$", ""),                   # 끝 구두점/공백
+    (r"\s+", " "),                       # 연속 공백
+    (r"\s*-\s*", "-"),                   # '833 - 3'
+    (r"산\s+(\d)", r"산\1"),              # '산 12'
+    (r"(?<![\d-])0+(\d)", r"\1"),         # 본번 앞 0
+    (r"-0+(\d)", r"-\1"),                # 부번 앞 0
+]
+_COMPILED = [(re.compile(p), r) for p, r in _RULES]
+
+
+# 주소 Series 정규화 (벡터화)
+def normalize_addresses(s):
+    s = s.astype("string").str.strip()
+    for pattern, repl in _RULES:
+        s = s.str.replace(pattern, repl, regex=True)
+    s = s.str.strip()
+    return s.replace("", pd.NA)
+
+
+# 단일 주소 정규화 (normalize_addresses와 같은 규칙, 조회용)
+def normalize_address(addr):
+    if not isinstance(addr, str):
+        return None
+    s = addr.strip()
+    for pattern, repl in _COMPILED:
+        s = pattern.sub(repl, s)
+    return s.strip() or None
+
+
+# 지오코딩 전 주소 정규화 + 중복 제거
+# 반환: (행별 정규화 키 Series, 고유 키 배열)
+# 정규화는 고유 원문 주소에 대해서만 한 번씩 수행 후 행으로 펼침
+def canonicalize_addresses(s, verbose=True):
+    codes, raw_uniques = pd.factorize(s, use_na_sentinel=True)
+    canon = normalize_addresses(pd.Series(raw_uniques, dtype="string"))
+    keys = pd.Series(pd.NA, index=s.index, dtype="string")
+    valid = codes >= 0
+    keys[valid] = canon.to_numpy()[codes[valid]]
+    uniques = keys.dropna().unique()
+
+    if verbose and len(raw_uniques):
+        ratio = 1 - len(uniques) / len(raw_uniques)
+        print(f"고유 주소 {len(raw_uniques)} → {len(uniques)} ({ratio:.1%} 감소)")
+    return keys, uniques
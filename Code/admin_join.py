@@ -0,0 +1,227 @@
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely import STRtree
+
+from datasets import DATA_DIR
+from projection import PROJECTED_CRS, project, unproject
+
+ADMIN_SHP = os.path.join(DATA_DIR, "시각화", "대구_행정동", "대구_행정동_군위포함.shp")
+SIGUNGU_SHP = os.path.join(DATA_DIR, "시각화", "대구_시군구_군위포함", "대구광역시_시군구_군위포함.shp")
+ADMIN_INDEX_PATH = os.path.join(DATA_DIR, "시각화", "대구_행정동", "_admin_index.npz")
+ADMIN_RASTER_PATH = os.path.join(DATA_DIR, "시각화", "대구_행정동", "_admin_raster.npy")
+
+# 병렬 처리 시 한 번에 조회할 건물 수
+ADMIN_CHUNK_SIZE = 50000
+
+# 행정동 격자 셀 크기 (m, EPSG:5186) — 20m면 대구(군위 포함) 전체가 약 2,700 × 3,600 셀, int16 약 20MB
+ADMIN_RASTER_CELL = 20
+
+# 격자 셀 값: 0 이상 = 행정동 위치, RASTER_OUTSIDE = 모든 경계 밖, RASTER_BOUNDARY = 경계선이 지나는 셀
+RASTER_OUTSIDE = -1
+RASTER_BOUNDARY = -2
+
+
+# 행정동 번호 격자 (EPSG:5186, 셀 하나 = cell_size m)
+# - 경계선이 지나지 않는 셀은 셀 전체가 한 동 안(또는 밖)이므로 격자 값만으로 O(1) 판정
+# - 경계선이 지나는 셀(RASTER_BOUNDARY)만 AdminIndex의 정확 판정으로 넘김
+# - .npy + 메타데이터(.json)로 저장, np.memmap으로 열어 필요한 페이지만 읽음
+class AdminRaster:
+    def __init__(self, cells, x0, y0, cell_size):
+        self.cells = cells
+        self.x0, self.y0, self.cell_size = float(x0), float(y0), float(cell_size)
+
+    @property
+    def shape(self):
+        return self.cells.shape
+
+    # 행정동 경계 인덱스로 격자 생성
+    @classmethod
+    def from_index(cls, index, cell_size=ADMIN_RASTER_CELL):
+        from scipy import ndimage
+
+        # 경계선을 셀 크기보다 짧은 간격으로 나눠 EPSG:5186 꼭짓점으로 변환
+        # (위도 1도 ≈ 111km가 경도 1도보다 길므로 도 단위 간격 × 111km ≥ 실제 간격)
+        step = 0.9 * cell_size / 111320
+        lines = shapely.segmentize(shapely.boundary(index.geoms), step)
+        lonlat = shapely.get_coordinates(lines)
+        xy = project(lonlat[:, 1], lonlat[:, 0])
+
+        # 경계 꼭짓점 범위 + 여유 1셀
+        x0, y0 = xy.min(axis=0) - cell_size
+        n_cols, n_rows = np.ceil((xy.max(axis=0) + cell_size - (x0, y0)) / cell_size).astype(int) + 1
+        rows = ((xy[:, 1] - y0) // cell_size).astype(np.int64)
+        cols = ((xy[:, 0] - x0) // cell_size).astype(np.int64)
+
+        # 꼭짓점 간격 ≤ 셀 크기이므로 경계선이 지나는 셀은 꼭짓점이 있는 셀의 이웃(3×3) 안에 있음
+        boundary = np.zeros((n_rows, n_cols), dtype=bool)
+        boundary[rows, cols] = True
+        boundary = ndimage.binary_dilation(boundary, structure=np.ones((3, 3), dtype=bool))
+
+        # 경계 셀로 나뉜 영역은 영역 전체가 같은 동 → 영역마다 셀 중심 하나만 정확 판정
+        regions, n_regions = ndimage.label(~boundary)
+        _, first = np.unique(regions.ravel(), return_index=True)
+        first = first[1:] if regions.ravel()[first[0]] == 0 else first
+        r, c = np.unravel_index(first, regions.shape)
+        lat, lon = unproject(x0 + (c + 0.5) * cell_size, y0 + (r + 0.5) * cell_size)
+        region_loc = np.r_[RASTER_BOUNDARY, index.locate_exact(lat, lon)]
+
+        dtype = np.int16 if len(index) < np.iinfo(np.int16).max else np.int32
+        return cls(region_loc[regions].astype(dtype), x0, y0, cell_size)
+
+    def save(self, path):
+        np.save(path, np.ascontiguousarray(self.cells))
+        meta = {"x0": self.x0, "y0": self.y0, "cell_size": self.cell_size, "crs": PROJECTED_CRS}
+        with open(os.path.splitext(path)[0] + ".json", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(os.path.splitext(path)[0] + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(np.load(path, mmap_mode="r"), meta["x0"], meta["y0"], meta["cell_size"])
+
+    # 위경도 → 격자 값 (격자 밖/좌표 없음은 RASTER_OUTSIDE)
+    def lookup(self, lat, lon):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        out = np.full(lat.shape, RASTER_OUTSIDE, dtype=np.int64)
+        valid = np.isfinite(lat) & np.isfinite(lon)
+        if not valid.any():
+            return out
+        xy = project(lat[valid], lon[valid])
+        rows = np.floor((xy[:, 1] - self.y0) / self.cell_size).astype(np.int64)
+        cols = np.floor((xy[:, 0] - self.x0) / self.cell_size).astype(np.int64)
+        n_rows, n_cols = self.shape
+        in_grid = (rows >= 0) & (rows < n_rows) & (cols >= 0) & (cols < n_cols)
+        values = np.full(len(rows), RASTER_OUTSIDE, dtype=np.int64)
+        values[in_grid] = self.cells[rows[in_grid], cols[in_grid]]
+        out[valid] = values
+        return out
+
+
+# 행정동 경계 공간 인덱스 (EPSG:4326, 건물 위경도를 그대로 조회)
+# - 경계는 prepared geometry + STRtree, 점은 shapely.points로 한 번에 생성
+# - contains 판정이라 경계선 위의 점은 어느 동에도 속하지 않음 (기존 sjoin within과 같음)
+# 반환 컬럼: ADM_DR_CD, ADM_DR_NM, 구군코드(ADM_DR_CD 앞 5자리), 구군
+class AdminIndex:
+    _ARRAYS = ("wkb", "adm_cd", "adm_nm", "gu_cd", "gu_nm")
+
+    def __init__(self, geoms, adm_cd, adm_nm, gu_names):
+        adm_cd = np.asarray(adm_cd, dtype=str)
+        gu_cd = np.array([c[:5] for c in adm_cd])
+        self._set_arrays(
+            wkb=np.asarray(shapely.to_wkb(geoms), dtype=object),
+            adm_cd=adm_cd,
+            adm_nm=np.asarray(adm_nm, dtype=str),
+            gu_cd=gu_cd,
+            gu_nm=np.array([gu_names.get(c, "") for c in gu_cd]),
+        )
+
+    def _set_arrays(self, **arrays):
+        for name in self._ARRAYS:
+            setattr(self, name, arrays[name])
+        self.geoms = shapely.from_wkb(self.wkb)
+        shapely.prepare(self.geoms)
+        self.tree = STRtree(self.geoms)
+        self.raster = None
+
+    def __len__(self):
+        return len(self.geoms)
+
+    # 행정동/시군구 shapefile로 생성 (EPSG:4326으로 변환)
+    @classmethod
+    def from_shapefiles(cls, admin_path=ADMIN_SHP, sigungu_path=SIGUNGU_SHP):
+        import geopandas as gpd
+
+        admin = gpd.read_file(admin_path).to_crs("EPSG:4326")
+        sigungu = gpd.read_file(sigungu_path, ignore_geometry=True)
+        gu_names = dict(zip(sigungu["SIGUNGU_CD"].astype(str), sigungu["SIGUNGU_NM"]))
+        return cls(admin.geometry.values, admin["ADM_DR_CD"], admin["ADM_DR_NM"], gu_names)
+
+    def save(self, path):
+        np.savez(path, **{name: getattr(self, name) for name in self._ARRAYS})
+
+    @classmethod
+    def load(cls, path):
+        index = cls.__new__(cls)
+        with np.load(path, allow_pickle=True) as z:
+            index._set_arrays(**{name: z[name] for name in cls._ARRAYS})
+        return index
+
+    # 위경도 → 행정동 위치 (없으면 -1)
+    # 격자(self.raster)가 있으면 경계 셀에 있는 점만 정확 판정
+    def locate(self, lat, lon):
+        if self.raster is None:
+            return self.locate_exact(lat, lon)
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        out = self.raster.lookup(lat, lon)
+        exact = out == RASTER_BOUNDARY
+        if exact.any():
+            out[exact] = self.locate_exact(lat[exact], lon[exact])
+        return out
+
+    def locate_exact(self, lat, lon):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        # bbox 후보만 STRtree로 고르고, prepared 경계에 contains_xy로 정확 판정
+        # (tree.query(predicate="within")는 점마다 prepared되지 않은 판정이라 훨씬 느림)
+        point_idx, poly_idx = self.tree.query(shapely.points(lon, lat))
+        inside = shapely.contains_xy(self.geoms[poly_idx], lon[point_idx], lat[point_idx])
+        point_idx, poly_idx = point_idx[inside], poly_idx[inside]
+        out = np.full(len(lat), -1, dtype=np.int64)
+        # 겹치는 경계가 있으면 첫 번째 동
+        out[point_idx[::-1]] = poly_idx[::-1]
+        return out
+
+    # 건물 DataFrame(위도/경도) → 행정동/구군 컬럼, 청크를 스레드로 병렬 조회
+    def assign(self, df, chunk_size=ADMIN_CHUNK_SIZE, max_workers=None):
+        lat = df["위도"].to_numpy(dtype=np.float64)
+        lon = df["경도"].to_numpy(dtype=np.float64)
+        starts = range(0, len(lat), chunk_size)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            parts = pool.map(lambda s: self.locate(lat[s:s + chunk_size], lon[s:s + chunk_size]), starts)
+            loc = np.concatenate(list(parts)) if len(lat) else np.empty(0, dtype=np.int64)
+
+        found = loc >= 0
+        out = {}
+        for col, values in (("ADM_DR_CD", self.adm_cd), ("ADM_DR_NM", self.adm_nm),
+                            ("구군코드", self.gu_cd), ("구군", self.gu_nm)):
+            cats = pd.unique(values)
+            codes = np.where(found, pd.Categorical(values, categories=cats).codes[np.maximum(loc, 0)], -1)
+            out[col] = pd.Categorical.from_codes(codes, categories=cats)
+        return pd.DataFrame(out, index=df.index)
+
+
+# 저장된 인덱스가 shapefile보다 최신이면 그대로 사용, 아니면 새로 만들어 저장
+# raster_path가 있으면 행정동 격자도 같은 방식으로 불러와 locate에 사용 (None이면 정확 판정만)
+def load_or_build_admin_index(index_path=ADMIN_INDEX_PATH, admin_path=ADMIN_SHP, sigungu_path=SIGUNGU_SHP,
+                              raster_path=ADMIN_RASTER_PATH):
+    sources = [admin_path, sigungu_path]
+    if os.path.exists(index_path) and os.path.getmtime(index_path) >= max(os.path.getmtime(p) for p in sources):
+        index = AdminIndex.load(index_path)
+    else:
+        index = AdminIndex.from_shapefiles(admin_path, sigungu_path)
+        index.save(index_path)
+    if raster_path is not None:
+        index.raster = load_or_build_admin_raster(index, raster_path, index_path)
+    return index
+
+
+# 격자가 인덱스 파일보다 최신이면 memmap으로 열고, 아니면 인덱스로 새로 만들어 저장
+def load_or_build_admin_raster(index, raster_path=ADMIN_RASTER_PATH, index_path=ADMIN_INDEX_PATH,
+                               cell_size=ADMIN_RASTER_CELL):
+    meta_path = os.path.splitext(raster_path)[0] + ".json"
+    if all(os.path.exists(p) for p in (raster_path, meta_path)) and \
+            os.path.getmtime(raster_path) >= os.path.getmtime(index_path):
+        raster = AdminRaster.load(raster_path)
+        if raster.cell_size == cell_size:
+            return raster
+    raster = AdminRaster.from_index(index, cell_size)
+    raster.save(raster_path)
+    return AdminRaster.load(raster_path)
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+# 주소 앞부분: [시/도] 구/군 [법정동/읍/면]
+# '대구광역시 달서구 진천동 833-3번지' → 구군=달서구, 법정동=진천동
+# '대구광역시 군위군 군위읍 동부리 12' → 구군=군위군, 법정동=군위읍
+_ADMIN_PATTERN = (
+    r"^\s*(?:[가-힣]+(?:특별시|광역시|특별자치시|도)\s+)?"
+    r"(?P<구군>[가-힣]+[구군])"
+    r"(?:\s+(?P<법정동>[가-힣0-9]+(?:동|가|읍|면)))?"
+)
+
+
+def _categorical_from_uniques(values, codes):
+    cats, cat_codes = np.unique(values.dropna().to_numpy(dtype=str), return_inverse=True)
+    per_unique = np.full(len(values), -1, dtype=np.int32)
+    per_unique[values.notna().to_numpy()] = cat_codes
+    row_codes = np.where(codes >= 0, per_unique[codes], -1)
+    return pd.Categorical.from_codes(row_codes, categories=cats)
+
+
+# 끝의 지번 토큰 ('833-3번지', '산 12')
+_LOT_SUFFIX = r"\s+(?:산\s*)?\d[\d-]*\S*$"
+# 지번 뒤의 '외 N필지' (지번보다 먼저 제거)
+_EXTRA_LOTS = r"\s*외\s*\d+\s*필지\s*$"
+
+
+# 대지위치 → 구군, 법정동 (pandas Categorical)
+# 지번을 떼어낸 주소 앞부분(고유값 수백 개)만 정규식으로 파싱한 뒤 코드로 전체 행에 펼침
+def extract_admin_names(addresses):
+    prefixes = (addresses.astype("string")
+                .str.replace(_EXTRA_LOTS, "", regex=True)
+                .str.replace(_LOT_SUFFIX, "", regex=True))
+    codes, uniques = pd.factorize(prefixes, use_na_sentinel=True)
+    parsed = pd.Series(uniques, dtype="string").str.extract(_ADMIN_PATTERN)
+    return pd.DataFrame(
+        {col: _categorical_from_uniques(parsed[col], codes) for col in ("구군", "법정동")},
+        index=addresses.index,
+    )
+
+
+def extract_gu_gun(addresses):
+    return extract_admin_names(addresses)["구군"]
@@ -5,6 +5,9 @@ import geopandas as gpd
 from shapely.geometry import Polygon
 import folium
 import branca.colormap as cm
+
+from datasets import load, load_buildings
+
 # %% 정사각형 그리드 생성 함수
 # ------------------------------
 def generate_square_grid(polygon, cell_size_m=100):
@@ -36,20 +39,20 @@ dnm_gdf_filtered = dnm_gdf[cond1|cond2]
 daegu_polygon = dnm_gdf_filtered.union_all()
 
 # %% 용수시설 & 필터링
-hyd = pd.read_csv('../Data/소방용수시설_동추가.csv')
+hyd = load('hydrants_dong')
 cond3 = hyd['ADM_NM'] == '하빈면'
 cond4 = hyd['ADM_NM'] == '가창면'
 hyd_filtered = hyd[cond3|cond4]
 gdf_fire = gpd.GeoDataFrame(hyd_filtered, geometry=gpd.points_from_xy(hyd_filtered['경도'], hyd_filtered['위도']), crs='EPSG:4326')
 
 # %% 소방서 & 필터링
-df_station = pd.read_csv('../Data/대구광역시_소방서_위치.csv')
+df_station = load('stations')
 station_filtered = df_station[df_station['동이름'] == '가창'] # 하빈면은 없음
 gdf_station = gpd.GeoDataFrame(station_filtered, geometry=gpd.points_from_xy(station_filtered['경도'], station_filtered['위도']), crs='EPSG:4326')
 
 
 # %% 건물 데이터 (예: 건물높이, 건물나이 포함) & 필터링
-building = pd.read_csv('../Data/건축물대장_v0.6.csv')
+building = load_buildings('v0.6', columns=['ADM_DR_NM', '위도', '경도', '주용도점수', '건물노후도점수'])
 building.columns
 cond5 = building['ADM_DR_NM'] == '가창면'
 cond6 = building['ADM_DR_NM'] == '하빈면'
@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+# Parquet에 float32로 저장할 컬럼 (점수만)
+# 좌표/거리는 float64 그대로: read_dataset이 Parquet을 우선 읽으므로 여기서 줄이면 값이 반올림됨
+FLOAT32_COLUMNS = ()
+FLOAT32_SUFFIXES = ("점수",)
+
+# 고유값 비율이 이 값 이하인 문자열 컬럼은 category로 저장
+CATEGORY_MAX_RATIO = 0.5
+
+
+def parquet_path(csv_path):
+    return os.path.splitext(str(csv_path))[0] + ".parquet"
+
+
+# 저장 전 dtype 압축: 점수 float32, 반복 많은 문자열 category
+def compact_dtypes(df):
+    df = df.copy()
+    for col in df.columns:
+        s = df[col]
+        if (col in FLOAT32_COLUMNS or str(col).endswith(FLOAT32_SUFFIXES)) \
+                and pd.api.types.is_float_dtype(s):
+            df[col] = s.astype(np.float32)
+        elif pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+            n = len(s)
+            if n and s.nunique(dropna=True) <= n * CATEGORY_MAX_RATIO:
+                df[col] = s.astype("category")
+    return df
+
+
+# 데이터셋 저장: Parquet(기본) + 필요하면 CSV도 같이 저장
+# csv_path 기준으로 같은 이름의 .parquet 파일을 만든다
+# (CSV를 먼저 써야 Parquet이 더 최신으로 잡혀 read_dataset이 Parquet을 읽음)
+def write_dataset(df, csv_path, csv=True, csv_encoding="utf-8-sig"):
+    if csv or not HAS_PARQUET:
+        df.to_csv(csv_path, index=False, encoding=csv_encoding)
+    if HAS_PARQUET:
+        compact_dtypes(df).to_parquet(parquet_path(csv_path), index=False)
+
+
+# 데이터셋 읽기: 최신 Parquet이 있으면 필요한 컬럼만 읽고, 없으면 CSV
+def read_dataset(csv_path, columns=None, **csv_kwargs):
+    pq = parquet_path(csv_path)
+    if HAS_PARQUET and os.path.exists(pq) and (
+        not os.path.exists(csv_path) or os.path.getmtime(pq) >= os.path.getmtime(csv_path)
+    ):
+        return pd.read_parquet(pq, columns=list(columns) if columns is not None else None)
+
+    if columns is not None:
+        wanted = set(columns)
+        csv_kwargs["usecols"] = lambda c: c in wanted
+    df = pd.read_csv(csv_path, **csv_kwargs)
+    return df if columns is None else df[[c for c in columns if c in df.columns]]
@@ -0,0 +1,157 @@
+import os
+import codecs
+
+import pandas as pd
+
+from dataset_store import read_dataset
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DATA_DIR = os.path.join(BASE_DIR, "Data")
+RAW_DIR = os.path.join(BASE_DIR, "Raw Data")
+
+# 도로망 (OSM XML 추출본, 있을 때만 소방서 도로거리 계산)
+ROAD_NETWORK_PATH = os.path.join(RAW_DIR, "도로망", "대구광역시.osm")
+
+# 데이터셋별 스키마
+# - path: 파일 경로
+# - dtypes: 고정 dtype (category / string / float32 / float64 ...)
+# - 스키마에 없는 정수 컬럼은 읽은 뒤 가능한 작은 int로 downcast (실수는 float64 유지)
+BUILDING_DTYPES = {
+    "대지위치": "string",
+    "구조코드명": "category",
+    "기타구조": "category",
+    "주용도코드명": "category",
+    "사용승인년도": "category",
+    "ADM_DR_NM": "category",
+    "ADM_DR_CD": "category",
+    "구군": "category",
+    "구군코드": "category",
+    "법정동": "category",
+    "위도": "float64",
+    "경도": "float64",
+}
+
+_FACILITY_DTYPES = {
+    "시설번호": "string",
+    "시도명": "category",
+    "시군구명": "category",
+    "소재지도로명주소": "string",
+    "소재지지번주소": "string",
+    "상세위치": "string",
+    "안전센터명": "category",
+    "보호틀유무": "category",
+    "관할기관명": "category",
+    "관할기관전화번호": "category",
+    "데이터기준일자": "category",
+    "위도": "float64",
+    "경도": "float64",
+}
+
+SCHEMAS = {
+    # 소방용수시설 (소화전/급수탑/저수조 등)
+    "hydrants": {
+        "path": os.path.join(DATA_DIR, "대구광역시_용수시설_위치.csv"),
+        "dtypes": _FACILITY_DTYPES,
+    },
+    # 소방용수시설 + 행정동
+    "hydrants_dong": {
+        "path": os.path.join(DATA_DIR, "소방용수시설_동추가.csv"),
+        "dtypes": {**_FACILITY_DTYPES, "geometry": "string", "ADM_CD": "category", "ADM_NM": "category"},
+    },
+    # 119안전센터
+    "stations": {
+        "path": os.path.join(DATA_DIR, "대구광역시_소방서_위치.csv"),
+        "dtypes": {"소방서명": "category", "119안전센터명": "string", "주소": "string",
+                   "구이름": "category", "동이름": "category", "위도": "float64", "경도": "float64"},
+    },
+    # 비상 소화장치
+    "devices": {
+        "path": os.path.join(DATA_DIR, "대구광역시_소방장치_위치.csv"),
+        "dtypes": {"주소": "string", "구이름": "category", "동이름": "category",
+                   "위도": "float64", "경도": "float64"},
+    },
+    # 동별 인구
+    "population": {
+        "path": os.path.join(DATA_DIR, "동별인구.csv"),
+        "dtypes": {"군·구": "category", "동·읍·면": "string", "주소": "string"},
+    },
+    # 소방청 화재발생 정보 (전국)
+    "fire_incidents": {
+        "path": os.path.join(RAW_DIR, "소방청_화재발생 정보.csv"),
+        "dtypes": {"시도": "category", "시군구": "category", "화재유형": "category",
+                   "발화요인소분류": "category", "화재발생년원일": "string"},
+    },
+}
+
+
+# 파일 앞부분 바이트만 보고 인코딩 결정 (BOM → utf-8-sig, utf-8 디코딩 실패 → cp949)
+def sniff_encoding(path, nbytes=65536):
+    with open(path, "rb") as f:
+        head = f.read(nbytes)
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    # 잘린 멀티바이트 문자를 피하기 위해 마지막 줄바꿈까지만 검사
+    cut = head.rfind(b"\n")
+    if cut > 0:
+        head = head[:cut]
+    try:
+        head.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp949"
+
+
+def _downcast_numeric(df, fixed):
+    for col in df.columns:
+        if col in fixed:
+            continue
+        s = df[col]
+        # 정수만 (float32 변환은 값이 반올림되어 거리 계산/CSV 출력이 달라짐)
+        if pd.api.types.is_integer_dtype(s) and not isinstance(s.dtype, pd.api.extensions.ExtensionDtype):
+            df[col] = pd.to_numeric(s, downcast="integer")
+    return df
+
+
+def _apply_dtypes(df, dtypes):
+    for col, dtype in dtypes.items():
+        if col in df.columns and str(df[col].dtype) != dtype:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+# CSV 한 번만 파싱: 인코딩 판별 → 필요한 컬럼만 → 스키마 dtype 고정 → 나머지 정수 downcast
+def read_csv_typed(path, dtypes=None, columns=None, **kwargs):
+    dtypes = dtypes or {}
+    kwargs.setdefault("encoding", sniff_encoding(path))
+    if columns is not None:
+        wanted = set(columns)
+        kwargs["usecols"] = lambda c: c in wanted
+    df = pd.read_csv(path, dtype=dtypes, **kwargs)
+    df = _apply_dtypes(df, dtypes)
+    df = _downcast_numeric(df, dtypes)
+    return df if columns is None else df[[c for c in columns if c in df.columns]]
+
+
+# 스키마 이름으로 로드 (예: load("hydrants", columns=["위도", "경도"]))
+def load(name, columns=None, path=None):
+    schema = SCHEMAS[name]
+    return read_csv_typed(path or schema["path"], schema["dtypes"], columns=columns)
+
+
+def building_path(version):
+    return os.path.join(DATA_DIR, f"건축물대장_{version}.csv")
+
+
+# 건축물대장 v0.x 로드 (Parquet 우선, 컬럼 선택)
+def load_buildings(version="v0.5", columns=None):
+    path = building_path(version)
+    kwargs = {"encoding": sniff_encoding(path)} if os.path.exists(path) else {}
+    df = read_dataset(path, columns=columns, **kwargs)
+    df = _apply_dtypes(df, BUILDING_DTYPES)
+    return _downcast_numeric(df, BUILDING_DTYPES)
+
+
+# 구/군별 원본 건축물대장 (Raw Data/건축물대장/건축물대장_대구광역시_<구군>.csv)
+def load_register(gu, columns=None):
+    path = os.path.join(RAW_DIR, "건축물대장", f"건축물대장_대구광역시_{gu}.csv")
+    return read_csv_typed(path, BUILDING_DTYPES, columns=columns)
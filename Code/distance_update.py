@@ -0,0 +1,177 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataset_store import write_dataset
+from datasets import ROAD_NETWORK_PATH, building_path, load_buildings
+from nearest_facility import (FACILITY_FEATURES, HYDRANT_TYPES, facility_features, feature_columns,
+                              haversine, hydrant_type_distances, load_facilities, load_facility_snapshot,
+                              save_facility_snapshot)
+from score_matrix import SCORE_MATRIX_PATH, ScoreMatrix
+from scoring_spec import load_scoring_model
+
+# 변경된 시설이 이보다 많으면 전체 건물을 다시 계산
+MAX_INCREMENTAL_CHANGES = 500
+
+# 다시 계산할 건물 수 × 시설 수가 이 값 이하면 트리 대신 브루트포스 (트리 생성 비용이 더 큼)
+BRUTE_MAX_PAIRS = 2_000_000
+
+# 거리 비교 부동소수점 오차 여유 (m)
+_REACH_TOLERANCE = 0.01
+
+
+# 이전/현재 시설 목록 비교
+# 반환: (삭제된 시설, 추가된 시설) — 위치/유형이 바뀐 시설은 양쪽에 모두 포함
+def diff_facilities(old, new, id_col):
+    hashes = {}
+    for label, fac in (("이전", old), ("현재", new)):
+        ids = fac[id_col].astype("string")
+        if not ids.is_unique:
+            raise ValueError(f"{label} 시설 목록에 중복된 {id_col}이 있습니다")
+        values = fac.drop(columns=id_col)[sorted(new.columns.drop(id_col))]
+        hashes[label] = pd.Series(pd.util.hash_pandas_object(values, index=False).to_numpy(), index=ids)
+
+    old_hash, new_hash = hashes["이전"], hashes["현재"]
+    removed = (new_hash.reindex(old_hash.index) != old_hash).to_numpy()
+    added = (old_hash.reindex(new_hash.index) != new_hash).to_numpy()
+    return old[removed].reset_index(drop=True), new[added].reset_index(drop=True)
+
+
+# 시설 하나가 바뀌었을 때 결과가 달라질 수 있는 건물 범위 (건물별 거리, m)
+# = max(최근접 거리, k번째 거리, 해당 유형 거리, 최대 반경) — 그보다 먼 시설은 어떤 피처에도 영향 없음
+def _reach(df, name, fac_type=None):
+    spec = FACILITY_FEATURES[name]
+    cols = [spec["distance"]]
+    if spec["k"] > 1:
+        cols.append(f"{spec['prefix']}{spec['k']}순위거리")
+    if fac_type is not None and fac_type in HYDRANT_TYPES:
+        cols.append(f"{HYDRANT_TYPES[fac_type]}거리")
+    reach = df[cols].to_numpy(dtype=np.float64)
+    # 거리가 없는 건물(해당 유형 시설이 없던 경우 등)은 어떤 시설이든 영향
+    reach = np.where(np.isnan(reach), np.inf, reach).max(axis=1)
+    if spec["radii"]:
+        reach = np.maximum(reach, max(spec["radii"]))
+    return reach + _REACH_TOLERANCE
+
+
+def affected_buildings(df, name, changed):
+    lat = df["위도"].to_numpy(dtype=np.float64)
+    lon = df["경도"].to_numpy(dtype=np.float64)
+    mask = np.zeros(len(df), dtype=bool)
+    reach = {}
+    types = changed["시설유형코드"] if "시설유형코드" in changed else pd.Series(None, index=changed.index)
+    for f_lat, f_lon, f_type in zip(changed["위도"], changed["경도"], types):
+        if pd.isna(f_lat) or pd.isna(f_lon):
+            continue
+        key = None if pd.isna(f_type) else int(f_type)
+        if key not in reach:
+            reach[key] = _reach(df, name, key)
+        mask |= haversine(lat, lon, f_lat, f_lon) <= reach[key]
+    return mask
+
+
+# 시설 변경분을 건물 피처에 반영 (df를 직접 수정)
+# 반환: (갱신된 건물 mask, 갱신된 컬럼 목록, 삭제/이동 시설 수, 추가/이동 시설 수)
+def apply_facility_update(df, name, old, new):
+    spec = FACILITY_FEATURES[name]
+    removed, added = diff_facilities(old, new, spec["id"])
+    changed = pd.concat([removed, added], ignore_index=True)
+
+    columns = feature_columns(name)
+
+    if not len(changed):
+        mask = np.zeros(len(df), dtype=bool)
+    elif len(changed) > MAX_INCREMENTAL_CHANGES or any(c not in df.columns for c in columns):
+        mask = np.ones(len(df), dtype=bool)
+    else:
+        mask = affected_buildings(df, name, changed)
+
+    if mask.any():
+        sub = df.loc[mask]
+        method = "brute" if len(sub) * len(new) <= BRUTE_MAX_PAIRS else "auto"
+        values = facility_features(sub, [name], method=method, facilities={name: new})
+        if name == "hydrants":
+            values.update(hydrant_type_distances(sub, method=method, fac=new))
+        for col in columns:
+            if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(object)
+            df.loc[mask, col] = values[col]
+    return mask, columns, len(removed), len(added)
+
+
+# 구성 점수와 종합점수를 mask 행만 다시 계산 (scoring_spec.yaml 정의, 거리 외 점수는 그대로 나옴)
+def rescore(df, mask, model=None):
+    model = model or load_scoring_model()
+    scores = model.score(df.loc[mask])
+    for col in model.names:
+        df.loc[mask, col] = scores[col].to_numpy()
+    df.loc[mask, "종합점수"] = model.total(scores)
+
+
+# 시설 파일 변경을 v0.4(거리)와 이후 버전(점수 포함)에 반영
+# 마지막 거리 계산 때 저장한 시설 목록(FACILITY_SNAPSHOT)과 현재 파일을 비교
+def update_buildings(names=tuple(FACILITY_FEATURES), versions=("v0.4", "v0.5", "v0.6")):
+    snapshots = {name: load_facility_snapshot(name) for name in names}
+    missing = [name for name, snap in snapshots.items() if snap is None]
+    if missing:
+        raise FileNotFoundError(f"시설 스냅샷 없음 ({', '.join(missing)}): 거리 단계를 먼저 전체 실행하세요")
+
+    base = load_buildings(versions[0])
+    new = {name: load_facilities(name) for name in names}
+    mask = np.zeros(len(base), dtype=bool)
+    columns = []
+    for name in names:
+        start = time.perf_counter()
+        m, cols, n_removed, n_added = apply_facility_update(base, name, snapshots[name], new[name])
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"[{name}] 삭제/이동 {n_removed}, 추가/이동 {n_added} → 건물 {m.sum()}개 갱신 ({elapsed:.1f}ms)")
+        mask |= m
+        columns += cols
+
+        # 소방서 도로거리는 거리 범위로 영향을 좁힐 수 없으므로 전체 다시 계산 (Dijkstra 1회)
+        if name == "stations" and n_removed + n_added and "소방서도로거리" in base.columns \
+                and os.path.exists(ROAD_NETWORK_PATH):
+            from road_network import load_road_network, station_network_features
+
+            network = load_road_network(ROAD_NETWORK_PATH)
+            for col, values in station_network_features(base, network, new[name]).items():
+                if isinstance(base[col].dtype, pd.CategoricalDtype):
+                    base[col] = base[col].astype(object)
+                base[col] = values
+                columns.append(col)
+            mask[:] = True
+
+    if mask.any():
+        write_dataset(base, building_path(versions[0]))
+        rows = np.flatnonzero(mask)
+        for version in versions[1:]:
+            path = building_path(version)
+            if not os.path.exists(path):
+                continue
+            df = load_buildings(version)
+            if len(df) != len(base) or not df["대지위치"].equals(base["대지위치"]):
+                raise ValueError(f"{version} 행이 {versions[0]}와 맞지 않습니다: 파이프라인을 다시 실행하세요")
+            for col in columns:
+                if isinstance(df[col].dtype, pd.CategoricalDtype):
+                    df[col] = df[col].astype(object)
+                df.iloc[rows, df.columns.get_loc(col)] = base[col].to_numpy()[rows]
+            if "종합점수" in df.columns:
+                model = load_scoring_model()
+                rescore(df, mask, model)
+                if version == "v0.5" and os.path.exists(SCORE_MATRIX_PATH):
+                    ScoreMatrix.from_scores(df[model.names], model.signature).save(SCORE_MATRIX_PATH)
+            write_dataset(df, path)
+
+    for name in names:
+        save_facility_snapshot(name, new[name])
+    return mask
+
+
+if __name__ == "__main__":
+    from pipeline import record_stages
+
+    update_buildings()
+    # 결과가 전체 재계산과 같으므로 파이프라인에는 거리 이후 단계를 최신으로 기록
+    record_stages(["distance", "scoring", "gu"])
@@ -1,8 +1,16 @@
 import pandas as pd
 
+from admin_names import extract_admin_names
+from dataset_store import write_dataset
+from datasets import load_buildings
 
-df = pd.read_csv("../Data/건축물대장_v0.5.csv", encoding="utf-8-sig")
 
-df["구군"] = df["대지위치"].str.extract(r"(달서구|달성군|동구|북구|서구|수성구|중구|남구|군위군)")
+df = load_buildings("v0.5")
 
-df.to_csv("../Data/건축물대장_v0.6.csv", index=False, encoding="utf-8-sig")
\ No newline at end of file
+# 구군은 district_map.py의 행정동 조인 결과(구군코드 포함)를 그대로 사용하고,
+# 행정동 경계 밖 좌표만 주소에서 보충 / 법정동은 주소에서 추출
+names = extract_admin_names(df["대지위치"])
+df["구군"] = df["구군"].astype("string").fillna(names["구군"].astype("string")).astype("category")
+df["법정동"] = names["법정동"]
+
+write_dataset(df, "../Data/건축물대장_v0.6.csv")
@@ -1,133 +1,124 @@
 import os
-import time
-import json
-import requests
-import pandas as pd
+
+from geocoder import KakaoBackend, GeocodingEngine, coordinate_table, attach_coordinates
+from geocode_cache import open_cache
+from geocode_job import run_geocode_job, merge_geocoded_parts
+from address_index import load_or_build_index
+from address_normalize import canonicalize_addresses, normalize_address
 
 # 기본 설정
 KAKAO_REST_KEY = "f939970b0ab002e6aa011535f5388344"
-KAKAO_URL = "https://dapi.kakao.com/v2/local/search/address.json"
-HEADERS = {"Authorization": f"KakaoAK {KAKAO_REST_KEY}"}
-REQUEST_INTERVAL = 0.15
-CACHE_PATH = "./kakao_geocode_cache.json"
-
-
-# 캐시 로드/세이브
-def load_cache(path=CACHE_PATH):
-    if os.path.exists(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
-
-def save_cache(cache, path=CACHE_PATH):
-    try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(cache, f, ensure_ascii=False)
-    except:
-        pass
-
-cache = load_cache()
-
-# 카카오 지오코딩 함수
+KAKAO_URL = os.environ.get("KAKAO_URL", "https://dapi.kakao.com/v2/local/search/address.json")
+REQUEST_RATE = 20   # 초당 요청 수 (카카오 쿼터에 맞춰 조정)
+MAX_WORKERS = 8
+PARTITION_SIZE = 10000
+CACHE_PATH = "./kakao_geocode_cache.sqlite"
+LEGACY_CACHE_PATH = "./kakao_geocode_cache.json"
+GEOCODED_DIR = "../Raw Data/건축물대장_위도경도포함"
+INDEX_PATH = "../Raw Data/건축물대장_위도경도포함/_address_index.npz"
+GEOCODED_OUT = os.path.join(GEOCODED_DIR, "건축물대장_대구광역시_좌표.csv")
+# v0.1로 합칠 좌표 파일 (이번 지오코딩 결과 + 이전에 나눠서 만든 파트 파일)
+# 폴더 전체를 glob하지 않음: 다른 CSV나 이전 병합 결과가 섞이지 않게 명시
+GEOCODED_PARTS = [GEOCODED_OUT] + [os.path.join(GEOCODED_DIR, name) for name in [
+    "건축물2_좌표.csv",
+    "건축물대장1_1.csv",
+    "건축물대장1_2.csv",
+    "건축물대장1_3.csv",
+    "건축물대장1_4.csv",
+    "건축물대장1_5.csv",
+    "건축물대장1_6.csv",
+    "대구_건축물대장_2(6~80000).csv",
+    "대구_건축물대장_all.csv",
+    "건축물대장(30000~49999).csv",
+    "수성동_좌표추가.csv",
+]]
+# 오프라인 인덱스 근사 조회: None이면 정확히 같은 주소만 사용
+# 정수 n이면 같은 지역에서 본번 차이 n 이내의 가장 가까운 지번 좌표 사용 (다른 부번도 포함되므로 로그 확인)
+LOCAL_FUZZY_GAP = None
+
+
+# 캐시 열기 (SQLite, 기존 JSON 캐시는 최초 1회 이관)
+cache = open_cache(CACHE_PATH, legacy_json_path=LEGACY_CACHE_PATH)
+
+# 이미 좌표가 붙은 건축물대장 파일로 만든 오프라인 주소 인덱스 (API 호출 전에 먼저 조회)
+address_index = load_or_build_index(INDEX_PATH, GEOCODED_DIR)
+
+engine = GeocodingEngine(
+    KakaoBackend(KAKAO_REST_KEY, url=KAKAO_URL),
+    rate=REQUEST_RATE, max_workers=MAX_WORKERS
+)
+
+def _store(addr, result):
+    cache[addr] = result
+
+# 오프라인 인덱스 조회 (근사 일치는 어느 주소 좌표를 썼는지 출력)
+def _lookup_local(addr):
+    if LOCAL_FUZZY_GAP is None:
+        return address_index.lookup(addr)
+    local = address_index.lookup(addr, fuzzy=True, max_gap=LOCAL_FUZZY_GAP)
+    if local is not None and "matched" in local:
+        print(f"[근사] {addr} → {local['matched']}")
+    return local
+
+# 카카오 지오코딩 함수 (캐시 키는 geocode_partition과 같은 정규화 주소)
 def kakao_geocode(address):
-    if not isinstance(address, str) or not address.strip():
+    addr = normalize_address(address)
+    if addr is None:
         return None
 
-    addr = address.strip()
     if addr in cache:
         return cache[addr]
+    local = _lookup_local(addr)
+    if local is not None:
+        return local
 
-    params = {"query": addr}
-    try:
-        r = requests.get(KAKAO_URL, headers=HEADERS, params=params, timeout=10)
-        if r.status_code == 200:
-            data = r.json()
-            docs = data.get("documents", [])
-            if docs:
-                d0 = docs[0]
-                lon, lat = float(d0["x"]), float(d0["y"])
-                result = {"lat": lat, "lon": lon}
-            else:
-                result = None
-        else:
-            result = None
-    except:
-        result = None
-
-    cache[addr] = result
-    save_cache(cache)
-    time.sleep(REQUEST_INTERVAL)
+    ok, result = engine.geocode(addr)
+    if ok:
+        _store(addr, result)
     return result
 
-# CSV 불러오기
-df_building_original = pd.read_csv(
+# 캐시 → 오프라인 인덱스 순으로 찾고, 남은 주소만 병렬로 API 조회
+def kakao_geocode_many(addresses):
+    addrs = [a.strip() for a in addresses if isinstance(a, str) and a.strip()]
+    results = {}
+    todo = []
+    for a in dict.fromkeys(addrs):
+        if a in cache:
+            results[a] = cache[a]
+            continue
+        local = _lookup_local(a)
+        if local is not None:
+            results[a] = local
+        else:
+            todo.append(a)
+    print(f"로컬 조회 {len(results)}건, API 조회 {len(todo)}건")
+    if todo:
+        results.update(engine.geocode_many(todo, on_result=_store))
+        cache.flush()
+    return results
+
+# 파티션 단위 전처리 + 좌표 변환 (주소 정규화 → 고유 키만 조회 → 좌표 테이블 → 해시 조인)
+def geocode_partition(df_part):
+    df_building_filter = df_part[[
+        "대지위치", "지상층수", "지하층수", "높이(m)", "구조코드명", "기타구조", "주용도코드명", "비상용승강기수"
+    ]].copy()
+
+    df_building_filter["사용승인년도"] = df_part["사용승인일"].astype(str).str.slice(0, 4)
+
+    # 표기만 다른 같은 주소는 하나의 키로 묶어 한 번만 조회
+    keys, unique_keys = canonicalize_addresses(df_building_filter["대지위치"])
+    results = kakao_geocode_many(unique_keys)
+    return attach_coordinates(df_building_filter, coordinate_table(results), keys=keys)
+
+# 전체 건축물대장 자동 분할 + 체크포인트 (중단 후 재실행하면 이어서 진행)
+run_geocode_job(
     "../Raw Data/건축물대장/건축물대장_대구광역시_종합.csv",
-    sep=None, engine="python"
+    GEOCODED_OUT,
+    "../Raw Data/건축물대장_위도경도포함/_checkpoint",
+    geocode_partition,
+    partition_size=PARTITION_SIZE,
+    read_kwargs={"sep": None, "engine": "python"},
 )
 
-df_building_filter = df_building_original[[
-    "대지위치", "지상층수", "지하층수", "높이(m)", "구조코드명", "기타구조", "주용도코드명", "비상용승강기수"
-]].copy()
-
-df_building_filter["사용승인년도"] = df_building_original["사용승인일"].astype(str).str.slice(0, 4)
-
-# 1만개씩 나누기
-df_building_temp = df_building_filter.loc[:10000, :].copy()
-
-# 좌표 변환 적용
-df_building_temp["위도"] = None
-df_building_temp["경도"] = None
-
-for i, addr in enumerate(df_building_temp["대지위치"].dropna().unique(), 1):
-    geo = kakao_geocode(addr)
-    if geo:
-        df_building_temp.loc[df_building_temp["대지위치"] == addr, "위도"] = geo["lat"]
-        df_building_temp.loc[df_building_temp["대지위치"] == addr, "경도"] = geo["lon"]
-    if i % 500 == 0:
-        print(f"{i} / {len(df_building_temp['대지위치'].dropna().unique)} 처리 완료")
-
-# 저장
-df_building_temp.to_csv(
-    "../Raw Data/건축물대장_위도경도포함/1.csv",
-    index=False, encoding="utf-8-sig"
-)
-print("저장 완료")
-
-# 파일 합치기
-files = [
-    "./Raw Data/건축물대장_위도경도포함/건축물2_좌표.csv",
-    "./Raw Data/건축물대장_위도경도포함/건축물대장1_1.csv",
-    "./Raw Data/건축물대장_위도경도포함/건축물대장1_2.csv",
-    "./Raw Data/건축물대장_위도경도포함/건축물대장1_3.csv",
-    "./Raw Data/건축물대장_위도경도포함/건축물대장1_4.csv",
-    "./Raw Data/건축물대장_위도경도포함/건축물대장1_5.csv",
-    "./Raw Data/건축물대장_위도경도포함/건축물대장1_6.csv",
-    "./Raw Data/건축물대장_위도경도포함/대구_건축물대장_2(6~80000).csv",
-    "./Raw Data/건축물대장_위도경도포함/대구_건축물대장_all.csv",
-    "./Raw Data/건축물대장_위도경도포함/건축물대장(30000~49999).csv",
-    "./Raw Data/건축물대장_위도경도포함/수성동_좌표추가.csv"
-]
-
-# 뽑을 컬럼 목록
-columns_to_keep = [
-    "대지위치", "지상층수", "지하층수", "높이(m)", "구조코드명", "기타구조",
-    "주용도코드명", "비상용승강기수", "사용승인년도", "위도", "경도"
-]
-
-dfs = []
-
-for file in files:
-    df = pd.read_csv(file, encoding="utf-8")
-    
-    existing_cols = [col for col in columns_to_keep if col in df.columns]
-    df = df[existing_cols]
-    
-    dfs.append(df)
-
-merged_df = pd.concat(dfs, ignore_index=True)
-
-# 저장
-merged_df.to_csv("./Data/건축물대장_v0.1.csv", index=False, encoding="utf-8-sig")
\ No newline at end of file
+# 파일 합치기 (필요한 컬럼만 병렬로 읽고, 파일 간 겹치는 건물은 제거)
+merge_geocoded_parts(GEOCODED_PARTS, "../Data/건축물대장_v0.1.csv")
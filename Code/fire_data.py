@@ -12,8 +12,10 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 
-loc_119 = pd.read_csv("../Data/대구_소방서_위치.csv")
-loc_fire = pd.read_csv("../Data/대구_소방장치_위치.csv")
+from datasets import load
+
+loc_119 = load("stations")
+loc_fire = load("devices")
 
 
 
@@ -73,7 +75,7 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-df = pd.read_csv("../Data/동별인구.csv")
+df = load("population")
 new = df[['군·구', '동·읍·면', '고령자_비율','위도','경도']]
 
 # 동별 고령자 비율 값
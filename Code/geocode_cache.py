@@ -0,0 +1,139 @@
+import os
+import json
+import sqlite3
+import threading
+
+from address_normalize import normalize_address
+
+_MISSING = object()
+
+
+# SQLite(WAL) 기반 지오코딩 캐시
+# - dict처럼 사용 (addr in cache, cache[addr], cache[addr] = result)
+# - 결과 없음(None)도 캐시 (lat/lon NULL)
+# - 쓰기는 메모리에 모았다가 batch_size마다 한 트랜잭션으로 커밋
+# - WAL 모드라 다른 프로세스가 읽는 중에도 쓰기 가능
+class GeocodeCache:
+    def __init__(self, path, batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            " address TEXT PRIMARY KEY, lat REAL, lon REAL)"
+        )
+        self._conn.commit()
+        self._pending = {}
+        self._mem = {}
+        for addr, lat, lon in self._conn.execute("SELECT address, lat, lon FROM geocode"):
+            self._mem[addr] = _to_result(lat, lon)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._mem)
+
+    def _lookup(self, addr):
+        with self._lock:
+            result = self._mem.get(addr, _MISSING)
+            if result is not _MISSING:
+                return result
+            # 다른 프로세스가 그 사이 기록했을 수 있으므로 DB 확인
+            row = self._conn.execute(
+                "SELECT lat, lon FROM geocode WHERE address = ?", (addr,)
+            ).fetchone()
+            if row is None:
+                return _MISSING
+            result = _to_result(*row)
+            self._mem[addr] = result
+            return result
+
+    def __contains__(self, addr):
+        return self._lookup(addr) is not _MISSING
+
+    def __getitem__(self, addr):
+        result = self._lookup(addr)
+        if result is _MISSING:
+            raise KeyError(addr)
+        return result
+
+    def get(self, addr, default=None):
+        result = self._lookup(addr)
+        return default if result is _MISSING else result
+
+    def __setitem__(self, addr, result):
+        with self._lock:
+            self._mem[addr] = result
+            self._pending[addr] = result
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def update(self, items):
+        for addr, result in dict(items).items():
+            self[addr] = result
+
+    # 버퍼에 쌓인 쓰기를 한 트랜잭션으로 커밋
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            rows = [
+                (addr, r["lat"] if r else None, r["lon"] if r else None)
+                for addr, r in self._pending.items()
+            ]
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO geocode (address, lat, lon) VALUES (?, ?, ?)",
+                    rows,
+                )
+            self._pending.clear()
+
+    # WAL 체크포인트 + VACUUM으로 파일 정리
+    def compact(self):
+        with self._lock:
+            self.flush()
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("VACUUM")
+
+    # 기존 kakao_geocode_cache.json 이관
+    # JSON은 원문 주소가 키이므로 지오코딩 조회와 같은 정규화 키로 바꿔 저장
+    # (정규화 후 같은 키가 여러 개면 처음 나온 좌표 결과, 좌표가 하나도 없으면 결과 없음)
+    def import_json(self, json_path):
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        merged = {}
+        for addr, result in data.items():
+            key = normalize_address(addr)
+            if key is not None and merged.get(key) is None:
+                merged[key] = result
+        self.update(merged)
+        self.flush()
+        return len(merged)
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _to_result(lat, lon):
+    if lat is None or lon is None:
+        return None
+    return {"lat": lat, "lon": lon}
+
+
+# 캐시 열기: DB가 비어 있고 레거시 JSON 캐시가 있으면 이관
+def open_cache(path, legacy_json_path=None, batch_size=1000):
+    cache = GeocodeCache(path, batch_size=batch_size)
+    if len(cache) == 0 and legacy_json_path and os.path.exists(legacy_json_path):
+        n = cache.import_json(legacy_json_path)
+        print(f"기존 JSON 캐시 {n}건 이관 완료")
+    return cache
@@ -0,0 +1,167 @@
+import os
+import json
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+MANIFEST_NAME = "manifest.json"
+
+
+# 원본 파일 식별 정보 (바뀌면 체크포인트 무효화)
+def _source_signature(path, partition_size):
+    st = os.stat(path)
+    return {
+        "path": os.path.abspath(path),
+        "size": st.st_size,
+        "mtime": int(st.st_mtime),
+        "partition_size": partition_size,
+    }
+
+
+def _atomic_write_json(obj, path):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _load_manifest(work_dir, signature):
+    path = os.path.join(work_dir, MANIFEST_NAME)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("source") == signature:
+            return manifest
+        print("원본 파일이 바뀌어 체크포인트를 새로 시작합니다")
+    return {"source": signature, "done": {}}
+
+
+def _part_path(work_dir, part_id):
+    return os.path.join(work_dir, f"part_{part_id:05d}.csv")
+
+
+# 건축물대장 전체를 partition_size 행씩 자동 분할해 지오코딩
+# - 파티션마다 결과 파일 + manifest 체크포인트 기록
+# - 재실행 시 완료된 파티션은 건너뜀
+# - 끝나면 파티션 결과를 하나의 out_path로 합침
+#
+# geocode_partition(df) -> df : 한 파티션을 받아 위도/경도를 붙여 반환
+# read_kwargs : 원본 read_csv 옵션 (sep, encoding 등)
+def run_geocode_job(src_path, out_path, work_dir, geocode_partition,
+                    partition_size=10000, read_kwargs=None):
+    os.makedirs(work_dir, exist_ok=True)
+    signature = _source_signature(src_path, partition_size)
+    manifest = _load_manifest(work_dir, signature)
+    manifest_path = os.path.join(work_dir, MANIFEST_NAME)
+
+    read_kwargs = dict(read_kwargs or {})
+    reader = pd.read_csv(src_path, chunksize=partition_size, **read_kwargs)
+
+    n_parts = 0
+    for part_id, chunk in enumerate(reader):
+        n_parts = part_id + 1
+        key = str(part_id)
+        if key in manifest["done"] and os.path.exists(_part_path(work_dir, part_id)):
+            continue
+
+        result = geocode_partition(chunk)
+        part_path = _part_path(work_dir, part_id)
+        tmp = part_path + ".tmp"
+        result.to_csv(tmp, index=False, encoding="utf-8")
+        os.replace(tmp, part_path)
+
+        manifest["done"][key] = {
+            "rows": int(len(result)),
+            "geocoded": int(result["위도"].notna().sum()),
+        }
+        _atomic_write_json(manifest, manifest_path)
+        print(f"파티션 {part_id} 완료 ({len(result)}행)")
+
+    manifest["n_parts"] = n_parts
+    _atomic_write_json(manifest, manifest_path)
+
+    consolidate_parts(work_dir, n_parts, out_path)
+    total = sum(v["rows"] for v in manifest["done"].values())
+    geocoded = sum(v["geocoded"] for v in manifest["done"].values())
+    print(f"저장 완료: {out_path} (좌표 {geocoded} / {total})")
+    return manifest
+
+
+# 파티션 결과 파일을 순서대로 이어 붙여 하나의 CSV로 저장
+def consolidate_parts(work_dir, n_parts, out_path):
+    tmp = out_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8-sig", newline="") as out:
+        for part_id in range(n_parts):
+            with open(_part_path(work_dir, part_id), "r", encoding="utf-8") as f:
+                header = f.readline()
+                if part_id == 0:
+                    out.write(header)
+                shutil.copyfileobj(f, out)
+    os.replace(tmp, out_path)
+
+
+# 병합 대상 컬럼과 dtype (필요한 컬럼만 읽음)
+MERGE_DTYPES = {
+    "대지위치": "string",
+    "지상층수": "Int32",
+    "지하층수": "Int32",
+    "높이(m)": "float64",
+    "구조코드명": "string",
+    "기타구조": "string",
+    "주용도코드명": "string",
+    "비상용승강기수": "Int32",
+    "사용승인년도": "string",
+    "위도": "float64",
+    "경도": "float64",
+}
+
+
+def _read_part(path, columns, dtypes):
+    df = pd.read_csv(
+        path, encoding="utf-8", usecols=lambda c: c in columns,
+        dtype={c: t for c, t in dtypes.items() if c in columns},
+    )
+    return df.reindex(columns=columns)
+
+
+# 좌표가 붙은 파트 파일들을 병렬로 읽어 하나의 CSV로 스트리밍 병합
+# - 파일 간 겹치는 건물은 내용 해시로 제거
+#   (같은 해시가 파일 안에서 n번, 앞선 파일들에서 최대 m번 나왔다면 max(n, m)번만 남김
+#    → 겹치는 구간은 한 번만, 한 파일 안의 동일 건물은 그대로 유지)
+# - 메모리에는 행 해시 카운트와 처리 중인 파일 몇 개만 유지
+def merge_geocoded_parts(files, out_path, columns=None, dtypes=None, max_workers=4):
+    dtypes = dtypes or MERGE_DTYPES
+    columns = list(columns or dtypes)
+    kept_counts = {}
+    n_in = n_out = 0
+
+    tmp = out_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8-sig", newline="") as out, \
+            ThreadPoolExecutor(max_workers=max_workers) as ex:
+        pending = deque()
+        files = list(files)
+        next_file = 0
+        header = True
+        while next_file < len(files) or pending:
+            while next_file < len(files) and len(pending) < max_workers:
+                pending.append(ex.submit(_read_part, files[next_file], columns, dtypes))
+                next_file += 1
+            df = pending.popleft().result()
+
+            h = pd.Series(pd.util.hash_pandas_object(df, index=False).to_numpy())
+            occurrence = h.groupby(h).cumcount().to_numpy()
+            seen = h.map(kept_counts).fillna(0).to_numpy()
+            keep = occurrence >= seen
+            for key, cnt in h.value_counts().items():
+                if cnt > kept_counts.get(key, 0):
+                    kept_counts[key] = cnt
+
+            df[keep].to_csv(out, index=False, header=header)
+            header = False
+            n_in += len(df)
+            n_out += int(keep.sum())
+    os.replace(tmp, out_path)
+    print(f"병합 완료: {n_in}행 → {n_out}행 (중복 {n_in - n_out}행 제거)")
+    return n_out
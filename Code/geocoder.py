@@ -0,0 +1,140 @@
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import requests
+
+KAKAO_URL = "https://dapi.kakao.com/v2/local/search/address.json"
+
+# 재시도 대상 응답 코드 (None = 네트워크 오류/타임아웃)
+RETRY_STATUS = {None, 429, 500, 502, 503, 504}
+
+
+# 토큰 버킷 레이트 리미터: 초당 rate개, 최대 capacity개까지 몰아서 허용
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# 카카오 주소검색 백엔드: (상태코드, {"lat", "lon"} 또는 None) 반환
+# url만 바꾸면 로컬 스텁 서버로 대체 가능
+class KakaoBackend:
+    def __init__(self, rest_key, url=KAKAO_URL, timeout=10):
+        self.url = url
+        self.headers = {"Authorization": f"KakaoAK {rest_key}"}
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        s = getattr(self._local, "session", None)
+        if s is None:
+            s = requests.Session()
+            s.headers.update(self.headers)
+            self._local.session = s
+        return s
+
+    def __call__(self, address):
+        try:
+            r = self._session().get(self.url, params={"query": address}, timeout=self.timeout)
+        except requests.RequestException:
+            return None, None
+
+        if r.status_code != 200:
+            return r.status_code, None
+
+        docs = r.json().get("documents", [])
+        if not docs:
+            return 200, None
+        d0 = docs[0]
+        return 200, {"lat": float(d0["y"]), "lon": float(d0["x"])}
+
+
+# 동시 요청 + 레이트 리밋 + 지수 백오프 재시도 지오코딩 엔진
+class GeocodingEngine:
+    def __init__(self, backend, rate=20, burst=None, max_workers=8,
+                 max_retries=5, backoff_base=0.5, backoff_max=30.0):
+        self.backend = backend
+        self.bucket = TokenBucket(rate, burst)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _backoff(self, attempt):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    # 단일 주소 조회: (확정 여부, 결과)
+    # 확정 = 200 응답을 받음 (결과 없음 포함), 캐시에 저장해도 되는 값
+    def geocode(self, address):
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            status, result = self.backend(address)
+            if status == 200:
+                return True, result
+            if status not in RETRY_STATUS:
+                return False, None
+            if attempt < self.max_retries:
+                time.sleep(self._backoff(attempt))
+        return False, None
+
+    # 여러 주소 병렬 조회: {주소: 결과}
+    # on_result(주소, 결과)는 확정된 응답에 대해서만 호출 (캐시 저장용)
+    def geocode_many(self, addresses, on_result=None, progress_every=500):
+        addresses = list(dict.fromkeys(addresses))
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+            futures = {ex.submit(self.geocode, a): a for a in addresses}
+            for i, fut in enumerate(as_completed(futures), 1):
+                addr = futures[fut]
+                ok, result = fut.result()
+                results[addr] = result
+                if ok and on_result is not None:
+                    on_result(addr, result)
+                if progress_every and i % progress_every == 0:
+                    print(f"{i} / {len(addresses)} 처리 완료")
+        return results
+
+
+# 지오코딩 결과 {주소: {"lat", "lon"} 또는 None} → 주소 인덱스 좌표 테이블
+def coordinate_table(results):
+    hits = {a: r for a, r in results.items() if r}
+    table = pd.DataFrame(
+        {"위도": [r["lat"] for r in hits.values()],
+         "경도": [r["lon"] for r in hits.values()]},
+        index=pd.Index(list(hits.keys()), name="주소"),
+        dtype=float,
+    )
+    return table[~table.index.duplicated(keep="last")]
+
+
+# 좌표 테이블을 주소 컬럼에 해시 조인으로 한 번에 붙이기
+# keys: 행별 조인 키 (정규화 주소 등), 없으면 addr_col 원문 사용
+def attach_coordinates(df, table, addr_col="대지위치", keys=None):
+    key = keys if keys is not None else df[addr_col].astype("string").str.strip()
+    pos = table.index.get_indexer(key)
+    found = pos >= 0
+    for col in ("위도", "경도"):
+        values = np.full(len(df), np.nan)
+        values[found] = table[col].to_numpy()[pos[found]]
+        df[col] = values
+    return df
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+
+# 결측치 프로파일: 모든 컬럼의 그룹별 결측 수/비율을 한 번의 groupby로 계산
+# - group_cols의 조합으로 한 번만 집계한 뒤, 각 그룹 기준별 합계는 그 결과에서 다시 합산
+#   (원본은 한 번만 스캔)
+# - extra_masks: {"이름": bool Series} 형태의 추가 결측 조건 (예: 위경도 동시 결측)
+# 반환: 기준 | 값 | 컬럼 | 결측수 | 전체 | 퍼센트 (long format)
+def missing_profile(df, group_cols=("구군", "구조코드명"), columns=None, extra_masks=None):
+    group_cols = list(group_cols)
+    columns = list(columns) if columns is not None else [c for c in df.columns if c not in group_cols]
+
+    miss = df[columns].isna()
+    for name, mask in (extra_masks or {}).items():
+        miss[name] = np.asarray(mask, dtype=bool)
+    miss = miss.astype(np.int32)
+    miss["_전체"] = 1
+
+    keys = [df[c].astype("object").where(df[c].notna(), "미상") for c in group_cols]
+    combined = miss.groupby(keys, sort=False).sum()
+
+    reports = [_to_long(combined.sum().to_frame("전체").T.assign(_값="전체").set_index("_값"), "전체")]
+    for level, col in enumerate(group_cols):
+        reports.append(_to_long(combined.groupby(level=level, sort=False).sum(), col))
+    return pd.concat(reports, ignore_index=True)
+
+
+def _to_long(counts, basis):
+    total = counts.pop("_전체")
+    long = counts.stack().rename("결측수").reset_index()
+    long.columns = ["값", "컬럼", "결측수"]
+    long.insert(0, "기준", basis)
+    long["전체"] = long["값"].map(total).to_numpy()
+    long["퍼센트"] = (long["결측수"] / long["전체"] * 100).round(2)
+    return long
+
+
+# 프로파일에서 한 기준/컬럼만 골라 결측수 내림차순 표로 보기
+def missing_table(profile, basis, column):
+    out = profile.loc[(profile["기준"] == basis) & (profile["컬럼"] == column),
+                      ["값", "결측수", "전체", "퍼센트"]]
+    return (out.rename(columns={"값": basis})
+               .sort_values(["결측수", basis], ascending=[False, True], ignore_index=True))
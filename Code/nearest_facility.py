@@ -0,0 +1,337 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from datasets import DATA_DIR, load
+from projection import HAS_PYPROJ, project
+
+try:
+    from scipy.spatial import cKDTree
+    HAS_TREE = HAS_PYPROJ
+except ImportError:
+    HAS_TREE = False
+
+EARTH_RADIUS = 6371000  # 지구 반지름 (m)
+
+# 시설별 건축물대장 피처 (키: datasets.SCHEMAS 이름)
+# - distance: 최근접 거리 컬럼
+# - k: k번째 최근접까지 거리 ('<prefix><i>순위거리', i ≥ 2)
+# - radii: 반경(m) 안 시설 수 ('<prefix>수_<r>m')
+# - id: 최근접 시설 식별 컬럼 → '최근접<prefix>'
+FACILITY_FEATURES = {
+    "hydrants": {"prefix": "소방용수시설", "distance": "소방용수시설거리", "k": 1,
+                 "radii": (50, 100, 150), "id": "시설번호"},
+    "stations": {"prefix": "소방서", "distance": "소방서거리", "k": 2,
+                 "radii": (), "id": "119안전센터명"},
+}
+
+# 소방용수시설 시설유형코드 → 이름 (유형별 거리 컬럼 '<이름>거리')
+HYDRANT_TYPES = {
+    1: "지상식소화전",
+    2: "지하식소화전",
+    3: "급수탑",
+    4: "저수조",
+    5: "승하강식소화전",
+    6: "비상소화장치",
+}
+
+# 건축물대장 거리 컬럼 → 시설 데이터셋
+DISTANCE_COLUMNS = {spec["distance"]: name for name, spec in FACILITY_FEATURES.items()}
+
+# 거리 계산에 쓴 시설 목록 (증분 갱신 시 변경분 비교용, distance_update.py)
+FACILITY_SNAPSHOT = os.path.join(DATA_DIR, "건축물대장_v0.4_{name}.csv")
+
+# 브루트포스 계산 작업 버퍼 메모리 한도 (바이트, 모든 스레드 합계)
+# 시설 수가 늘면 한 번에 처리하는 건물 수(chunk)가 줄어 최대 메모리는 일정
+BRUTE_MEMORY_BUDGET = 64 * 2 ** 20
+
+# 평면 거리와 haversine 거리 차이 여유 (EPSG:5186 축척 오차는 대구 범위에서 0.1% 미만)
+_PROJECTION_SLACK = 1.01
+
+# 위경도(도) 사이 대원거리 (m, 벡터화)
+def haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(a))
+
+
+def _valid(lat, lon):
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    return lat, lon, ~(np.isnan(lat) | np.isnan(lon))
+
+
+def _empty_features(n, k, radii):
+    return (np.full((n, k), np.nan), np.full((n, k), -1, dtype=np.int64),
+            {r: np.zeros(n, dtype=np.int32) for r in radii})
+
+
+# 시설(소화전/소방서 등) 최근접 거리 엔진
+# 시설 좌표를 EPSG:5186으로 한 번 투영해 KD-tree를 만들고, 건물 좌표를 한꺼번에 조회
+# 위경도가 없는 시설은 제외(index는 원래 위치), 위경도가 없는 건물은 NaN
+class NearestFacility:
+    def __init__(self, lat, lon):
+        lat, lon, valid = _valid(lat, lon)
+        if not valid.any():
+            raise ValueError("위경도가 있는 시설이 없습니다")
+        self.index = np.flatnonzero(valid)
+        self.lat = lat[valid]
+        self.lon = lon[valid]
+        self.tree = cKDTree(project(self.lat, self.lon))
+
+    def __len__(self):
+        return len(self.lat)
+
+    # 최근접 시설까지 거리 (m)
+    # - exact=False: EPSG:5186 평면 거리
+    # - exact=True: 평면 기준 후보 candidates개 중 haversine 최소값
+    #   (투영 왜곡으로 순위가 바뀌는 경우까지 기존 haversine 결과와 일치)
+    def query(self, lat, lon, exact=False, candidates=4, workers=-1):
+        if exact:
+            return self.query_features(lat, lon, k=1, candidates=candidates, workers=workers)[0][:, 0]
+        lat, lon, valid = _valid(lat, lon)
+        out = np.full(lat.shape, np.nan)
+        if valid.any():
+            out[valid] = self.tree.query(project(lat[valid], lon[valid]), k=1, workers=workers)[0]
+        return out
+
+    # 한 번의 후보 조회로 k-최근접 거리/시설 위치와 반경별 시설 수를 같이 계산 (haversine 기준)
+    # 반환: (거리 (n, k), 시설 원래 위치 (n, k, 없으면 -1), {반경: 시설 수 (n,)})
+    # - 후보: 평면 기준 k + candidates - 1개. 반경 수는 후보로 세고,
+    #   가장 먼 후보까지 반경 안이라 후보 밖에도 시설이 있을 수 있는 행만 ball query로 다시 셈
+    def query_features(self, lat, lon, k=1, radii=(), candidates=4, workers=-1):
+        lat, lon, valid = _valid(lat, lon)
+        dist, idx, counts = _empty_features(len(lat), k, radii)
+        if not valid.any():
+            return dist, idx, counts
+
+        lat, lon = lat[valid], lon[valid]
+        pts = project(lat, lon)
+        q = min(k + candidates - 1, len(self))
+        planar, cand = self.tree.query(pts, k=q, workers=workers)
+        planar, cand = planar.reshape(len(pts), -1), cand.reshape(len(pts), -1)
+
+        d = haversine(lat[:, None], lon[:, None], self.lat[cand], self.lon[cand])
+        # 거리가 같으면(같은 좌표의 시설) 앞쪽 시설 우선 — brute와 같은 결과
+        order = np.lexsort((cand, d), axis=1)[:, :k]
+        kk = order.shape[1]
+        dist[valid, :kk] = np.take_along_axis(d, order, axis=1)
+        idx[valid, :kk] = self.index[np.take_along_axis(cand, order, axis=1)]
+
+        if radii:
+            rmax = max(radii)
+            inner = {r: (d <= r).sum(axis=1) for r in radii}
+            saturated = np.flatnonzero(planar[:, -1] <= rmax * _PROJECTION_SLACK) if q < len(self) else []
+            if len(saturated):
+                balls = self.tree.query_ball_point(pts[saturated], r=rmax * _PROJECTION_SLACK, workers=workers)
+                sizes = np.fromiter((len(b) for b in balls), dtype=np.int64, count=len(balls))
+                flat = np.concatenate([np.asarray(b, dtype=np.int64) for b in balls])
+                rows = np.repeat(np.arange(len(saturated)), sizes)
+                dd = haversine(lat[saturated][rows], lon[saturated][rows], self.lat[flat], self.lon[flat])
+                for r in radii:
+                    inner[r][saturated] = np.bincount(rows, weights=dd <= r, minlength=len(saturated))
+            for r in radii:
+                counts[r][valid] = inner[r]
+        return dist, idx, counts
+
+
+# 메모리 한도에 맞는 chunk 크기 (건물 수)
+# 스레드마다 (chunk × 시설 수) 버퍼: 실수 2개 + bool 1개 (+ k > 1이면 정렬 인덱스 int64)
+def brute_chunk_size(n_facilities, k=1, memory_budget=BRUTE_MEMORY_BUDGET, dtype=np.float64, workers=1):
+    per_row = n_facilities * (2 * np.dtype(dtype).itemsize + 1 + (8 if k > 1 else 0))
+    return max(1, int(memory_budget // (per_row * max(1, workers))))
+
+
+# 트리 없이 같은 피처 계산 (건물 chunk씩 시설 전체와 브로드캐스트)
+# - chunk 크기는 memory_budget에서 계산, 스레드별 작업 버퍼를 미리 잡아 chunk마다 재사용
+# - 순위/반경 비교는 haversine의 a = sin²(Δφ/2) + cosφ₁cosφ₂sin²(Δλ/2) 값으로 하고
+#   (거리와 단조 관계) 선택된 시설만 float64 haversine 거리 계산
+# - dtype=np.float32: 기준점을 뺀 좌표로 a를 계산해 메모리/시간 절반 (순위 동률 근처에서만 차이 가능)
+# - 청크는 스레드 풀에서 병렬 처리 (NumPy 연산은 GIL을 풀고 실행)
+def nearest_features_brute(lat, lon, fac_lat, fac_lon, k=1, radii=(), memory_budget=BRUTE_MEMORY_BUDGET,
+                           dtype=np.float64, max_workers=None):
+    lat, lon, valid = _valid(lat, lon)
+    fac_lat, fac_lon, fac_valid = _valid(fac_lat, fac_lon)
+    fac_index = np.flatnonzero(fac_valid)
+    fac_lat, fac_lon = fac_lat[fac_valid], fac_lon[fac_valid]
+    if not len(fac_lat):
+        raise ValueError("위경도가 있는 시설이 없습니다")
+
+    dist, idx, counts = _empty_features(len(lat), k, radii)
+    rows = np.flatnonzero(valid)
+    if not len(rows):
+        return dist, idx, counts
+
+    n_fac = len(fac_lat)
+    kk = min(k, n_fac)
+    workers = max_workers or min(os.cpu_count() or 1, 8)
+    chunk_size = brute_chunk_size(n_fac, k, memory_budget, dtype, workers)
+    workers = max(1, min(workers, -(-len(rows) // chunk_size)))
+
+    # 기준점을 뺀 라디안 좌표 (float32에서도 Δ 정밀도 유지)
+    ref_lat, ref_lon = np.radians(fac_lat.mean()), np.radians(fac_lon.mean())
+    f_phi = (np.radians(fac_lat) - ref_lat).astype(dtype)
+    f_lam = (np.radians(fac_lon) - ref_lon).astype(dtype)
+    f_cos = np.cos(np.radians(fac_lat)).astype(dtype)
+    b_phi = (np.radians(lat[rows]) - ref_lat).astype(dtype)
+    b_lam = (np.radians(lon[rows]) - ref_lon).astype(dtype)
+    b_cos = np.cos(np.radians(lat[rows])).astype(dtype)
+    # d ≤ r  ⇔  a ≤ sin²(r / 2R)
+    thresholds = {r: np.sin(r / (2 * EARTH_RADIUS)) ** 2 for r in radii}
+
+    def run(starts):
+        a_buf = np.empty((chunk_size, n_fac), dtype=dtype)
+        t_buf = np.empty((chunk_size, n_fac), dtype=dtype)
+        m_buf = np.empty((chunk_size, n_fac), dtype=bool)
+        for start in starts:
+            stop = min(start + chunk_size, len(rows))
+            c = stop - start
+            a, t, m = a_buf[:c], t_buf[:c], m_buf[:c]
+            np.subtract(f_phi[None, :], b_phi[start:stop, None], out=a)
+            a *= 0.5
+            np.sin(a, out=a)
+            np.square(a, out=a)
+            np.subtract(f_lam[None, :], b_lam[start:stop, None], out=t)
+            t *= 0.5
+            np.sin(t, out=t)
+            np.square(t, out=t)
+            t *= f_cos[None, :]
+            t *= b_cos[start:stop, None]
+            a += t
+
+            # 거리가 같으면 앞쪽 시설 우선 (argmin/stable 정렬)
+            if kk == 1:
+                part = a.argmin(axis=1)[:, None]
+            else:
+                part = np.argsort(a, axis=1, kind="stable")[:, :kk]
+            out_rows = rows[start:stop]
+            dist[out_rows, :kk] = haversine(lat[out_rows, None], lon[out_rows, None], fac_lat[part], fac_lon[part])
+            idx[out_rows, :kk] = fac_index[part]
+            for r in radii:
+                np.less_equal(a, thresholds[r], out=m)
+                counts[r][out_rows] = m.sum(axis=1)
+
+    starts = list(range(0, len(rows), chunk_size))
+    if workers == 1:
+        run(starts)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, [starts[i::workers] for i in range(workers)]))
+    return dist, idx, counts
+
+
+# k-최근접 거리/시설 위치/반경별 시설 수 — 모든 호출부가 쓰는 공통 진입점
+# method: "auto"(scipy/pyproj 있으면 tree), "tree", "brute" (두 방식 모두 haversine 거리)
+def nearest_features(lat, lon, fac_lat, fac_lon, k=1, radii=(), method="auto", workers=-1):
+    if method == "auto":
+        method = "tree" if HAS_TREE else "brute"
+    if method == "tree":
+        return NearestFacility(fac_lat, fac_lon).query_features(lat, lon, k=k, radii=radii, workers=workers)
+    if method == "brute":
+        return nearest_features_brute(lat, lon, fac_lat, fac_lon, k=k, radii=radii,
+                                      max_workers=None if workers == -1 else workers)
+    raise ValueError(f"알 수 없는 method: {method}")
+
+
+# 최근접 시설 거리 (m)
+def nearest_distances(lat, lon, fac_lat, fac_lon, method="auto"):
+    return nearest_features(lat, lon, fac_lat, fac_lon, method=method)[0][:, 0]
+
+
+def nearest_distance_brute(lat, lon, fac_lat, fac_lon, memory_budget=BRUTE_MEMORY_BUDGET, dtype=np.float64):
+    return nearest_features_brute(lat, lon, fac_lat, fac_lon, memory_budget=memory_budget, dtype=dtype)[0][:, 0]
+
+
+# 피처 계산에 필요한 시설 컬럼만 로드 (식별 컬럼 + 위경도 [+ 시설유형코드])
+def load_facilities(name):
+    columns = [FACILITY_FEATURES[name]["id"], "위도", "경도"]
+    if name == "hydrants":
+        columns.append("시설유형코드")
+    return load(name, columns=columns)
+
+
+def save_facility_snapshot(name, fac):
+    fac.to_csv(FACILITY_SNAPSHOT.format(name=name), index=False, encoding="utf-8-sig")
+
+
+def load_facility_snapshot(name):
+    path = FACILITY_SNAPSHOT.format(name=name)
+    if not os.path.exists(path):
+        return None
+    spec = FACILITY_FEATURES[name]
+    # 저장한 좌표와 비트 단위로 같게 읽음 (기본 파서는 마지막 자리가 달라져 변경 없는 시설도 diff에 잡힘)
+    return pd.read_csv(path, encoding="utf-8-sig", dtype={spec["id"]: "string"}, float_precision="round_trip")
+
+
+# 시설별로 저장되는 건축물대장 피처 컬럼 (hydrants는 유형별 거리 포함)
+def feature_columns(name):
+    spec = FACILITY_FEATURES[name]
+    columns = [spec["distance"]]
+    columns += [f"{spec['prefix']}{i}순위거리" for i in range(2, spec["k"] + 1)]
+    columns += [f"{spec['prefix']}수_{r}m" for r in spec["radii"]]
+    columns.append(f"최근접{spec['prefix']}")
+    if name == "hydrants":
+        columns += [f"{t}거리" for t in HYDRANT_TYPES.values()]
+    return columns
+
+
+# 건물 위경도로 시설 피처 컬럼 계산 (FACILITY_FEATURES 중 names만)
+# 거리 외 피처가 필요 없으면 features=False
+# facilities: {이름: 시설 DataFrame} (없으면 load_facilities로 읽음)
+def facility_features(df, names=tuple(FACILITY_FEATURES), features=True, method="auto", facilities=None):
+    lat = df["위도"].to_numpy(dtype=np.float64)
+    lon = df["경도"].to_numpy(dtype=np.float64)
+    out = {}
+    for name in names:
+        spec = FACILITY_FEATURES[name]
+        k, radii = (spec["k"], spec["radii"]) if features else (1, ())
+        fac = (facilities or {}).get(name)
+        fac = load_facilities(name) if fac is None else fac
+        dist, idx, counts = nearest_features(lat, lon, fac["위도"], fac["경도"], k=k, radii=radii, method=method)
+
+        out[spec["distance"]] = dist[:, 0]
+        if not features:
+            continue
+        for i in range(2, k + 1):
+            out[f"{spec['prefix']}{i}순위거리"] = dist[:, i - 1]
+        for r in radii:
+            out[f"{spec['prefix']}수_{r}m"] = counts[r]
+        ids = fac[spec["id"]].to_numpy(dtype=object)
+        out[f"최근접{spec['prefix']}"] = np.where(idx[:, 0] >= 0, ids[idx[:, 0]], None)
+    return out
+
+
+# 소방용수시설 유형별 최근접 거리 컬럼 ('<유형 이름>거리')
+# 유형마다 KD-tree를 따로 만들어 스레드로 병렬 조회 (cKDTree 조회는 GIL을 풀고 실행)
+# 데이터에 없는 유형은 NaN 컬럼
+def hydrant_type_distances(df, types=HYDRANT_TYPES, method="auto", max_workers=None, fac=None):
+    lat = df["위도"].to_numpy(dtype=np.float64)
+    lon = df["경도"].to_numpy(dtype=np.float64)
+    fac = load_facilities("hydrants") if fac is None else fac
+    codes = fac["시설유형코드"].to_numpy()
+
+    def nearest(code):
+        mask = (codes == code) & fac["위도"].notna().to_numpy() & fac["경도"].notna().to_numpy()
+        if not mask.any():
+            return np.full(len(lat), np.nan)
+        return nearest_features(lat, lon, fac["위도"].to_numpy()[mask], fac["경도"].to_numpy()[mask],
+                                method=method, workers=1)[0][:, 0]
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(types)) as pool:
+        results = pool.map(nearest, list(types))
+        return {f"{types[code]}거리": dist for code, dist in zip(types, results)}
+
+
+# 건물 위경도로 거리 컬럼만 계산 (DISTANCE_COLUMNS 중 columns만)
+def facility_distances(df, columns=tuple(DISTANCE_COLUMNS), method="auto"):
+    return facility_features(df, [DISTANCE_COLUMNS[c] for c in columns], features=False, method=method)
+
+
+# 저장된 거리 컬럼이 있으면 그대로 쓰고, 없는 컬럼만 계산해서 채움
+def ensure_distances(df, columns=tuple(DISTANCE_COLUMNS), method="auto"):
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        df = df.assign(**facility_distances(df, missing, method=method))
+    return df
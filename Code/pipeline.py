@@ -0,0 +1,254 @@
+import os
+import ast
+import sys
+import json
+import time
+import hashlib
+import argparse
+import subprocess
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(CODE_DIR)
+ROAD_NETWORK = os.path.join(BASE_DIR, "Raw Data", "도로망", "대구광역시.osm")  # 선택 입력
+STATE_PATH = os.path.join(BASE_DIR, "Data", ".pipeline_state.json")
+LOG_DIR = os.path.join(BASE_DIR, "Data", ".pipeline_logs")
+
+
+def _data(name):
+    return os.path.join(BASE_DIR, "Data", name)
+
+
+def _building(version):
+    return _data(f"건축물대장_{version}.csv")
+
+
+# 건축물대장 v0.1 → v0.6 빌드 단계
+# - inputs: 읽는 파일 (스크립트와 스크립트가 import하는 Code/ 모듈은 자동으로 포함)
+# - outputs: 쓰는 파일 (다른 단계의 inputs에 있으면 그 단계가 먼저 실행됨)
+# 행정동 조인은 좌표만 필요하므로 거리 계산보다 앞에 두어,
+# 소방용수시설/소방서 파일만 바뀌면 거리 → 점수 → 구군 단계만 다시 실행됨
+STAGES = {
+    "geocode": {
+        "script": "extract_lat_lon.py",
+        "inputs": [os.path.join(BASE_DIR, "Raw Data", "건축물대장", "건축물대장_대구광역시_종합.csv")],
+        "outputs": [_building("v0.1")],
+    },
+    "preprocess": {
+        "script": "data_preprocessing.py",
+        "inputs": [_building("v0.1")],
+        "outputs": [_building("v0.2"), _data("건축물대장_v0.1_결측치.csv")],
+    },
+    "district": {
+        "script": "district_map.py",
+        "inputs": [_building("v0.2"),
+                   _data("시각화/대구_행정동/대구_행정동_군위포함.shp"),
+                   _data("시각화/대구_행정동/대구_행정동_군위포함.dbf"),
+                   _data("시각화/대구_시군구_군위포함/대구광역시_시군구_군위포함.dbf")],
+        "outputs": [_building("v0.3")],
+    },
+    "distance": {
+        "script": "add_min_firestation_distance.py",
+        "inputs": [_building("v0.3"),
+                   _data("대구광역시_용수시설_위치.csv"),
+                   _data("대구광역시_소방서_위치.csv"),
+                   *[p for p in [ROAD_NETWORK] if os.path.exists(p)]],
+        "outputs": [_building("v0.4"),
+                    _data("건축물대장_v0.4_hydrants.csv"),
+                    _data("건축물대장_v0.4_stations.csv")],
+    },
+    "scoring": {
+        "script": "scoring.py",
+        "inputs": [_building("v0.4"), os.path.join(CODE_DIR, "scoring_spec.yaml")],
+        "outputs": [_building("v0.5"), _data("건축물대장_v0.5_scores.npz")],
+    },
+    "gu": {
+        "script": "extract_gu.py",
+        "inputs": [_building("v0.5")],
+        "outputs": [_building("v0.6")],
+    },
+}
+
+
+# 스크립트가 import하는 Code/ 안의 모듈 (재귀)
+def local_modules(script, seen=None):
+    seen = set() if seen is None else seen
+    path = os.path.join(CODE_DIR, script)
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            module = name.split(".")[0] + ".py"
+            if module not in seen and os.path.exists(os.path.join(CODE_DIR, module)):
+                seen.add(module)
+                local_modules(module, seen)
+    return seen
+
+
+def stage_inputs(stage):
+    code = [stage["script"], *sorted(local_modules(stage["script"]))]
+    return [os.path.join(CODE_DIR, c) for c in code] + list(stage["inputs"])
+
+
+# 파일 내용 해시 (크기+수정시각이 같으면 이전 해시를 재사용)
+class Fingerprints:
+    def __init__(self, known=None):
+        self.known = dict(known or {})
+
+    def __call__(self, path):
+        if not os.path.exists(path):
+            return None
+        st = os.stat(path)
+        key = f"{st.st_size}:{st.st_mtime_ns}"
+        cached = self.known.get(path)
+        if cached and cached["stat"] == key:
+            return cached["sha256"]
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        self.known[path] = {"stat": key, "sha256": h.hexdigest()}
+        return self.known[path]["sha256"]
+
+
+def load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {"stages": {}, "files": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+# 단계별 선행 단계 (입력 파일을 만드는 단계)
+def dependencies(stages):
+    producer = {out: name for name, st in stages.items() for out in st["outputs"]}
+    return {
+        name: {producer[p] for p in st["inputs"] if p in producer and producer[p] != name}
+        for name, st in stages.items()
+    }
+
+
+# 다시 실행해야 하는 이유 (최신이면 None)
+def stale_reason(name, stage, record, fingerprint):
+    if record is None:
+        return "실행 기록 없음"
+    for path in stage_inputs(stage):
+        digest = fingerprint(path)
+        if digest is None:
+            raise FileNotFoundError(f"[{name}] 입력 파일 없음: {path}")
+        if record["inputs"].get(path) != digest:
+            return f"입력 변경: {os.path.relpath(path, BASE_DIR)}"
+    for path in stage["outputs"]:
+        if fingerprint(path) != record["outputs"].get(path):
+            return f"출력 없음/변경: {os.path.relpath(path, BASE_DIR)}"
+    return None
+
+
+def run_script(name, stage):
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_path = os.path.join(LOG_DIR, f"{name}.log")
+    start = time.time()
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.run([sys.executable, stage["script"]], cwd=CODE_DIR,
+                              stdout=log, stderr=subprocess.STDOUT)
+    if proc.returncode != 0:
+        raise RuntimeError(f"[{name}] {stage['script']} 실패 (exit {proc.returncode}), 로그: {log_path}")
+    return time.time() - start
+
+
+# 스크립트 밖에서 출력을 갱신한 단계(예: distance_update.py)를 최신으로 기록
+# 이미 실행 기록이 있는 단계만 현재 입력/출력 해시로 갱신
+def record_stages(names, stages=STAGES, state_path=STATE_PATH):
+    state = load_state(state_path)
+    fingerprint = Fingerprints(state.get("files"))
+    for name in names:
+        if name not in state["stages"]:
+            continue
+        stage = stages[name]
+        state["stages"][name] = {
+            "inputs": {p: fingerprint(p) for p in stage_inputs(stage)},
+            "outputs": {p: fingerprint(p) for p in stage["outputs"]},
+        }
+    state["files"] = fingerprint.known
+    save_state(state, state_path)
+
+
+# 파이프라인 실행
+# - targets: 이 단계들과 그 선행 단계만 실행 (None이면 전체)
+# - force: 최신 여부와 관계없이 다시 실행할 단계
+# - 단계는 선형 체인이므로 의존 순서대로 하나씩 실행
+# 입력 해시는 선행 단계가 끝난 뒤 확인하므로, 선행 단계 출력 내용이 그대로면 이후 단계는 건너뜀
+def run_pipeline(stages=STAGES, targets=None, force=(), dry_run=False, state_path=STATE_PATH):
+    deps = dependencies(stages)
+    selected = set(targets or stages)
+    pending = list(selected)
+    while pending:
+        for dep in deps[pending.pop()]:
+            if dep not in selected:
+                selected.add(dep)
+                pending.append(dep)
+
+    state = load_state(state_path)
+    fingerprint = Fingerprints(state.get("files"))
+    done, ran = set(), []
+    waiting = [n for n in stages if n in selected]
+
+    while waiting:
+        ready = [n for n in waiting if deps[n] & selected <= done]
+        if not ready:
+            raise RuntimeError(f"단계 의존 관계에 순환이 있습니다: {', '.join(waiting)}")
+        name = ready[0]
+        waiting.remove(name)
+        stage = stages[name]
+        reason = "강제 실행" if name in force else \
+            stale_reason(name, stage, state["stages"].get(name), fingerprint)
+        if reason is None:
+            print(f"[{name}] 최신")
+            done.add(name)
+            continue
+        print(f"[{name}] 실행 ({reason})")
+        if dry_run:
+            # 실제로 실행하지 않으므로 이후 단계는 입력이 바뀌었다고 가정
+            ran.append(name)
+            force = set(force) | {n for n in stages if name in deps[n]}
+            done.add(name)
+            continue
+
+        inputs = {p: fingerprint(p) for p in stage_inputs(stage)}
+        elapsed = run_script(name, stage)
+        outputs = {p: fingerprint(p) for p in stage["outputs"]}
+        missing = [p for p, d in outputs.items() if d is None]
+        if missing:
+            raise RuntimeError(f"[{name}] 출력 파일이 만들어지지 않음: {missing}")
+        state["stages"][name] = {"inputs": inputs, "outputs": outputs}
+        state["files"] = fingerprint.known
+        save_state(state, state_path)
+        print(f"[{name}] 완료 ({elapsed:.1f}s)")
+        ran.append(name)
+        done.add(name)
+    return ran
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="건축물대장 v0.1 → v0.6 빌드 (바뀐 단계만 다시 실행)")
+    parser.add_argument("targets", nargs="*", metavar="stage",
+                        help=f"실행할 단계 ({', '.join(STAGES)}), 생략하면 전체")
+    parser.add_argument("--force", nargs="*", default=[], choices=list(STAGES), help="강제로 다시 실행할 단계")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="실행할 단계만 출력")
+    args = parser.parse_args()
+    unknown = set(args.targets) - set(STAGES)
+    if unknown:
+        parser.error(f"알 수 없는 단계: {', '.join(sorted(unknown))}")
+    run_pipeline(targets=args.targets or None, force=set(args.force), dry_run=args.dry_run)
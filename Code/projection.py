@@ -0,0 +1,27 @@
+import numpy as np
+
+try:
+    from pyproj import Transformer
+    HAS_PYPROJ = True
+except ImportError:
+    HAS_PYPROJ = False
+
+# 거리 계산/격자용 평면 좌표계 (Korea 2000 / Central Belt 2010, 단위 m)
+PROJECTED_CRS = "EPSG:5186"
+
+_TO_PROJECTED = Transformer.from_crs("EPSG:4326", PROJECTED_CRS, always_xy=True) if HAS_PYPROJ else None
+_TO_LONLAT = Transformer.from_crs(PROJECTED_CRS, "EPSG:4326", always_xy=True) if HAS_PYPROJ else None
+
+
+# 위경도(도) → EPSG:5186 (x, y) 배열
+def project(lat, lon):
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    x, y = _TO_PROJECTED.transform(lon, lat)
+    return np.column_stack([x, y])
+
+
+# EPSG:5186 (x, y) → (위도, 경도) 배열
+def unproject(x, y):
+    lon, lat = _TO_LONLAT.transform(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    return lat, lon
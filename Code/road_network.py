@@ -0,0 +1,214 @@
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, dijkstra
+from scipy.spatial import cKDTree
+
+from nearest_facility import FACILITY_FEATURES, haversine
+from projection import project
+
+# 도로 종류(OSM highway)별 기본 속도 (km/h, maxspeed 태그가 없을 때)
+ROAD_SPEEDS = {
+    "motorway": 80, "motorway_link": 50,
+    "trunk": 70, "trunk_link": 40,
+    "primary": 60, "primary_link": 40,
+    "secondary": 50, "secondary_link": 30,
+    "tertiary": 40, "tertiary_link": 30,
+    "unclassified": 30, "residential": 30, "living_street": 20, "service": 20,
+    "road": 30, "track": 15,
+}
+
+# 건물/소방서 ↔ 가장 가까운 도로 노드 사이 접근 구간 속도 (km/h)
+ACCESS_SPEED_KMH = 20
+
+
+def _parse_speed(value, default):
+    if not value:
+        return default
+    digits = value.split()[0].split(";")[0]
+    try:
+        speed = float(digits)
+    except ValueError:
+        return default
+    return speed * 1.609 if "mph" in value else speed
+
+
+# OSM XML(.osm)에서 차량 통행 가능한 도로만 읽어 간선 목록 생성
+# 반환: (노드 위도, 노드 경도, 출발 노드, 도착 노드, 속도 km/h) — 노드 번호는 0부터
+def read_osm(path):
+    node_pos, ways = {}, []
+    for _, elem in ET.iterparse(path, events=("end",)):
+        if elem.tag == "node":
+            node_pos[elem.get("id")] = (float(elem.get("lat")), float(elem.get("lon")))
+            elem.clear()
+        elif elem.tag == "way":
+            tags = {t.get("k"): t.get("v") for t in elem.iter("tag")}
+            highway = tags.get("highway")
+            if highway in ROAD_SPEEDS:
+                refs = [nd.get("ref") for nd in elem.iter("nd")]
+                speed = _parse_speed(tags.get("maxspeed"), ROAD_SPEEDS[highway])
+                ways.append((refs, tags.get("oneway"), speed))
+            elem.clear()
+
+    ids = {}
+    src, dst, speed = [], [], []
+    for refs, oneway, kmh in ways:
+        refs = [r for r in refs if r in node_pos]
+        if oneway == "-1":
+            refs = refs[::-1]
+        nodes = [ids.setdefault(r, len(ids)) for r in refs]
+        for a, b in zip(nodes[:-1], nodes[1:]):
+            src.append(a), dst.append(b), speed.append(kmh)
+            if oneway not in ("yes", "true", "1", "-1"):
+                src.append(b), dst.append(a), speed.append(kmh)
+
+    lat = np.empty(len(ids))
+    lon = np.empty(len(ids))
+    for ref, i in ids.items():
+        lat[i], lon[i] = node_pos[ref]
+    return lat, lon, np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64), np.asarray(speed, dtype=float)
+
+
+# 도로망 최단거리 엔진 (방향 그래프, 간선 가중치 = 길이 m)
+# - 가장 큰 강한 연결 요소만 사용 (고립된 도로 조각/일방통행 막다른 길에 스냅되는 것 방지)
+# - 건물/소방서는 EPSG:5186 KD-tree로 가장 가까운 노드에 스냅
+# - 모든 소방서에서 출발하는 다중 출발점 Dijkstra 한 번으로 전체 노드의 최근접 소방서 거리 계산
+class RoadNetwork:
+    _ARRAYS = ("lat", "lon", "src", "dst", "length", "speed")
+
+    def __init__(self, lat, lon, src, dst, speed):
+        lat, lon = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+        length = haversine(lat[src], lon[src], lat[dst], lon[dst])
+        self._set_arrays(lat=lat, lon=lon, src=src, dst=dst, length=length, speed=np.asarray(speed, dtype=float))
+
+    def _set_arrays(self, **arrays):
+        n = len(arrays["lat"])
+        graph = csr_matrix((np.ones(len(arrays["src"])), (arrays["src"], arrays["dst"])), shape=(n, n))
+        _, labels = connected_components(graph, directed=True, connection="strong")
+        main = labels == np.bincount(labels).argmax()
+
+        # 가장 큰 연결 요소로 노드 번호 재배열, 중복 간선은 가장 짧은 것만
+        remap = np.full(n, -1, dtype=np.int64)
+        remap[main] = np.arange(main.sum())
+        keep = np.flatnonzero(main[arrays["src"]] & main[arrays["dst"]])
+        src, dst = remap[arrays["src"][keep]], remap[arrays["dst"][keep]]
+        order = np.lexsort((arrays["length"][keep], dst, src))
+        first = np.r_[True, (np.diff(src[order]) != 0) | (np.diff(dst[order]) != 0)]
+        keep = keep[order[first]]
+
+        self.lat, self.lon = arrays["lat"][main], arrays["lon"][main]
+        self.src, self.dst = remap[arrays["src"][keep]], remap[arrays["dst"][keep]]
+        self.length, self.speed = arrays["length"][keep], arrays["speed"][keep]
+        self.tree = cKDTree(project(self.lat, self.lon))
+
+    def __len__(self):
+        return len(self.lat)
+
+    @classmethod
+    def from_osm(cls, path):
+        return cls(*read_osm(path))
+
+    def save(self, path):
+        np.savez(path, **{name: getattr(self, name) for name in self._ARRAYS})
+
+    @classmethod
+    def load(cls, path):
+        network = cls.__new__(cls)
+        with np.load(path) as z:
+            network._set_arrays(**{name: z[name] for name in cls._ARRAYS})
+        return network
+
+    # 가장 가까운 도로 노드와 그 노드까지 거리 (m, 위경도 없으면 노드 -1)
+    def snap(self, lat, lon):
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        node = np.full(lat.shape, -1, dtype=np.int64)
+        dist = np.full(lat.shape, np.nan)
+        valid = ~(np.isnan(lat) | np.isnan(lon))
+        if valid.any():
+            _, node[valid] = self.tree.query(project(lat[valid], lon[valid]))
+            dist[valid] = haversine(lat[valid], lon[valid], self.lat[node[valid]], self.lon[node[valid]])
+        return node, dist
+
+    # 시설(소방서)에서 모든 노드까지 최단 도로거리/소요시간/출발 시설
+    # 가상 출발 노드 하나에서 각 시설 노드로 (접근 거리) 간선을 두고 Dijkstra 1회
+    # 소요시간은 최단거리 경로를 따라 간선별 (길이 / 속도)를 합산
+    def from_facilities(self, fac_lat, fac_lon):
+        n = len(self)
+        fac_node, fac_dist = self.snap(fac_lat, fac_lon)
+        valid = np.flatnonzero(fac_node >= 0)
+        if not len(valid):
+            raise ValueError("위경도가 있는 시설이 없습니다")
+        # 같은 노드에 스냅된 시설은 접근 거리가 가장 짧은 시설만 사용
+        valid = valid[np.lexsort((fac_dist[valid], fac_node[valid]))]
+        valid = valid[np.r_[True, np.diff(fac_node[valid]) != 0]]
+
+        # 간선 (src, dst)는 정렬·중복 제거된 상태 → 가상 노드 간선(src = n)을 뒤에 붙여도 정렬 유지
+        super_node = n
+        src = np.r_[self.src, np.full(len(valid), super_node)]
+        dst = np.r_[self.dst, fac_node[valid]]
+        length = np.r_[self.length, fac_dist[valid]]
+        seconds = np.r_[self.length / (self.speed / 3.6), fac_dist[valid] / (ACCESS_SPEED_KMH / 3.6)]
+        # 길이 0 간선(같은 좌표 노드)은 희소행렬에서 빠지므로 아주 작은 값을 더함
+        graph = csr_matrix((length + 1e-6, (src, dst)), shape=(n + 1, n + 1))
+        dist, pred = dijkstra(graph, directed=True, indices=super_node, return_predecessors=True)
+        dist, pred = dist[:n], pred[:n].astype(np.int64)
+
+        # 노드별 부모(출발 시설 노드는 자기 자신)와 부모→노드 간선 소요시간
+        reached = pred >= 0
+        nodes = np.arange(n)
+        parent = np.where(reached & (pred != super_node), pred, nodes)
+        edge_key = src * (n + 1) + dst
+        step = np.zeros(n)
+        step[reached] = seconds[np.searchsorted(edge_key, pred[reached] * (n + 1) + nodes[reached])]
+
+        # 포인터 더블링으로 경로 소요시간 합/출발 노드 계산 (O(노드 수 × log 경로 길이))
+        total, root = step.copy(), parent.copy()
+        while True:
+            moving = root != root[root]
+            if not moving.any():
+                break
+            total = np.where(moving, total + total[root], total)
+            root = root[root]
+        total = np.where(root != nodes, total + step[root], total)
+
+        fac_at_node = np.full(n, -1, dtype=np.int64)
+        fac_at_node[fac_node[valid]] = valid
+        source = np.where(reached, fac_at_node[root], -1)
+        return np.where(reached, dist, np.nan), np.where(reached, total, np.nan), source
+
+    # 건물별 최근접(도로거리 기준) 시설의 도로거리(m), 소요시간(초), 시설 위치(없으면 -1)
+    def query(self, lat, lon, fac_lat, fac_lon):
+        node_dist, node_time, node_source = self.from_facilities(fac_lat, fac_lon)
+        node, access = self.snap(lat, lon)
+        ok = node >= 0
+        dist = np.full(node.shape, np.nan)
+        seconds = np.full(node.shape, np.nan)
+        source = np.full(node.shape, -1, dtype=np.int64)
+        dist[ok] = node_dist[node[ok]] + access[ok]
+        seconds[ok] = node_time[node[ok]] + access[ok] / (ACCESS_SPEED_KMH / 3.6)
+        source[ok] = node_source[node[ok]]
+        return dist, seconds, source
+
+
+# 도로망 파일(.osm)을 읽되, 파싱 결과(npz)가 더 최신이면 그것을 사용
+def load_road_network(osm_path, cache_path=None):
+    cache_path = cache_path or os.path.splitext(osm_path)[0] + ".npz"
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(osm_path):
+        return RoadNetwork.load(cache_path)
+    network = RoadNetwork.from_osm(osm_path)
+    network.save(cache_path)
+    return network
+
+
+# 건물별 최근접 소방서 도로거리(m)/소요시간(분)/소방서 이름
+def station_network_features(df, network, stations):
+    dist, seconds, source = network.query(df["위도"], df["경도"], stations["위도"], stations["경도"])
+    names = stations[FACILITY_FEATURES["stations"]["id"]].to_numpy(dtype=object)
+    return {
+        "소방서도로거리": dist,
+        "소방서도로소요시간": seconds / 60,
+        "최근접소방서(도로)": np.where(source >= 0, names[source], None),
+    }
@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from datasets import DATA_DIR
+
+# 건축물대장 v0.5 구성 점수 행렬 (행 순서 = v0.5/v0.6 행 순서)
+SCORE_MATRIX_PATH = os.path.join(DATA_DIR, "건축물대장_v0.5_scores.npz")
+
+
+# 건물 × 구성 점수 float32 행렬
+# - 가중치만 바뀌면 종합점수 = 행렬 × 가중치 벡터 한 번 (원본 컬럼 파싱/재채점 없음)
+# - signature: 점수를 만든 정의(가중치 제외, ScoringModel.signature) — 다르면 다시 채점해야 함
+# - 집계 그룹(구군, 동 등)은 add_groups로 코드화해 두고 np.bincount로 평균
+class ScoreMatrix:
+    def __init__(self, values, names, signature=""):
+        self.values = np.ascontiguousarray(values, dtype=np.float32)
+        self.names = [str(n) for n in names]
+        self.signature = str(signature)
+        if self.values.ndim != 2 or self.values.shape[1] != len(self.names):
+            raise ValueError(f"점수 행렬 모양 {self.values.shape}과 구성 요소 {len(self.names)}개가 맞지 않습니다")
+        self.groups = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    @classmethod
+    def from_scores(cls, scores, signature=""):
+        return cls(scores.to_numpy(dtype=np.float32), scores.columns, signature)
+
+    def save(self, path=SCORE_MATRIX_PATH):
+        np.savez(path, values=self.values, names=np.array(self.names), signature=np.array(self.signature))
+
+    @classmethod
+    def load(cls, path=SCORE_MATRIX_PATH):
+        with np.load(path) as z:
+            return cls(z["values"], z["names"].tolist(), z["signature"].item())
+
+    # 가중치(dict/Series: 구성 요소 → 가중치, 없는 요소는 0) → float32 벡터
+    def weight_vector(self, weights=None):
+        if weights is None:
+            return np.ones(len(self.names), dtype=np.float32)
+        weights = pd.Series(weights, dtype=float)
+        unknown = weights.index.difference(self.names)
+        if len(unknown):
+            raise KeyError(f"점수 행렬에 없는 구성 요소: {', '.join(unknown)}")
+        return weights.reindex(self.names, fill_value=0).to_numpy(dtype=np.float32)
+
+    # 종합점수 = 행렬 × 가중치 (구성 점수 중 NaN이 있으면 NaN)
+    def total(self, weights=None):
+        return self.values @ self.weight_vector(weights)
+
+    # 집계 그룹 등록 (keys: 건물별 그룹 값, 여러 컬럼이면 DataFrame — 결측이 있는 건물은 집계에서 제외)
+    def add_groups(self, name, keys):
+        if len(keys) != len(self):
+            raise ValueError(f"[{name}] 그룹 길이 {len(keys)} ≠ 건물 수 {len(self)}")
+        if isinstance(keys, pd.DataFrame):
+            missing = keys.isna().any(axis=1).to_numpy()
+            codes, labels = pd.MultiIndex.from_frame(keys).factorize()
+            labels = labels.set_names(keys.columns)
+        else:
+            keys = pd.Series(keys)
+            missing = keys.isna().to_numpy()
+            codes, labels = pd.factorize(keys)
+            labels = pd.Index(labels, name=name)
+        # 0번 칸 = 그룹 없음 (bincount 후 버림)
+        self.groups[name] = (np.where(missing, 0, codes + 1).astype(np.intp), labels)
+
+    # 그룹별 종합점수 평균/건물 수 (종합점수가 NaN인 건물 제외, 건물이 없는 그룹은 빠짐)
+    def aggregate(self, name, weights=None, total=None):
+        codes, labels = self.groups[name]
+        total = self.total(weights) if total is None else total
+        valid = ~np.isnan(total)
+        n = len(labels) + 1
+        count = np.bincount(codes, weights=valid, minlength=n)[1:]
+        sums = np.bincount(codes, weights=np.where(valid, total, 0), minlength=n)[1:]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = sums / count
+        out = pd.DataFrame({"종합점수_평균": mean, "건물수": count.astype(np.int64)}, index=labels)
+        return out[count > 0]
+
+    # 등록한 모든 그룹의 집계 (종합점수는 한 번만 계산)
+    def aggregates(self, weights=None, total=None):
+        total = self.total(weights) if total is None else total
+        return {name: self.aggregate(name, total=total) for name in self.groups}
+
+
+# 저장된 점수 행렬이 현재 정의/행 수와 맞으면 사용, 아니면 None
+def load_score_matrix(signature, n_rows, path=SCORE_MATRIX_PATH):
+    if not os.path.exists(path):
+        return None
+    matrix = ScoreMatrix.load(path)
+    if matrix.signature != signature or len(matrix) != n_rows:
+        return None
+    return matrix
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from datasets import sniff_encoding
+
+# 한 번에 읽어 채점하는 행 수 (최대 메모리 ≈ chunk 하나 + 그룹별 누적값)
+STREAM_CHUNK_SIZE = 200_000
+
+# 누적 집계 단위: 이름 → 그룹 키 컬럼 (행정동 조인 결과, v0.3부터 있음)
+AGGREGATE_GROUPS = {
+    "구군": ["구군"],
+    "동": ["구군", "ADM_DR_NM"],
+}
+
+
+# 그룹별 점수 합/개수를 chunk마다 더해 두는 누적 집계
+# 메모리는 그룹 수에만 비례 (건물 수와 무관), 결과는 전체를 한 번에 집계한 평균과 같음
+class RunningAggregates:
+    def __init__(self, names, groups=AGGREGATE_GROUPS):
+        self.names = list(names)
+        self.groups = {name: list(keys) for name, keys in groups.items()}
+        self.sums, self.counts, self.sizes = {}, {}, {}
+
+    def update(self, df):
+        for name, keys in self.groups.items():
+            g = df[keys + self.names].groupby(keys, observed=True, sort=False)
+            # NaN 점수는 합/개수 모두에서 제외 (열별 평균은 값이 있는 건물 기준)
+            for store, part in ((self.sums, g.sum()), (self.counts, g.count()), (self.sizes, g.size())):
+                store[name] = part if name not in store else store[name].add(part, fill_value=0)
+
+    # 그룹별 점수 평균(<점수>_평균) + 건물수
+    def result(self, name):
+        if name not in self.sums:
+            keys = self.groups[name]
+            return pd.DataFrame(columns=keys + [f"{c}_평균" for c in self.names] + ["건물수"])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.sums[name] / self.counts[name].where(self.counts[name] > 0)
+        out = mean.add_suffix("_평균")
+        out["건물수"] = self.sizes[name].astype(np.int64)
+        return out.sort_index().reset_index()
+
+    def results(self):
+        return {name: self.result(name) for name in self.groups}
+
+
+# 큰 건축물대장 CSV를 chunk 단위로 채점해 out_path에 이어 쓰기 + 구군/동 누적 집계
+# - 원본 컬럼은 문자열로 읽어 그대로 통과 (chunk마다 dtype 추론이 달라져 '3'/'3.0'이 섞이지 않게)
+#   거리 컬럼만 실수로 읽음
+# - model: scoring_spec.ScoringModel, 구성 점수 컬럼과 종합점수를 붙임
+# - 반환: (행 수, RunningAggregates)
+def stream_score_csv(src_path, out_path, model, chunksize=STREAM_CHUNK_SIZE, groups=AGGREGATE_GROUPS,
+                     encoding=None, out_encoding="utf-8-sig"):
+    encoding = encoding or sniff_encoding(src_path)
+    header = pd.read_csv(src_path, nrows=0, encoding=encoding).columns
+    numeric = {c.column for c in model.components if c.kind == "distance"}
+    dtype = {col: (float if col in numeric else str) for col in header}
+    groups = {name: keys for name, keys in groups.items() if set(keys) <= set(header)}
+    aggregates = RunningAggregates([*model.names, "종합점수"], groups)
+
+    n_rows = 0
+    tmp = out_path + ".tmp"
+    with open(tmp, "w", encoding=out_encoding, newline="") as out:
+        for chunk in pd.read_csv(src_path, chunksize=chunksize, encoding=encoding, dtype=dtype):
+            scores = model.score(chunk)
+            chunk[model.names] = scores
+            chunk["종합점수"] = model.total(scores)
+            aggregates.update(chunk)
+            chunk.to_csv(out, index=False, header=n_rows == 0)
+            n_rows += len(chunk)
+            print(f"{n_rows}행 채점")
+    os.replace(tmp, out_path)
+    return n_rows, aggregates
+
+
+# 누적 집계를 out_path 옆에 CSV로 저장 (<out 이름>_<그룹>별점수.csv)
+def write_aggregates(aggregates, out_path, encoding="utf-8-sig"):
+    stem = os.path.splitext(out_path)[0]
+    paths = {}
+    for name, table in aggregates.results().items():
+        paths[name] = f"{stem}_{name}별점수.csv"
+        table.to_csv(paths[name], index=False, encoding=encoding)
+    return paths
@@ -1,411 +1,211 @@
 from datetime import date
-import math, re
+import re
 import numpy as np
 import pandas as pd
 
-def _parse_year(value):
-    if value is None:
-        return None
-
-    # float NaN 처리
-    if isinstance(value, float) and math.isnan(value):
-        return None
-
-    # 이미 숫자면 처리
-    if isinstance(value, int):
-        return value
-    if isinstance(value, float):
-        return int(value)
-
-    # 문자열 처리
-    s = str(value).strip()
-    if s == "":
-        return None
-
-    # '1985.0', '1985', '+1985', '1,985.0' 같은 숫자 문자열 처리
-    s_num = s.replace(",", "")
-    if re.fullmatch(r"[+-]?\d+(\.\d+)?", s_num):
-        try:
-            return int(float(s_num))
-        except Exception:
-            return None
-
-    # 날짜/텍스트 안에 포함된 4자리 연도 추출 (예: '1985-01-01')
-    m = re.search(r"(\d{4})", s)
-    if m:
-        return int(m.group(1))
-
-    return None
-
-def aging_score(value):
-    year = _parse_year(value)
-    if year is None:
-        return 0
-
-    current_year = date.today().year
-    age = current_year - year
-
-    # 미래 연도/비정상 값
-    if age < 0 or year < 1800:
-        return 0
-
-    if age >= 40:
-        return 5
-    elif age >= 30:
-        return 4
-    elif age >= 20:
-        return 3
-    elif age >= 10:
-        return 2
-    elif age >= 0:
-        return 1
-    else:
-        return 0
-
-
-def _parse_floor_count(value):
-    if value is None:
-        return None
-    if isinstance(value, float) and math.isnan(value):
-        return None
-    if isinstance(value, (int, float)):
-        n = int(float(value))
-        return n if n >= 0 else None
-
-    s = str(value).strip()
-    if s == "":
-        return None
-
-    # 숫자만/소수 형태
-    s_num = s.replace(",", "")
-    if re.fullmatch(r"[+-]?\d+(\.\d+)?", s_num):
-        try:
-            n = int(float(s_num))
-            return n if n >= 0 else None
-        except Exception:
-            return None
-
-    # 문자열에 포함된 정수 추출 (예: '지상 12층')
-    m = re.search(r"(-?\d+)", s)
-    if m:
-        n = int(m.group(1))
-        return n if n >= 0 else None
-
-    return None
-
-def aboveground_floors_score(value):
-    floors = _parse_floor_count(value)
-    if floors is None:
-        return 0
-
-    if floors >= 30:
-        return 5
-    elif floors >= 20:
-        return 4
-    elif floors >= 10:
-        return 3
-    elif floors >= 5:
-        return 2
-    elif floors >= 1:
-        return 1
-    else:  # 0층
-        return 0
-
-def _parse_basement_floor_count(value):
-    if value is None:
-        return None
-    if isinstance(value, float) and math.isnan(value):
-        return None
-
-    # 숫자형 바로 처리
-    if isinstance(value, (int, float)):
-        try:
-            n = int(float(value))
-            return abs(n) if n != 0 else 0
-        except Exception:
-            return None
-
-    # 문자열 처리
-    s = str(value).strip()
-    if s == "":
-        return None
-
-    # 'B3' / 'B3F' / 'b 3' 형태
-    m = re.fullmatch(r"[Bb]\s*(\d+)\s*[Ff]?", s)
-    if m:
-        return int(m.group(1))
-
-    # '지하3층' / '지하 2' 형태
-    m = re.search(r"지하\s*(\d+)", s)
-    if m:
-        return int(m.group(1))
-
-    # 일반 숫자 추출(음수 포함) → 절대값
-    m = re.search(r"(-?\d+)", s.replace(",", ""))
-    if m:
-        try:
-            return abs(int(m.group(1)))
-        except Exception:
-            return None
-
-    return None
-
-def basement_floors_score(value):
-    floors = _parse_basement_floor_count(value)
-    if floors is None:
-        return 0
-
-    if floors >= 3:
-        return 3
-    elif floors >= 2:
-        return 2
-    elif floors >= 1:
-        return 1
-    else:
-        return 0
-
-MAIN_USE_SCORE_MAP = {
-    # 9.0 — 숙박/다중이용시설
-    '숙박시설': 9.0,
-    '야영장시설': 9.0,
-    '관광휴게시설': 9.0,
-
-    # 8.0 — 공장/창고시설
-    '공장': 8.0,
-    '창고시설': 8.0,
-
-    # 7.0 — 교육/복지/의료/수련
-    '노유자시설': 7.0,
-    '교육연구시설': 7.0,
-    '교육연구및복지시설': 7.0,
-    '의료시설': 7.0,
-    '수련시설': 7.0,
-
-    # 5.0 — 상업/판매/문화/업무/근린/생활편익
-    '제2종근린생활시설': 5.0,
-    '근린생활시설': 5.0,
-    '제1종근린생활시설': 5.0,
-    '종교시설': 5.0,
-    '문화및집회시설': 5.0,
-    '운동시설': 5.0,
-    '업무시설': 5.0,
-    '판매시설': 5.0,
-    '위락시설': 5.0,
-    '판매및영업시설': 5.0,
-    '기타제1종근린생활시설': 5.0,
-    '생활편익시설': 5.0,
-    '소매점': 5.0,
-
-    # 4.0 — 교정/군사/운수/환경·처리/통신/자동차/장례/발전/묘지 등 기반시설
-    '동물및식물관련시설': 4.0,
-    '위험물저장및처리시설': 4.0,
-    '자원순환관련시설': 4.0,
-    '분뇨.쓰레기처리시설': 4.0,
-    '방송통신시설': 4.0,
-    '자동차관련시설': 4.0,
-    '장례시설': 4.0,
-    '운수시설': 4.0,
-    '교정및군사시설': 4.0,
-    '국방,군사시설': 4.0,
-    '발전시설': 4.0,
-    '묘지관련시설': 4.0,
-
-    # 2.0 — 주거
-    '단독주택': 2.0,
-    '공동주택': 2.0,
-    '다가구주택': 2.0,
-
-    # 1.0 — 행정/공공
-    '공공용시설': 1.0,
-}
+from dataset_store import write_dataset
+from datasets import load_buildings
+
+# 점수 계산 커널 — 구간/점수표/가중치는 scoring_spec.yaml에만 정의 (scoring_spec.py가 아래 함수로 컴파일)
+
+# 컬럼 전체를 한 번에 점수화
+# - 고유값(pd.factorize)만 파싱/점수화해 전체 행에 broadcast — 연도/층수/구조명은 종류가 수백 개 이하
+# - 문자열 파싱은 pandas .str 정규식, 구간 점수는 np.searchsorted
+# - 숫자형 값(int/float)은 int(v)처럼 소수점 버림, 나머지는 str(v).strip()으로 파싱
+
+_NUMBER_PATTERN = r"[+-]?\d+(?:\.\d+)?"
+
+
+# 정규식으로 뽑은 숫자 문자열 → float (못 찾은 값은 NaN, 전각 숫자도 int()처럼 처리)
+def _to_float(found):
+    return found.map(float, na_action="ignore").to_numpy(dtype=float)
+
+
+# 값 종류별 점수를 한 번만 계산해 전체 행에 broadcast (결측은 missing)
+# score_uniques: 고유값(object 배열) → 점수 배열
+def _score_by_value(values, score_uniques, missing=0, dtype=float):
+    codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=True)
+    if not len(uniques):
+        # 전부 결측 (점수 배열이 비어 있어 인덱싱 불가)
+        return np.full(len(codes), missing, dtype=dtype)
+    scores = np.asarray(score_uniques(np.asarray(uniques, dtype=object)), dtype=dtype)
+    return np.where(codes >= 0, scores[np.maximum(codes, 0)], missing).astype(dtype)
 
-def main_use_score_exact(value) -> float:
-    if value is None:
-        return 0.0
-
-    # float NaN 처리
-    if isinstance(value, float) and math.isnan(value):
-        return 0.0
-
-    s = str(value).strip()
-    if s == "" or s.lower() == "nan":
-        return 0.0
-
-    return MAIN_USE_SCORE_MAP.get(s, 0.0)
-
-STRUCTURE_SCORE_MAP = {
-    # 콘크리트 계열 (0.0)
-    '철근콘크리트구조': 0.0,
-    '콘크리트구조': 0.0,
-    '프리케스트콘크리트구조': 0.0,
-    '보강콘크리트조': 0.0,
-    '기타콘크리트구조': 0.0,
-    '라멘조': 0.0,
-
-    # 철골 계열 (2.0)
-    '일반철골구조': 2.0,
-    '경량철골구조': 2.0,
-    '강파이프구조': 2.0,
-    '철파이프조': 2.0,
-    '기타강구조': 2.0,
-    '스틸하우스조': 2.0,
-    '단일형강구조': 2.0,
-    '철골구조': 2.0,
-    '공업화박판강구조(PEB)': 2.0,
-    '트러스구조': 2.0,
-    # 철골+콘크리트 복합은 '철골 계열'로 분류
-    '철골콘크리트구조': 2.0,
-    '철골철근콘크리트구조': 2.0,
-    '철골철근콘크리트합성구조': 2.0,
-    '기타철골철근콘크리트구조': 2.0,
-
-    # 목조 계열 (5.0)
-    '일반목구조': 5.0,
-    '목구조': 5.0,
-    '통나무구조': 5.0,
-    '트러스목구조': 5.0,
-
-    # 조적식 구조 (4.0)
-    '벽돌구조': 4.0,
-    '블록구조': 4.0,
-    '시멘트블럭조': 4.0,
-    '조적구조': 4.0,
-    '기타조적구조': 4.0,
-    '석구조': 4.0,
-    '흙벽돌조': 4.0,
-
-    # 조립식/판넬/컨테이너 (3.0)
-    '조립식판넬조': 3.0,
-    '컨테이너조': 3.0,
-
-    # 기타/특수 (1.0)
-    '막구조': 1.0,
-    '기타구조': 1.0,
+
+# 고유값 → str(v).strip() (object dtype 유지: 파이썬 re와 같은 정규식 동작, 예: 전각 숫자도 \d)
+def _as_text(values):
+    return pd.Series([str(v) for v in values], dtype=object).str.strip()
+
+
+# 고유값을 숫자형 값과 문자열로 분리
+def _split_numeric(uniques):
+    is_number = np.array([isinstance(v, (int, float)) for v in uniques], dtype=bool)
+    numbers = np.trunc(uniques[is_number].astype(float))  # int(float(v))
+    text = _as_text(uniques[~is_number])
+    return is_number, numbers, text
+
+
+# 문자열 → 숫자 문자열('1985.0', '+1985', '1,985')이면 int(float(.)), 아니면 NaN
+def _parse_number_text(text):
+    s_num = text.str.replace(",", "", regex=False)
+    numeric = s_num.str.fullmatch(_NUMBER_PATTERN).fillna(False).astype(bool)
+    return np.trunc(_to_float(s_num.where(numeric)))
+
+
+# 연도 파싱: 숫자 문자열이면 그 값, 아니면 처음 나오는 4자리 숫자 (없으면 NaN)
+def _parse_years(uniques):
+    is_number, numbers, text = _split_numeric(uniques)
+    years = _parse_number_text(text)
+    fallback = np.isnan(years)
+    years[fallback] = _to_float(text[fallback].str.extract(r"(\d{4})", expand=False))
+    out = np.empty(len(uniques))
+    out[is_number], out[~is_number] = numbers, years
+    return out
+
+
+# 지상층수 파싱: 숫자 문자열이면 그 값, 아니면 처음 나오는 정수 ('지상 12층'), 음수는 NaN
+def _parse_floor_counts(uniques):
+    is_number, numbers, text = _split_numeric(uniques)
+    floors = _parse_number_text(text)
+    fallback = np.isnan(floors)
+    floors[fallback] = _to_float(text[fallback].str.extract(r"(-?\d+)", expand=False))
+    out = np.empty(len(uniques))
+    out[is_number], out[~is_number] = numbers, floors
+    return np.where(out >= 0, out, np.nan)
+
+
+# 지하층수 파싱: 'B3'/'B3F', '지하 2층', 그 밖의 첫 정수 순서로 찾아 절대값 (없으면 NaN)
+def _parse_basement_floor_counts(uniques):
+    is_number, numbers, text = _split_numeric(uniques)
+    floors = np.full(len(text), np.nan)
+    for pattern, s, match in (
+        (r"[Bb]\s*(\d+)\s*[Ff]?", text, "fullmatch"),       # 'B3' / 'B3F' / 'b 3'
+        (r"지하\s*(\d+)", text, "search"),                   # '지하3층' / '지하 2'
+        (r"(-?\d+)", text.str.replace(",", "", regex=False), "search"),  # 일반 숫자(음수 포함) → 절대값
+    ):
+        todo = np.isnan(floors)
+        if match == "fullmatch":
+            found = s[todo].str.extract(f"^(?:{pattern})\\Z", expand=False)
+        else:
+            found = s[todo].str.extract(pattern, expand=False)
+        floors[todo] = _to_float(found)
+    out = np.empty(len(uniques))
+    out[is_number], out[~is_number] = np.abs(numbers), np.abs(floors)
+    return out
+
+
+# 개수 파싱: 숫자형은 0 이상만, 문자열은 처음 나오는 0 이상 정수 ('7대') (없으면 NaN)
+def _parse_nonneg_int_counts(uniques):
+    is_number, numbers, text = _split_numeric(uniques)
+    found = text.str.replace(",", "", regex=False).str.extract(r"(\d+)", expand=False)
+    counts = _to_float(found)
+    out = np.empty(len(uniques))
+    out[is_number], out[~is_number] = np.where(numbers >= 0, numbers, np.nan), counts
+    return out
+
+
+# 구간 점수: scores[i] = i번째 구간 점수 (len(scores) = len(bins) + 1)
+# edge="upper"면 경계값은 위 구간('값 < 경계'), "lower"면 아래 구간('값 ≤ 경계')
+def _bin(x, bins, scores, edge):
+    if len(scores) != len(bins) + 1:
+        raise ValueError(f"구간 점수는 경계보다 1개 많아야 합니다 (경계 {len(bins)}개, 점수 {len(scores)}개)")
+    side = {"upper": "right", "lower": "left"}[edge]
+    return np.asarray(scores)[np.minimum(np.searchsorted(bins, x, side=side), len(bins))]
+
+
+def _score_dtype(scores, missing):
+    return np.result_type(np.asarray(scores), np.asarray(missing))
+
+
+# 사용승인년도 → 경과 연수 구간 점수 (연도 없음/미래 연도/min_year 미만은 missing)
+def aging_scores(values, bins, scores, min_year=1800, missing=0, current_year=None):
+    current_year = date.today().year if current_year is None else current_year
+
+    def score(uniques):
+        year = _parse_years(uniques)
+        age = current_year - year
+        invalid = np.isnan(year) | (age < 0) | (year < min_year)
+        return np.where(invalid, missing, _bin(np.where(invalid, 0, age), bins, scores, "upper"))
+
+    return _score_by_value(values, score, missing, _score_dtype(scores, missing))
+
+
+# 개수 컬럼 파서 (고유값 → float, 값 없음은 NaN)
+COUNT_PARSERS = {
+    "floors": _parse_floor_counts,             # 지상층수
+    "basement": _parse_basement_floor_counts,  # 지하층수 ('B2', '지하 2' 등)
+    "count": _parse_nonneg_int_counts,         # 0 이상 개수
 }
 
-def structure_score(value) -> float:
-    if value is None:
-        return 0.0
-    if isinstance(value, float) and math.isnan(value):  # NaN
-        return 0.0
-
-    s = str(value).strip()
-    if not s or s.lower() == "nan":
-        return 0.0
-
-    # 1) 정확 매핑 우선
-    if s in STRUCTURE_SCORE_MAP:
-        return STRUCTURE_SCORE_MAP[s]
-
-    # 2) 키워드 기반(미지정 라벨 대비)
-    if ('목' in s) or ('통나무' in s):
-        return 5.0
-    if ('조적' in s) or ('벽돌' in s) or ('블록' in s) or ('석' in s):
-        return 4.0
-    if ('조립' in s) or ('판넬' in s) or ('컨테이너' in s):
-        return 3.0
-    if ('철골' in s) or ('강구조' in s) or ('스틸' in s) or ('파이프' in s):
-        return 2.0
-    if ('막' in s) or ('특수' in s):
-        return 1.0
-    if ('콘크리트' in s) or ('라멘' in s):
-        return 0.0
-
-    # 기본값
-    return 0.0
-
-def _parse_nonneg_int_count(value):
-    if value is None:
-        return None
-    if isinstance(value, float) and math.isnan(value):
-        return None
-    if isinstance(value, (int, float)):
-        n = int(float(value))
-        return n if n >= 0 else None
-
-    s = str(value).strip()
-    if s == "" or s.lower() == "nan":
-        return None
-
-    m = re.search(r"(\d+)", s.replace(",", ""))
-    if m:
-        n = int(m.group(1))
-        return n if n >= 0 else None
-    return None
-
-def emergency_elevator_score(value) -> float:
-    n = _parse_nonneg_int_count(value)
-    if n is None:
-        return 0.0
-
-    if n == 0:
-        return 5.0
-    elif n == 1:
-        return 4.0
-    elif n == 2:
-        return 3.0
-    elif n == 3:
-        return 2.0
-    elif n == 4:
-        return 1.0
-    else:  # 5대 이상
-        return 0.0
-    
-def firestation_distance_score(dist_m, cap_over_max=True, invalid_to_nan=True):
-    arr = np.asarray(dist_m, dtype=float)
-
-    # 음수/이상치 처리
-    if invalid_to_nan:
-        arr = np.where(arr < 0, np.nan, arr)
-
-    default_val = 5.0 if cap_over_max else np.nan
-    scores = np.select(
-        [arr < 1000, arr < 3000, arr < 5000, arr < 7000, arr < 9000],
-        [1.0,        2.0,        3.0,        4.0,        5.0],
-        default=default_val
-    )
-
-    # 입력 타입 유지해서 반환
-    if np.isscalar(dist_m):
-        return float(scores.item())
-    if isinstance(dist_m, pd.Series):
-        return pd.Series(scores, index=dist_m.index, name=getattr(dist_m, "name", None))
-    return scores
-
-def hydrant_distance_score(dist_m, cap_over_max=True, invalid_to_nan=True):
-    arr = np.asarray(dist_m, dtype=float)
-
-    # 이상치 처리
-    if invalid_to_nan:
-        arr = np.where(arr < 0, np.nan, arr)
-
-    default_val = 5.0 if cap_over_max else np.nan
-    scores = np.select(
-        [arr <= 30, arr <= 60, arr <= 90, arr <= 120, arr <= 150],
-        [1.0,       2.0,       3.0,       4.0,        5.0],
-        default=default_val
-    )
-
-    # NaN 입력은 그대로 NaN 유지
-    scores = np.where(np.isnan(arr), np.nan, scores)
-
-    # 입력 타입 유지
-    if np.isscalar(dist_m):
-        return float(np.asarray(scores).item())
-    if isinstance(dist_m, pd.Series):
-        return pd.Series(scores, index=dist_m.index, name=getattr(dist_m, "name", None))
-    return scores
-
-# 점수 산정
-df = pd.read_csv("../Data/건축물대장_v0.4.csv")
-df["건물노후도점수"] = df["사용승인년도"].apply(aging_score)
-df["지상층수점수"] = df["지상층수"].apply(aboveground_floors_score)
-df["지하층수점수"] = df["지하층수"].apply(basement_floors_score)
-df["주용도점수"] = df["주용도코드명"].apply(main_use_score_exact)
-df["구조점수"] = df["구조코드명"].apply(structure_score)
-df["비상용승강기점수"] = df["비상용승강기수"].apply(emergency_elevator_score)
-df["소방서거리점수"] = df["소방서거리"].apply(firestation_distance_score)
-df["소방용수시설거리점수"] = df["소방용수시설거리"].apply(hydrant_distance_score)
-df["종합점수"] = df["건물노후도점수"] + df["지상층수점수"] + df["지하층수점수"] + df["주용도점수"] + df["구조점수"] + df["비상용승강기점수"] + df["소방서거리점수"] + df["소방용수시설거리점수"]
-
-df.to_csv("../Data/건축물대장_v0.5.csv")
\ No newline at end of file
+
+# 개수(층수/대수) 파싱 → 구간 점수
+def count_scores(values, parser, bins, scores, missing=0):
+    parse = COUNT_PARSERS[parser]
+
+    def score(uniques):
+        n = parse(uniques)
+        return np.where(np.isnan(n), missing, _bin(np.nan_to_num(n), bins, scores, "upper"))
+
+    return _score_by_value(values, score, missing, _score_dtype(scores, missing))
+
+
+# 값 → 점수 표, 표에 없으면 keywords [(단어들, 점수), ...]에서 처음 포함된 단어의 점수, 그래도 없으면 default
+def lookup_scores(values, table, keywords=(), default=0.0):
+    def score(uniques):
+        names = _as_text(uniques)
+        scores = names.map(table).to_numpy(dtype=float, copy=True)
+        for words, value in keywords:
+            todo = np.isnan(scores)
+            hit = names[todo].str.contains("|".join(map(re.escape, words)), regex=True).to_numpy(dtype=bool)
+            scores[np.flatnonzero(todo)[hit]] = value
+        return np.where(np.isnan(scores), default, scores)
+
+    return _score_by_value(values, score, default, _score_dtype(list(table.values()) or [default], default))
+
+
+# 거리(m) 구간 점수 (결측은 missing, invalid_to_nan이면 음수도 결측)
+def distance_scores(values, bins, scores, edge="upper", missing=np.nan, invalid_to_nan=True):
+    arr = np.asarray(values, dtype=float)
+    invalid = np.isnan(arr) | ((arr < 0) if invalid_to_nan else False)
+    out = _bin(np.where(invalid, 0, arr), bins, scores, edge)
+    return np.where(invalid, missing, out).astype(_score_dtype(scores, missing))
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    from datasets import building_path
+    from score_matrix import SCORE_MATRIX_PATH, ScoreMatrix
+    from score_stream import STREAM_CHUNK_SIZE, stream_score_csv, write_aggregates
+    from scoring_spec import load_scoring_model
+
+    parser = argparse.ArgumentParser(description="건축물대장 점수 산정 (v0.4 → v0.5)")
+    parser.add_argument("--stream", action="store_true",
+                        help="chunk 단위로 읽어 채점 (메모리 일정, 구군/동 집계 CSV도 저장)")
+    parser.add_argument("--chunksize", type=int, default=STREAM_CHUNK_SIZE, help="--stream에서 한 번에 읽는 행 수")
+    parser.add_argument("--src", default=building_path("v0.4"), help="--stream 입력 CSV")
+    parser.add_argument("--out", default=building_path("v0.5"), help="--stream 출력 CSV")
+    args = parser.parse_args()
+
+    # 점수 산정 (구간/점수표/가중치는 scoring_spec.yaml)
+    model = load_scoring_model()
+
+    if args.stream:
+        # 전국 단위 등 메모리보다 큰 파일: CSV만 이어 쓰고(Parquet/점수 행렬 없음) 집계는 같은 패스에서
+        n_rows, aggregates = stream_score_csv(args.src, args.out, model, chunksize=args.chunksize)
+        for name, path in write_aggregates(aggregates, args.out).items():
+            print(f"{name}별 집계 저장: {path}")
+        # 기본 출력(v0.5)을 덮어썼다면 이전 점수 행렬은 더 이상 행이 맞지 않음
+        if os.path.abspath(args.out) == os.path.abspath(building_path("v0.5")) and os.path.exists(SCORE_MATRIX_PATH):
+            os.remove(SCORE_MATRIX_PATH)
+        print(f"저장 완료: {args.out} ({n_rows}행)")
+    else:
+        df = load_buildings("v0.4")
+        scores = model.score(df)
+        df[model.names] = scores
+        df["종합점수"] = model.total(scores)
+        # 구성 점수 행렬(float32) — 가중치만 바꿀 때 재채점 없이 사용
+        ScoreMatrix.from_scores(scores, model.signature).save(SCORE_MATRIX_PATH)
+
+        write_dataset(df, "../Data/건축물대장_v0.5.csv")
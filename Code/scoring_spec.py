@@ -0,0 +1,193 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+from scoring import COUNT_PARSERS, aging_scores, count_scores, distance_scores, lookup_scores
+
+# 점수 정의 파일 (구간/점수표/가중치)
+SCORING_SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_spec.yaml")
+
+# kind별 허용 키 (column, kind, weight, unit은 공통)
+_KIND_KEYS = {
+    "age": {"bins", "scores", "min_year", "missing"},
+    "count": {"parser", "bins", "scores", "missing"},
+    "lookup": {"table", "keywords", "default"},
+    "distance": {"bins", "scores", "edge", "missing"},
+}
+_COMMON_KEYS = {"column", "kind", "weight", "unit"}
+
+
+# 점수 구성 요소 하나 (원본 컬럼 → 점수 배열)
+class ScoreComponent:
+    def __init__(self, name, spec):
+        self.name = name
+        self.spec = dict(spec)
+        self.column = spec.get("column")
+        self.kind = spec.get("kind")
+        self.weight = float(spec.get("weight", 1))
+        self.unit = spec.get("unit", "")
+        if not self.column:
+            raise ValueError(f"[{name}] column이 없습니다")
+        if self.kind not in _KIND_KEYS:
+            raise ValueError(f"[{name}] 알 수 없는 kind: {self.kind} ({', '.join(_KIND_KEYS)})")
+        unknown = set(spec) - _COMMON_KEYS - _KIND_KEYS[self.kind]
+        if unknown:
+            raise ValueError(f"[{name}] {self.kind}에 없는 키: {', '.join(sorted(map(str, unknown)))}")
+        self._score = getattr(self, f"_compile_{self.kind}")(spec)
+
+    def __call__(self, values):
+        return self._score(values)
+
+    def _bins(self, spec):
+        bins = np.asarray(spec["bins"], dtype=float)
+        scores = np.asarray(spec["scores"])
+        if len(bins) and np.any(np.diff(bins) <= 0):
+            raise ValueError(f"[{self.name}] bins는 오름차순이어야 합니다")
+        if len(scores) != len(bins) + 1:
+            raise ValueError(f"[{self.name}] scores는 bins보다 1개 많아야 합니다 "
+                             f"(bins {len(bins)}개, scores {len(scores)}개)")
+        return bins, scores
+
+    def _compile_age(self, spec):
+        bins, scores = self._bins(spec)
+        min_year, missing = spec.get("min_year", 1800), spec.get("missing", 0)
+        return lambda values: aging_scores(values, bins=bins, scores=scores, min_year=min_year, missing=missing)
+
+    def _compile_count(self, spec):
+        bins, scores = self._bins(spec)
+        parser, missing = spec.get("parser"), spec.get("missing", 0)
+        if parser not in COUNT_PARSERS:
+            raise ValueError(f"[{self.name}] 알 수 없는 parser: {parser} ({', '.join(COUNT_PARSERS)})")
+        return lambda values: count_scores(values, parser, bins, scores, missing)
+
+    def _compile_distance(self, spec):
+        bins, scores = self._bins(spec)
+        edge, missing = spec.get("edge", "upper"), spec.get("missing", 0)
+        if edge not in ("upper", "lower"):
+            raise ValueError(f"[{self.name}] edge는 upper 또는 lower입니다: {edge}")
+        return lambda values: distance_scores(values, bins, scores, edge, missing)
+
+    def _compile_lookup(self, spec):
+        # {점수: [값, ...]} → {값: 점수}
+        table = {}
+        for score, names in (spec.get("table") or {}).items():
+            for value in names:
+                if str(value) in table:
+                    raise ValueError(f"[{self.name}] table에 중복된 값: {value}")
+                table[str(value)] = score
+        keywords = [(tuple(str(w) for w in words), score) for score, words in spec.get("keywords") or []]
+        default = spec.get("default", 0.0)
+        return lambda values: lookup_scores(values, table, keywords, default)
+
+    # 설명용 markdown 한 줄 (앱 부록 탭)
+    def describe(self):
+        spec, unit = self.spec, self.unit
+        if self.kind == "lookup":
+            groups = {}
+            for score, names in (spec.get("table") or {}).items():
+                groups.setdefault(score, []).extend(map(str, names))
+            lines = [f"**{_fmt(s)}점:** {', '.join(names)}" for s, names in sorted(groups.items(), reverse=True)]
+            if spec.get("keywords"):
+                words = " / ".join(f"{'·'.join(map(str, w))} → {_fmt(s)}" for s, w in spec["keywords"])
+                lines.append(f"표에 없는 값은 포함 단어로 분류: {words}")
+            lines.append(f"**{_fmt(spec.get('default', 0.0))}점:** 미매핑/미상")
+            return "  \n  ".join(lines)
+
+        bins, scores = spec["bins"], spec["scores"]
+        if spec.get("edge", "upper") == "upper":
+            parts = [f"{_fmt(bins[-1])}{unit}≥: {_fmt(scores[-1])}"]
+            parts += [f"{_fmt(lo)}–{_fmt(hi)}{unit} 미만: {_fmt(s)}"
+                      for lo, hi, s in zip(bins[-2::-1], bins[:0:-1], scores[-2:0:-1])]
+            parts.append(f"<{_fmt(bins[0])}{unit}: {_fmt(scores[0])}")
+        else:
+            parts = [f"≤{_fmt(b)}{unit}: {_fmt(s)}" for b, s in zip(bins, scores)]
+            parts.append(f">{_fmt(bins[-1])}{unit}: {_fmt(scores[-1])}")
+        parts.append(f"미상: {_fmt(spec.get('missing', 0))}")
+        return "**" + " / ".join(parts) + "**"
+
+
+def _fmt(value):
+    value = float(value)
+    if np.isnan(value):
+        return "없음"
+    return str(int(value)) if value.is_integer() else f"{value:g}"
+
+
+# 컴파일된 점수 모델 (구성 요소 순서 = 종합점수 구성 순서)
+class ScoringModel:
+    def __init__(self, components):
+        self.components = list(components)
+        if not self.components:
+            raise ValueError("점수 구성 요소가 없습니다")
+
+    @property
+    def names(self):
+        return [c.name for c in self.components]
+
+    # 가중치를 뺀 정의 (같으면 구성 점수가 같음 → 저장된 점수 행렬 재사용 가능)
+    @property
+    def signature(self):
+        return repr([(c.name, sorted((k, v) for k, v in c.spec.items() if k != "weight"))
+                     for c in self.components])
+
+    @property
+    def weights(self):
+        return pd.Series([c.weight for c in self.components], index=self.names, dtype=float)
+
+    # 건물별 구성 점수 (원본 컬럼이 없으면 KeyError)
+    def score(self, df):
+        return pd.DataFrame({c.name: np.asarray(c(df[c.column])) for c in self.components}, index=df.index)
+
+    # 종합점수 = Σ 가중치 × 구성 점수 (하나라도 NaN이면 NaN)
+    def total(self, scores, weights=None):
+        weights = self.weights if weights is None else pd.Series(weights, dtype=float).reindex(self.names)
+        if weights.isna().any():
+            raise ValueError(f"가중치 없는 구성 요소: {', '.join(weights.index[weights.isna()])}")
+        if (weights == 1).all():
+            return scores[self.names].sum(axis=1, skipna=False)
+        return scores[self.names].mul(weights, axis=1).sum(axis=1, skipna=False)
+
+    # 점수 산정 기준 markdown
+    def describe(self):
+        lines = [f"- **{c.name}** ({c.column}) : {c.describe()}\n" for c in self.components]
+        weights = self.weights
+        if (weights == 1).all():
+            formula = f"아래 **{len(weights)}개 지표의 합**으로 산출:  \n  " + \
+                      " + ".join(n.removesuffix("점수") for n in self.names)
+        else:
+            formula = "**가중합**으로 산출:  \n  " + \
+                      " + ".join(f"{_fmt(w)}×{n.removesuffix('점수')}" for n, w in weights.items())
+        lines.append(f"- **종합점수** : {formula}\n")
+        return "\n".join(lines)
+
+
+def load_spec(path=SCORING_SPEC_PATH):
+    if not HAS_YAML:
+        raise ImportError("점수 정의(yaml)를 읽으려면 PyYAML이 필요합니다")
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def compile_spec(spec):
+    components = (spec or {}).get("components") or {}
+    return ScoringModel(ScoreComponent(name, comp or {}) for name, comp in components.items())
+
+
+_MODELS = {}
+
+
+# 점수 정의 파일 → 컴파일된 모델 (파일 수정시각이 바뀌었을 때만 다시 컴파일)
+# 실행 중인 앱은 매번 이 함수를 부르면 재시작 없이 새 정의를 사용
+def load_scoring_model(path=SCORING_SPEC_PATH):
+    mtime = os.stat(path).st_mtime_ns
+    cached = _MODELS.get(path)
+    if cached is None or cached[0] != mtime:
+        _MODELS[path] = (mtime, compile_spec(load_spec(path)))
+    return _MODELS[path][1]
@@ -3,18 +3,21 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+
+from datasets import load_register
 # %% check
 # columns_to_check = ['Column14', 'Column15', 'Column60', 'Column61', 'Column67']
 # %% 구/군 별 데이터 로드
-df1 = pd.read_csv('../Raw Data/건축물대장/건축물대장_대구광역시_군위군.csv')
-df2 = pd.read_csv('../Raw Data/건축물대장/건축물대장_대구광역시_남구.csv')
-df3 = pd.read_csv('../Raw Data/건축물대장/건축물대장_대구광역시_달서구.csv')
-df4 = pd.read_csv('../Raw Data/건축물대장/건축물대장_대구광역시_달성군.csv')
-df5 = pd.read_csv('../Raw Data/건축물대장/건축물대장_대구광역시_동구.csv')
-df6 = pd.read_csv('../Raw Data/건축물대장/건축물대장_대구광역시_북구.csv')
-df7 = pd.read_csv('../Raw Data/건축물대장/건축물대장_대구광역시_서구.csv')
-df8 = pd.read_csv('../Raw Data/건축물대장/건축물대장_대구광역시_수성구.csv')
-df9 = pd.read_csv('../Raw Data/건축물대장/건축물대장_대구광역시_중구.csv')
+REGISTER_COLUMNS = ['구조코드명', '주용도코드명', '지상층수', '비상용승강기수', '사용승인일']
+df1 = load_register('군위군', columns=REGISTER_COLUMNS)
+df2 = load_register('남구', columns=REGISTER_COLUMNS)
+df3 = load_register('달서구', columns=REGISTER_COLUMNS)
+df4 = load_register('달성군', columns=REGISTER_COLUMNS)
+df5 = load_register('동구', columns=REGISTER_COLUMNS)
+df6 = load_register('북구', columns=REGISTER_COLUMNS)
+df7 = load_register('서구', columns=REGISTER_COLUMNS)
+df8 = load_register('수성구', columns=REGISTER_COLUMNS)
+df9 = load_register('중구', columns=REGISTER_COLUMNS)
 
 # %% 구/군 컬럼 추가
 df1['군/구'] = '군위군'
@@ -7,7 +7,10 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-df = pd.read_csv("../Data/동별인구.csv")
+
+from datasets import load
+
+df = load("population")
 new = df[['군·구', '동·읍·면', '고령자_비율','위도','경도']]
 
 # 동별 고령자 비율 값
@@ -3,11 +3,13 @@ import numpy as np
 import plotly.express as px
 from scipy.stats import pearsonr, spearmanr
 
+from datasets import load, load_buildings
+
 # 데이터 불러오기
-df_population = pd.read_csv("../Data/동별인구.csv")
+df_population = load("population")
 df_population_filter = df_population[['군·구', '동·읍·면', '고령자_비율','위도','경도']]
 
-df_building = pd.read_csv("../Data/건축물대장_v0.5.csv")
+df_building = load_buildings("v0.5", columns=["ADM_DR_NM", "건물노후도점수"])
 
 # ==============================
 # 2) 동별 고령자 평균비율
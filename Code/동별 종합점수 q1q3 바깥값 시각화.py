@@ -1,23 +1,19 @@
 # -*- coding: utf-8 -*-
-import csv, json, re
+import json, re
 import numpy as np
 import pandas as pd
 import plotly.express as px
 from pathlib import Path
 
+from datasets import load_buildings
+
 # ================== 경로 ==================
-csv_path = Path("../Data/건축물대장_v0.5.csv")
 geojson_path = Path("../Data/시각화/대구_행정동/대구_행정동_군위포함.geojson")
 out_html = Path("./동평균_Q1Q3_전체_폴리곤_색칠.html")
 # ========================================
 
-# ========== 1) CSV 로드 (구분자 자동 감지) ==========
-with open(csv_path, "r", encoding="utf-8", errors="ignore") as f:
-    sample = "".join([next(f) for _ in range(50)])
-dialect = csv.Sniffer().sniff(sample, delimiters=[",", "\t", ";", "|"])
-sep = dialect.delimiter
-
-df = pd.read_csv(csv_path, sep=sep, engine="python", encoding="utf-8")
+# ========== 1) 데이터 로드 (필요한 컬럼만) ==========
+df = load_buildings("v0.5", columns=["대지위치", "ADM_DR_NM", "종합점수"])
 # (선택) 군위군 제외
 df = df.loc[~(df["대지위치"].str.contains("군위군", na=False)), :]
 
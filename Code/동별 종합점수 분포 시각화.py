@@ -3,7 +3,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-df = pd.read_csv('../Data/건축물대장_v0.5.csv')
+from datasets import load_buildings
+
+df = load_buildings('v0.5', columns=['종합점수'])
 df.columns
 df.info()
 
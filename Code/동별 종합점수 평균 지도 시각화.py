@@ -4,12 +4,13 @@ import plotly.express as px
 from pathlib import Path
 import numpy as np
 
+from datasets import load_buildings
+
 # 경로
-csv_path = Path("../Data/건축물대장_v0.6.csv")
 geojson_path = Path("../Data/시각화/대구_행정동/대구_행정동_군위포함.geojson")
 
 # 1) 데이터 로드
-df = pd.read_csv(csv_path)
+df = load_buildings("v0.6", columns=["대지위치", "ADM_DR_NM", "구군", "종합점수"])
 df.loc[df["ADM_DR_NM"].isna(), "대지위치"]
 with open(geojson_path, "r", encoding="utf-8") as f:
     gj = json.load(f)
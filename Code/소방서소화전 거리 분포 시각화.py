@@ -1,42 +1,20 @@
 import pandas as pd
 import numpy as np
 import plotly.express as px
+
+from datasets import load, load_buildings
+from nearest_facility import ensure_distances
+
 # %% 데이터 로드
-df = pd.read_csv('../Data/건축물대장_v0.5.csv')
-hyd = pd.read_csv('../Data/대구광역시_용수시설_위치.csv')
+df = load_buildings('v0.5', columns=['위도', '경도', '소방용수시설거리', '소방서거리'])
 #firestn = pd.read_csv('대구광역시_소방서_위치데이터.csv', encoding='cp949')
-# %%
-hydrant_lats = np.radians(hyd["위도"].values)
-hydrant_lons = np.radians(hyd["경도"].values)
-# %% 거리계산 함수 정의
-def haversine_min_distance(lat1, lon1, hy_lats, hy_lons):
-    R = 6371000  # 지구 반지름 (m)
-    lat1 = np.radians(lat1)
-    lon1 = np.radians(lon1)
-    
-    dlat = hy_lats - lat1
-    dlon = hy_lons - lon1
-    a = np.sin(dlat / 2)**2 + np.cos(lat1) * np.cos(hy_lats) * np.sin(dlon / 2)**2
-    c = 2 * np.arcsin(np.sqrt(a))
-    distances = R * c
-    return distances.min()
-# %% min({소화전거리(m)})
-df['소방용수시설거리'] = df.apply(
-    lambda row: haversine_min_distance(row["위도"], row["경도"], hydrant_lats, hydrant_lons),
-    axis=1
-)
+# %% 파이프라인에서 저장한 거리 사용 (없는 컬럼만 nearest_facility로 계산)
+df = ensure_distances(df)
 # %%
 df['소방용수시설거리'].head()
 # %% 소방서 데이터
-firestation = pd.read_csv('../Data/대구광역시_소방서_위치.csv')
+firestation = load('stations')
 firestation.head()
-# %% min({소방서거리(m)})
-station_lats = np.radians(firestation["위도"].values)
-station_lons = np.radians(firestation["경도"].values)
-df["소방서거리"] = df.apply(
-    lambda row: haversine_min_distance(row["위도"], row["경도"], station_lats, station_lons),
-    axis=1
-)
 
 # %% 소방서거리, 소화전거리 분포 시각화
 
@@ -12,8 +12,10 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 
-loc_119 = pd.read_csv("../Data/대구광역시_소방서_위치.csv")
-loc_fire = pd.read_csv("../Data/대구광역시_용수시설_위치.csv")
+from datasets import load
+
+loc_119 = load("stations")
+loc_fire = load("hydrants")
 
 
 
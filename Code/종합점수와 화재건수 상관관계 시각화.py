@@ -3,7 +3,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-fire_df = pd.read_csv("../Raw Data/소방청_화재발생 정보.csv", encoding='cp949')
+from datasets import load, load_buildings
+
+fire_df = load("fire_incidents")
 
 # 대구광역시 추출
 cond1 = (fire_df['시도'] == '대구광역시')
@@ -54,7 +56,7 @@ daegu_building_fire_by_gu = daegu_building_fire_by_gu.reset_index()
 daegu_building_fire_by_gu.rename(columns={'화재유형': '화재건수'}, inplace=True)
 
 
-daegu_population_df = pd.read_csv("../Data/동별인구.csv")
+daegu_population_df = load("population")
 new_daegu_population_df = daegu_population_df[['군·구','등록인구 (명)','인구밀도 (명/㎢)','면적 (㎢)']]
 new_by_gu = new_daegu_population_df.groupby('군·구').agg({
     '등록인구 (명)': 'sum',
@@ -109,8 +111,8 @@ for bar in bars:
 plt.show()
 
 
-fire_df = pd.read_csv("../Raw Data/소방청_화재발생 정보.csv", encoding='cp949')
-daegu_building_df = pd.read_csv("../Data/건축물대장_v0.5.csv")
+fire_df = load("fire_incidents")
+daegu_building_df = load_buildings("v0.5", columns=["대지위치", "기타구조"])
 
 # 전국 단위 (대구광역시 데이터 빼고) 
 kor_fire_count = fire_df.groupby('시도')[['화재유형']].count()
@@ -145,7 +147,7 @@ merged_df = merged_df.sort_values(by='화재건수/건물수', ascending=False).
 merged_df
 
 # 건물 밀집 : 건물 수 / 면적
-population_df = pd.read_csv("C:\\Users\\USER\\Desktop\\대구\\Daegu-Risk-Zones\\Data\\동별인구.csv")
+population_df = load("population")
 population_df.columns
 new_population = population_df[['군·구', '동·읍·면','면적 (㎢)']]
 # new_population
@@ -5,7 +5,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
-import json, re
+import json, re, sys
 
 # =============== 사용자 기본값 ===============
 ZOOM_LEFT_DEFAULT = 8.0
@@ -21,28 +21,37 @@ BAR_COLOR = "#546e7a"
 
 # =============== 경로 ===============
 BASE = Path(__file__).resolve().parents[2]
-CSV_PATH    = BASE / "Data/건축물대장_v0.6.csv"
 GEO_GU      = BASE / "Data/시각화/대구_시군구_군위포함/대구_시군구_군위포함.geojson"
 GEO_DONG    = BASE / "Data/시각화/대구_행정동/대구_행정동_군위포함.geojson"
-FIRESTN_CSV = BASE / "Data/대구광역시_소방서_위치.csv"
-HYDRANT_CSV = BASE / "Data/대구광역시_용수시설_위치.csv"
+
+# 파이프라인 모듈(Code/) 공유: 데이터 로더, 점수 정의(scoring_spec.yaml)
+sys.path.insert(0, str(BASE / "Code"))
+from datasets import load, load_buildings
+from score_matrix import ScoreMatrix, load_score_matrix
+from scoring_spec import SCORING_SPEC_PATH, load_scoring_model
 
 # =============== Shapely (선택) ===============
 try:
-    from shapely.geometry import shape, Point
-    from shapely.prepared import prep
+    from shapely import contains_xy
+    from shapely.geometry import shape
     SHAPELY_OK = True
 except Exception:
     SHAPELY_OK = False
 
+# =============== 행정동 격자/인덱스 (선택, Code/admin_join.py) ===============
+try:
+    from admin_join import load_or_build_admin_index
+    ADMIN_INDEX_OK = True
+except Exception:
+    ADMIN_INDEX_OK = False
+
 # =============== 헬퍼 ===============
-def _safe_read_csv(path: Path, usecols=None) -> pd.DataFrame:
-    if not path.exists():
-        return pd.DataFrame()
+# 공용 로더 호출, 파일이 없으면 빈 DataFrame
+def _safe_load(loader, *args, **kwargs) -> pd.DataFrame:
     try:
-        return pd.read_csv(path, encoding="utf-8", usecols=usecols)
-    except UnicodeDecodeError:
-        return pd.read_csv(path, encoding="cp949", usecols=usecols)
+        return loader(*args, **kwargs)
+    except FileNotFoundError:
+        return pd.DataFrame()
 
 def norm_name(x):
     if pd.isna(x):
@@ -90,8 +99,8 @@ def _bbox_center_zoom_for_gu(gu_geojson: dict, key: str):
 def _zoom_offset(z: float, delta: float = -0.5) -> float:
     return max(4.0, min(16.0, z + delta))
 
-def _load_points_csv_basic(path: Path):
-    df = _safe_read_csv(path)
+def _load_points_csv_basic(name: str):
+    df = _safe_load(load, name, columns=["위도", "경도"])
     if df.empty:
         return df
     cand_lat = ["위도", "lat", "LAT", "Latitude"]
@@ -107,8 +116,8 @@ def _load_points_csv_basic(path: Path):
     out = out[(out["위도"].between(30, 45)) & (out["경도"].between(120, 135))]
     return out
 
-def _load_hydrants_csv(path: Path):
-    df = _safe_read_csv(path)
+def _load_hydrants_csv(name: str):
+    df = _safe_load(load, name, columns=["위도", "경도", "시설유형코드"])
     if df.empty:
         return df
     cand_lat = ["위도", "lat", "LAT", "Latitude"]
@@ -133,16 +142,28 @@ def _load_hydrants_csv(path: Path):
     out = out[(out["위도"].between(30, 45)) & (out["경도"].between(120, 135))]
     return out
 
-def _filter_points_in_poly(df: pd.DataFrame, poly, max_n: int):
-    if df.empty or poly is None:
+# 포인트에 구 키(_key_gu) 부여: 행정동 격자 조회(경계 셀만 정확 판정)로 시작 시 한 번
+def _attach_gu_keys(df: pd.DataFrame, index):
+    if df.empty or index is None:
         return df
-    if not SHAPELY_OK:
+    out = df.copy()
+    out["_key_gu"] = index.assign(out)["구군"].astype(object).map(norm_name)
+    return out
+
+# 선택 구 안의 포인트 (max_n개까지 샘플)
+# _key_gu가 있으면 키 비교만, 없으면 구 폴리곤 판정 (Shapely 없으면 bbox)
+def _filter_points_in_gu(df: pd.DataFrame, gu_key, poly, max_n: int):
+    if df.empty:
+        return df
+    if "_key_gu" in df.columns:
+        sub = df[df["_key_gu"] == gu_key]
+    elif poly is None:
+        sub = df
+    elif SHAPELY_OK:
+        sub = df[contains_xy(poly, df["경도"].to_numpy(), df["위도"].to_numpy())]
+    else:
         minx, miny, maxx, maxy = poly.bounds
         sub = df[(df["경도"].between(minx, maxx)) & (df["위도"].between(miny, maxy))]
-        return sub if len(sub) <= max_n else sub.sample(max_n, random_state=42)
-    prepared = prep(poly)
-    mask = df.apply(lambda r: prepared.covers(Point(r["경도"], r["위도"])), axis=1)
-    sub = df[mask]
     return sub if len(sub) <= max_n else sub.sample(max_n, random_state=42)
 
 def _build_border_lines_map(geojson: dict, key_name: str):
@@ -194,12 +215,12 @@ def _detect_dong_gu_prop(gj_dong, df_gu_keys_norm: set):
     return best_key if best_overlap > 0 else None
 
 # =============== 데이터 로드/전처리 ===============
-df = _safe_read_csv(CSV_PATH)
-for col in ["종합점수", "구군", "ADM_DR_NM"]:
+df = load_buildings("v0.6")  # Parquet 우선 (category/점수 float32)
+for col in ["구군", "ADM_DR_NM"]:
     if col not in df.columns:
         raise RuntimeError(f"CSV에 '{col}' 컬럼이 없습니다. (보유: {list(df.columns)[:30]})")
 
-df["종합점수"] = pd.to_numeric(df["종합점수"], errors="coerce")
+# 저장된 종합점수는 쓰지 않음: 현재 가중치로 점수 행렬 × 가중치를 계산 (scored())
 df["_key_gu"]   = df["구군"].map(norm_name)
 df["_key_dong"] = df["ADM_DR_NM"].map(norm_name)
 
@@ -245,25 +266,61 @@ if SHAPELY_OK:
 DONG_KEY_FIELD = "_key_combo" if USE_COMBO else "_key_dong"
 BORDER_LINES_DONG = _build_border_lines_map(gj_dong, DONG_KEY_FIELD)
 
+# =============== 점수 정의 (재시작 없이 반영) ===============
+_MODEL = {"last": None}
+
+def _load_model():
+    # 정의 파일을 고치는 중 오류가 나면 마지막으로 읽은 정의 유지
+    try:
+        _MODEL["last"] = load_scoring_model()
+    except Exception as e:
+        if _MODEL["last"] is None:
+            raise
+        print(f"[warn] 점수 정의 오류, 이전 정의 사용: {e}")
+    return _MODEL["last"]
+
+# 구성 점수 행렬: 가중치만 바뀌면 행렬 × 가중치, 구간/점수표가 바뀌면 원본 컬럼으로 재채점
+_MATRIX = {"last": None}
+
+def _score_matrix(model):
+    matrix = _MATRIX["last"]
+    if matrix is not None and matrix.signature == model.signature:
+        return matrix
+    # 파이프라인이 저장한 행렬(v0.5, 행 순서 같음)이 현재 정의와 같으면 그대로 사용
+    matrix = load_score_matrix(model.signature, len(df))
+    if matrix is None:
+        try:
+            matrix = ScoreMatrix.from_scores(model.score(df), model.signature)
+        except KeyError as e:
+            print(f"[warn] 점수 재계산 불가(컬럼 없음: {e}), CSV 구성 점수 사용")
+            stored = [c for c in model.names if c in df.columns]
+            if not stored:
+                raise RuntimeError(f"CSV에 구성 점수 컬럼이 없습니다. (필요: {model.names})") from e
+            # 같은 정의로 다시 불러도 재생성하지 않도록 현재 정의의 signature로 보관
+            matrix = ScoreMatrix.from_scores(df[stored].apply(pd.to_numeric, errors="coerce"), model.signature)
+    matrix.add_groups("_key_gu", df["_key_gu"])
+    matrix.add_groups("동", df[["구군", "_key_dong"]])
+    _MATRIX["last"] = matrix
+    return matrix
+
 # 좌측: 구/군별 평균
-gu_avg = (
-    df.dropna(subset=["_key_gu", "종합점수"])
-      .groupby("_key_gu", as_index=False)["종합점수"]
-      .mean()
-      .rename(columns={"종합점수": "종합점수_평균"})
-)
 name_map_gu = (
     df[["구군", "_key_gu"]]
       .dropna().drop_duplicates()
       .groupby("_key_gu")["구군"].first().reset_index()
 )
-gu_avg = gu_avg.merge(name_map_gu, on="_key_gu", how="left")
 
 # 포인트 데이터
 def _load_points_dataframe():
-    df_fs  = _load_points_csv_basic(FIRESTN_CSV)
-    df_hyd = _load_hydrants_csv(HYDRANT_CSV)
-    return df_fs, df_hyd
+    df_fs  = _load_points_csv_basic("stations")
+    df_hyd = _load_hydrants_csv("hydrants")
+    index = None
+    if ADMIN_INDEX_OK:
+        try:
+            index = load_or_build_admin_index()
+        except Exception as e:
+            print(f"[warn] 행정동 인덱스 생성 실패, 구 폴리곤으로 포인트 필터: {e}")
+    return _attach_gu_keys(df_fs, index), _attach_gu_keys(df_hyd, index)
 
 DF_FS, DF_HYD = _load_points_dataframe()
 
@@ -330,6 +387,28 @@ def server(input, output, session):
         "hyd_types": set(),
     })
 
+    # 점수 정의 파일이 바뀌면 다시 읽어 재채점
+    @reactive.file_reader(SCORING_SPEC_PATH)
+    def scoring_model():
+        return _load_model()
+
+    @reactive.Calc
+    def scored():
+        model = scoring_model()
+        matrix = _score_matrix(model)
+        return matrix, matrix.total(model.weights[matrix.names])
+
+    # 구/군, 동별 종합점수 평균 (가중치 변경 시 수 ms)
+    @reactive.Calc
+    def score_aggregates():
+        matrix, total = scored()
+        return matrix.aggregates(total=total)
+
+    @reactive.Calc
+    def gu_avg():
+        avg = score_aggregates()["_key_gu"].reset_index()
+        return avg.merge(name_map_gu, on="_key_gu", how="left")
+
     @reactive.effect
     @reactive.event(input.btn_apply)
     def _apply_sidebar():
@@ -341,10 +420,11 @@ def server(input, output, session):
     # 좌측 지도
     @render_widget
     def map_gu_avg():
-        if gu_avg.empty:
+        avg = gu_avg()
+        if avg.empty:
             return px.scatter(title="데이터 없음")
 
-        df_left = gu_avg.rename(columns={"_key_gu": "_key"})
+        df_left = avg.rename(columns={"_key_gu": "_key"})
         vmin = float(df_left["종합점수_평균"].min())
         vmax = float(df_left["종합점수_평균"].max())
         white_to_red = [[0.0, "#ffffff"], [1.0, "#ff0000"]]
@@ -383,7 +463,7 @@ def server(input, output, session):
                     loc = trace.locations[idx]  # _key(구)
                 except Exception:
                     return
-                row = gu_avg.loc[gu_avg["_key_gu"] == loc]
+                row = avg.loc[avg["_key_gu"] == loc]
                 if not row.empty:
                     clicked_gu.set(row.iloc[0]["구군"])
                     selected_dong_key.set(None)  # 구 변경 시 동 초기화
@@ -439,17 +519,13 @@ def server(input, output, session):
     @reactive.Calc
     def dong_avg_sel():
         sel = clicked_gu.get()
-        d = df[df["구군"] == sel].copy()
-        if d.empty:
+        d = df[df["구군"] == sel]
+        agg = score_aggregates()["동"]
+        if d.empty or sel not in agg.index.get_level_values("구군"):
             keycol = "_key_combo" if USE_COMBO else "_key_dong"
             return pd.DataFrame(columns=[keycol, "종합점수_평균", "동", "구군"])
 
-        avg = (
-            d.dropna(subset=["_key_dong", "종합점수"])
-             .groupby("_key_dong", as_index=False)["종합점수"]
-             .mean()
-             .rename(columns={"종합점수": "종합점수_평균"})
-        )
+        avg = agg.xs(sel, level="구군").reset_index()[["_key_dong", "종합점수_평균"]]
         name_map = (
             d[["ADM_DR_NM", "_key_dong"]]
               .dropna().drop_duplicates()
@@ -529,10 +605,11 @@ def server(input, output, session):
         MAX_FS  = 800
         MAX_HYD = 6000
 
-        # 포인트는 '선택 구' 폴리곤 기준
+        # 포인트는 '선택 구' 기준
+        sel_gu_key = norm_name(clicked_gu.get())
         if sel_types and not DF_HYD.empty:
             hyd_f = DF_HYD[DF_HYD["시설유형코드"].isin(sel_types)]
-            sub = _filter_points_in_poly(hyd_f, gu_poly, MAX_HYD) if gu_poly is not None else hyd_f
+            sub = _filter_points_in_gu(hyd_f, sel_gu_key, gu_poly, MAX_HYD)
             if not sub.empty:
                 figw.add_scattermapbox(
                     lat=sub["위도"], lon=sub["경도"], mode="markers",
@@ -542,7 +619,7 @@ def server(input, output, session):
                     showlegend=True
                 )
         if show_fs and not DF_FS.empty:
-            sub = _filter_points_in_poly(DF_FS, gu_poly, MAX_FS) if gu_poly is not None else DF_FS
+            sub = _filter_points_in_gu(DF_FS, sel_gu_key, gu_poly, MAX_FS)
             if not sub.empty:
                 figw.add_scattermapbox(
                     lat=sub["위도"], lon=sub["경도"], mode="markers",
@@ -624,11 +701,13 @@ def server(input, output, session):
                 k_gu, k_dong = sel_key.split("|", 1)
             except ValueError:
                 return px.scatter(title="선택 동 키 형식이 올바르지 않습니다.")
-            d = df[(df["_key_gu"] == k_gu) & (df["_key_dong"] == k_dong)].copy()
         else:
             k_dong = sel_key
             k_gu = norm_name(clicked_gu.get())
-            d = df[(df["_key_gu"] == k_gu) & (df["_key_dong"] == k_dong)].copy()
+        # 선택 동 건물의 구성 점수 (점수 행렬에서)
+        matrix, _ = scored()
+        sel_rows = ((df["_key_gu"] == k_gu) & (df["_key_dong"] == k_dong)).to_numpy()
+        d = pd.DataFrame(matrix.values[sel_rows], columns=matrix.names)
     
         if d.empty:
             return px.scatter(title="선택 동 데이터 없음")
@@ -1,5 +1,11 @@
 # app/modules/tab_notes.py
-from shiny import ui
+from shiny import ui, reactive, render
+from pathlib import Path
+import sys
+
+BASE = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE / "Code"))
+from scoring_spec import SCORING_SPEC_PATH, load_scoring_model
 
 def panel():
     return ui.nav_panel(
@@ -7,49 +13,8 @@ def panel():
         ui.layout_columns(
             ui.card(
                 ui.card_header("점수 산정 기준"),
-                ui.markdown(
-                    """
-- **건물노후도점수** : 사용승인연도에서 경과연수 계산 후 구간 점수 부여  
-  **40년≥: 5점 / 30–39: 4점 / 20–29: 3점 / 10–19: 2점 / 0–9: 1점 / 그 외·미상: 0점**  
-
-- **지상층수점수** : 지상층수 구간별 점수  
-  **30층≥: 5점 / 20–29: 4점 / 10–19: 3점 / 5–9: 2점 / 1–4: 1점 / 0층·미상: 0점**  
-
-- **지하층수점수** : 지하층수 구간별 점수  
-  **3층≥: 3점 / 2층: 2점 / 1층: 1점 / 0·미상: 0점**  
-
-- **주용도점수** : 정확 일치 매핑 사용(예시):  
-  **9점:** 숙박시설, 야영장시설, 관광휴게시설 등  
-  **8점:** 공장, 창고시설  
-  **7점:** 노유자시설, 교육연구(및 복지)시설, 의료시설, 수련시설  
-  **5점:** 근린생활/판매/문화/업무/생활편익 등  
-  **4점:** 교정·군사·운수·환경처리·통신·자동차·장례·발전·묘지 등 기반시설  
-  **2점:** 단독/공동/다가구 주택  
-  **1점:** 공공용시설  
-  **0점:** 미매핑/미상  
-
-- **구조점수** : 정확 일치 매핑:  
-  **5점:** 목구조(일반목구조, 통나무 등)  
-  **4점:** 조적식/석재/블록 등  
-  **3점:** 조립식판넬/컨테이너  
-  **2점:** 철골 계열(일반/경량철골, 강파이프, 트러스 등) + 철골·콘크리트 복합  
-  **1점:** 막구조·기타    
-  **0점:** 콘크리트 계열(철근콘크리트, 콘크리트, 라멘 등)  
-
-- **비상용승강기점수** : 비상용승강기 개수에 따라 점수 부여  
-  대수 **0: 5 / 1: 4 / 2: 3 / 3: 2 / 4: 1 / 5대 이상: 0**
-
-- **소방서거리점수** : 소방서와의 거리 구간별 점수  
-  **<1km: 1 / <3km: 2 / <5km: 3 / <7km: 4 / <9km: 5**
-
-- **소방용수시설거리점수** : 소방용수시설과의 거리 구간별 점수  
-  **≤30m: 1 / ≤60m: 2 / ≤90m: 3 / ≤120m: 4 / ≤150m: 5**
-
-- **종합점수** : 아래 **8개 지표의 합**으로 산출:  
-  건물노후도 + 지상층수 + 지하층수 + 주용도 + 구조 + 비상용승강기 + 소방서거리 + 소방용수시설거리
-
-                    """
-                ),
+                # 점수 정의 파일(Code/scoring_spec.yaml)에서 생성
+                ui.output_ui("score_rules"),
                 style="max-width: 1100px; margin: 0 auto;"
             ),
 
@@ -90,4 +55,14 @@ def panel():
     )
 
 def server(input, output, session):
-    pass
+    # 점수 정의 파일이 바뀌면 다시 읽어 표시
+    @reactive.file_reader(SCORING_SPEC_PATH)
+    def scoring_model():
+        return load_scoring_model()
+
+    @render.ui
+    def score_rules():
+        try:
+            return ui.markdown(scoring_model().describe())
+        except Exception as e:
+            return ui.markdown(f"점수 정의 파일 오류: `{e}`")
@@ -6,57 +6,32 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 from pathlib import Path
+import sys
 
 # ---------------- Paths ----------------
 BASE = Path(__file__).resolve().parents[2]
-FIRE_CSV   = BASE / "Raw Data/소방청_화재발생 정보.csv"
+sys.path.insert(0, str(BASE / "Code"))
+from admin_names import extract_gu_gun
+from datasets import load, load_buildings
+from nearest_facility import DISTANCE_COLUMNS, ensure_distances
+
+# 건축물대장 v0.5에서 쓰는 컬럼 (Parquet이면 이 컬럼만 읽음)
+BLDG_COLUMNS = ["대지위치", "기타구조", "위도", "경도", "소방서거리", "소방용수시설거리"]
 POP_CSV    = BASE / "Data/대구광역시_동별인구.csv"
-BLDG_CSV   = BASE / "Data/건축물대장_v0.5.csv"
-HYDRANT_CSV= BASE / "Data/대구광역시_용수시설_위치.csv"
-FIRESTN_CSV= BASE / "Data/대구광역시_소방서_위치.csv"
 
 # ---------------- Utils ----------------
-def _read_csv_safe(path: Path, encs=("cp949","utf-8","utf-8-sig")):
-    for enc in encs:
-        try:
-            return pd.read_csv(path, encoding=enc)
-        except Exception:
-            continue
-    # 마지막 시도: 인코딩 없이
-    return pd.read_csv(path)
-
 def _ylim_pad(ax, pad=0.15):
     # 현재 y max에 일정 비율 패딩
     ymin, ymax = ax.get_ylim()
     ymax_new = ymax if ymax > 0 else 1.0
     ax.set_ylim(0, ymax_new * (1 + pad))
 
-# 거리 계산(하버사인) - 브로드캐스팅/청크 처리로 메모리 절약
-def _nearest_distance_batch(lat_deg, lon_deg, ref_lat_deg, ref_lon_deg, chunk=2000):
-    R = 6371000.0  # meters
-    lat_rad = np.radians(lat_deg)
-    lon_rad = np.radians(lon_deg)
-    ref_lat = np.radians(ref_lat_deg).reshape(1, -1)   # (1, M)
-    ref_lon = np.radians(ref_lon_deg).reshape(1, -1)
-    N = len(lat_rad)
-    out = np.full(N, np.nan, dtype=float)
-
-    for i in range(0, N, chunk):
-        j = min(i + chunk, N)
-        la = lat_rad[i:j].reshape(-1, 1)               # (k,1)
-        lo = lon_rad[i:j].reshape(-1, 1)
-        dlat = ref_lat - la
-        dlon = ref_lon - lo
-        a = np.sin(dlat/2.0)**2 + np.cos(la) * np.cos(ref_lat) * np.sin(dlon/2.0)**2
-        c = 2.0 * np.arcsin(np.sqrt(a))
-        dist = R * c                                    # (k, M)
-        out[i:j] = np.min(dist, axis=1)
-    return out
-
 # ---------------- Load data ----------------
-fire_df = _read_csv_safe(FIRE_CSV)
-pop_df  = _read_csv_safe(POP_CSV)
-bldg_df = _read_csv_safe(BLDG_CSV)
+# Code/datasets.py 스키마 로더 (인코딩 한 번 판별, 필요한 컬럼만, category dtype)
+fire_df = load("fire_incidents", columns=["시도","화재발생년원일","시군구","화재유형","발화요인소분류",
+                                          "인명피해(명)소계","재산피해소계"])
+pop_df  = load("population", columns=["군·구","면적 (㎢)","인구밀도 (명/㎢)"], path=POP_CSV)
+bldg_df = load_buildings("v0.5", columns=BLDG_COLUMNS)
 
 # 한글 폰트(윈도우)
 plt.rcParams["font.family"] = "Malgun Gothic"
@@ -82,13 +57,13 @@ fire_by_gu = (
 )
 
 # 3) 건물 수(군구)
-#    - 주소에서 시군구 파싱(간단 규칙)
+#    - 주소에서 시군구 파싱(파이프라인 extract_gu.py와 같은 규칙)
 bldg_df["시군구"] = (
-    bldg_df.get("대지위치","").astype(str).str.split().str[1]
+    extract_gu_gun(bldg_df["대지위치"])
     if "대지위치" in bldg_df.columns else np.nan
 )
 bldg_counts = (
-    bldg_df.groupby("시군구")[["기타구조"]].count()
+    bldg_df.groupby("시군구", observed=True)[["기타구조"]].count()
     .rename(columns={"기타구조":"건물수"}).sort_values("건물수", ascending=False).reset_index()
 )
 
@@ -236,27 +211,12 @@ def server(input, output, session):
         out = out[(out[lat_col].between(30,45)) & (out[lon_col].between(120,135))]
         return out
 
-    hyd_df = _read_csv_safe(HYDRANT_CSV)
-    stn_df = _read_csv_safe(FIRESTN_CSV)
     bldg_xy = _valid_latlon(bldg_df, "위도", "경도")
-    hyd_xy  = _valid_latlon(hyd_df,  "위도", "경도")
-    stn_xy  = _valid_latlon(stn_df,  "위도", "경도")
 
-    # 거리가 이미 계산되어 있지 않다면 계산
-    if "소방용수시설거리" not in bldg_xy.columns or bldg_xy["소방용수시설거리"].isna().all():
-        if not hyd_xy.empty:
-            bldg_xy["소방용수시설거리"] = _nearest_distance_batch(
-                bldg_xy["위도"].to_numpy(), bldg_xy["경도"].to_numpy(),
-                hyd_xy["위도"].to_numpy(),  hyd_xy["경도"].to_numpy(),
-                chunk=1500
-            )
-    if "소방서거리" not in bldg_xy.columns or bldg_xy["소방서거리"].isna().all():
-        if not stn_xy.empty:
-            bldg_xy["소방서거리"] = _nearest_distance_batch(
-                bldg_xy["위도"].to_numpy(), bldg_xy["경도"].to_numpy(),
-                stn_xy["위도"].to_numpy(),  stn_xy["경도"].to_numpy(),
-                chunk=1500
-            )
+    # 거리는 파이프라인(add_min_firestation_distance.py)이 v0.5에 저장한 값을 그대로 사용
+    # 컬럼이 없거나 비어 있을 때만 공용 모듈(nearest_facility, KD-tree)로 계산
+    empty = [c for c in DISTANCE_COLUMNS if c in bldg_xy.columns and bldg_xy[c].isna().all()]
+    bldg_xy = ensure_distances(bldg_xy.drop(columns=empty))
 
     # NaN/무한 제거
     for c in ("소방서거리","소방용수시설거리"):
@@ -9,18 +9,18 @@ import plotly.graph_objects as go
 from pathlib import Path
 import numpy as np
 import json
+import sys
 
 # ================== 경로 ==================
 BASE = Path(__file__).resolve().parents[2]
 
 # 행정동(폴리곤) - shp
 SHAPE_DONG = BASE / "Data/시각화/대구_행정동/대구_행정동_군위포함.shp"
-# 소방용수시설 CSV (동명 포함본)
-HYD_CSV    = BASE / "Data/소방용수시설_동추가.csv"
-# 소방서 위치 CSV
-FS_CSV     = BASE / "Data/대구광역시_소방서_위치.csv"
-# 건축물 CSV (위도/경도, 주용도점수, 건물노후도점수 포함)
-BLD_CSV    = BASE / "Data/건축물대장_v0.6.csv"
+# 건축물대장 v0.6 (Code/datasets.py, Parquet 우선) — 격자 점수에 쓰는 컬럼만
+BLD_COLUMNS = ["위도", "경도", "ADM_DR_NM", "주용도점수", "건물노후도점수"]
+
+sys.path.insert(0, str(BASE / "Code"))
+from datasets import load, load_buildings
 
 # 기본 후보(체크박스 목록)
 AOI_VALUES = ["가창면", "하빈면", "소보면", "삼국유사면"]
@@ -43,13 +43,12 @@ HYD_MAX   = 8000
 FS_MAX    = 200
 
 # ================== 유틸 ==================
-def _safe_read_csv(path: Path, usecols=None) -> pd.DataFrame:
-    if not path.exists():
-        return pd.DataFrame()
+# 공용 로더 호출, 파일이 없으면 빈 DataFrame
+def _safe_load(loader, *args, **kwargs) -> pd.DataFrame:
     try:
-        return pd.read_csv(path, encoding="utf-8", usecols=usecols)
-    except UnicodeDecodeError:
-        return pd.read_csv(path, encoding="cp949", usecols=usecols)
+        return loader(*args, **kwargs)
+    except FileNotFoundError:
+        return pd.DataFrame()
 
 def _safe_union(gdf: gpd.GeoDataFrame):
     try:
@@ -112,7 +111,8 @@ def _generate_square_grid(aoi_polygon, cell_size_m=CELL_SIZE_M):
 # ================== 고정 데이터 로드(전역) ==================
 DONG_ALL = gpd.read_file(SHAPE_DONG).to_crs(epsg=4326)
 
-HYD_ALL = _safe_read_csv(HYD_CSV)
+# 소방용수시설 (동명 포함본: ADM_NM)
+HYD_ALL = _safe_load(load, "hydrants_dong", columns=["위도", "경도", "ADM_NM"])
 HYD_G_ALL = (
     gpd.GeoDataFrame(
         HYD_ALL,
@@ -121,7 +121,7 @@ HYD_G_ALL = (
     ) if not HYD_ALL.empty else gpd.GeoDataFrame(geometry=[], crs="EPSG:4326")
 )
 
-FS_ALL = _safe_read_csv(FS_CSV)
+FS_ALL = _safe_load(load, "stations", columns=["위도", "경도"])
 if not FS_ALL.empty:
     lat_col = next((c for c in ["위도","lat","LAT"] if c in FS_ALL.columns), None)
     lon_col = next((c for c in ["경도","lon","LON"] if c in FS_ALL.columns), None)
@@ -133,7 +133,7 @@ FS_G_ALL = (
     ) if (not FS_ALL.empty and lat_col and lon_col) else gpd.GeoDataFrame(geometry=[], crs="EPSG:4326")
 )
 
-BLD_ALL = _safe_read_csv(BLD_CSV)
+BLD_ALL = _safe_load(load_buildings, "v0.6", columns=BLD_COLUMNS)
 if not BLD_ALL.empty:
     for c in ["주용도점수","건물노후도점수"]:
         if c in BLD_ALL.columns:
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Code/ 모듈을 스크립트와 같은 방식(최상위 import)으로 불러옴
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Code"))
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+
+import admin_join as aj
+
+
+# 가상 행정동 3개: 정사각형 2개(변 공유) + 구멍 뚫린 삼각형 (경계가 격자와 비스듬함)
+@pytest.fixture
+def index():
+    geoms = np.array([
+        shapely.box(128.50, 35.80, 128.52, 35.82),
+        shapely.box(128.52, 35.80, 128.54, 35.82),
+        shapely.Polygon([(128.50, 35.83), (128.56, 35.83), (128.53, 35.86)],
+                        holes=[[(128.525, 35.835), (128.535, 35.835), (128.53, 35.84)]]),
+    ])
+    adm_cd = ["2711051000", "2711052000", "2714053000"]
+    adm_nm = ["가동", "나동", "다동"]
+    gu_names = {"27110": "중구", "27140": "동구"}
+    return aj.AdminIndex(geoms, adm_cd, adm_nm, gu_names)
+
+
+def _random_points(rng, n):
+    return rng.uniform(35.79, 35.87, n), rng.uniform(128.49, 128.57, n)
+
+
+def test_locate_exact_matches_shapely(index):
+    lat, lon = _random_points(np.random.default_rng(1), 5000)
+    got = index.locate_exact(lat, lon)
+    expected = np.full(len(lat), -1)
+    for i, geom in enumerate(index.geoms):
+        expected[shapely.contains_xy(geom, lon, lat) & (expected < 0)] = i
+    np.testing.assert_array_equal(got, expected)
+
+
+def test_assign_columns(index):
+    df = pd.DataFrame({"위도": [35.81, 35.81, 35.845, 35.838, np.nan], "경도": [128.51, 128.53, 128.51, 128.53, 128.5]},
+                      index=[10, 11, 12, 13, 14])
+    out = index.assign(df, chunk_size=2)
+    assert out.index.equals(df.index)
+    assert list(out.columns) == ["ADM_DR_CD", "ADM_DR_NM", "구군코드", "구군"]
+    assert out["ADM_DR_NM"].tolist()[:2] == ["가동", "나동"]
+    assert out["구군"].tolist()[:2] == ["중구", "중구"]
+    # 삼각형 밖 / 구멍 안 / 좌표 없음은 결측
+    assert out.iloc[2:].isna().all().all()
+    assert all(isinstance(out[c].dtype, pd.CategoricalDtype) for c in out.columns)
+
+
+def test_save_load_roundtrip(index, tmp_path):
+    path = tmp_path / "admin_index.npz"
+    index.save(path)
+    loaded = aj.AdminIndex.load(path)
+    lat, lon = _random_points(np.random.default_rng(2), 2000)
+    np.testing.assert_array_equal(loaded.locate_exact(lat, lon), index.locate_exact(lat, lon))
+    np.testing.assert_array_equal(loaded.gu_nm, index.gu_nm)
+
+
+# 경계선 근처(셀 크기 이내) 점을 많이 섞어 격자 경계 셀 판정까지 확인
+def _boundary_points(index, rng, n):
+    lines = shapely.segmentize(shapely.boundary(index.geoms), 0.0005)
+    coords = np.concatenate([shapely.get_coordinates(g) for g in lines])
+    pick = coords[rng.integers(0, len(coords), n)]
+    jitter = rng.uniform(-0.0003, 0.0003, (n, 2))  # 약 30m
+    return pick[:, 1] + jitter[:, 1], pick[:, 0] + jitter[:, 0]
+
+
+@pytest.mark.parametrize("cell_size", [20, 50])
+def test_raster_matches_exact(index, cell_size):
+    rng = np.random.default_rng(3)
+    lat1, lon1 = _random_points(rng, 5000)
+    lat2, lon2 = _boundary_points(index, rng, 5000)
+    lat = np.r_[lat1, lat2, np.nan, 30.0]
+    lon = np.r_[lon1, lon2, 128.5, 120.0]  # 좌표 없음 / 격자 밖
+    exact = index.locate_exact(lat, lon)
+
+    index.raster = aj.AdminRaster.from_index(index, cell_size)
+    np.testing.assert_array_equal(index.locate(lat, lon), exact)
+    # 격자만으로 판정한 셀(경계 아님)은 정확 판정과 같은 값
+    cells = index.raster.lookup(lat, lon)
+    inner = cells != aj.RASTER_BOUNDARY
+    assert inner[:len(lat1)].mean() > 0.8  # 임의 점은 대부분 격자만으로 판정
+    np.testing.assert_array_equal(np.where(cells[inner] == aj.RASTER_OUTSIDE, -1, cells[inner]), exact[inner])
+
+
+def test_raster_save_load(index, tmp_path):
+    raster = aj.AdminRaster.from_index(index, 20)
+    path = str(tmp_path / "admin_raster.npy")
+    raster.save(path)
+    loaded = aj.AdminRaster.load(path)
+    assert isinstance(loaded.cells, np.memmap)
+    np.testing.assert_array_equal(np.asarray(loaded.cells), raster.cells)
+    assert (loaded.x0, loaded.y0, loaded.cell_size) == (raster.x0, raster.y0, raster.cell_size)
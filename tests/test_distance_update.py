@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import distance_update as du
+import nearest_facility as nf
+
+
+def _facilities(rng, n, prefix, types=False):
+    fac = pd.DataFrame({
+        "위도": rng.uniform(35.80, 35.90, n),
+        "경도": rng.uniform(128.50, 128.65, n),
+    })
+    fac.insert(0, nf.FACILITY_FEATURES["hydrants" if types else "stations"]["id"],
+               pd.array([f"{prefix}{i}" for i in range(n)], dtype="string"))
+    if types:
+        fac["시설유형코드"] = rng.integers(1, 5, n)
+    return fac
+
+
+def _full_features(df, name, fac):
+    values = nf.facility_features(df, [name], method="brute", facilities={name: fac})
+    if name == "hydrants":
+        values.update(nf.hydrant_type_distances(df, method="brute", fac=fac))
+    return values
+
+
+def _buildings(rng, n=3000):
+    df = pd.DataFrame({"위도": rng.uniform(35.79, 35.91, n), "경도": rng.uniform(128.49, 128.66, n)})
+    df.loc[::97, ["위도", "경도"]] = np.nan
+    return df
+
+
+# 추가 2, 삭제 2, 이동 2 (+ 소화전은 유형 변경 2)
+def _change(rng, old, types):
+    new = old.drop(index=[3, 7]).reset_index(drop=True)
+    id_col = new.columns[0]
+    new.loc[[0, 10], ["위도", "경도"]] += 0.002
+    if types:
+        new.loc[[20, 30], "시설유형코드"] = (new.loc[[20, 30], "시설유형코드"] % 4) + 1
+    added = _facilities(rng, 2, "NEW", types)
+    return pd.concat([new, added], ignore_index=True).astype({id_col: "string"})
+
+
+@pytest.mark.parametrize("name", ["hydrants", "stations"])
+def test_incremental_update_matches_full_recompute(name):
+    rng = np.random.default_rng(0)
+    types = name == "hydrants"
+    old = _facilities(rng, 300 if types else 25, "F", types)
+    new = _change(rng, old, types)
+    df = _buildings(rng)
+    for col, values in _full_features(df, name, old).items():
+        df[col] = values
+
+    mask, columns, n_removed, n_added = du.apply_facility_update(df, name, old, new)
+    assert (n_removed, n_added) == ((6, 6) if types else (4, 4))
+    assert 0 < mask.sum() < len(df)  # 영향받는 건물만 다시 계산
+
+    expected = _full_features(df, name, new)
+    assert set(columns) == set(expected)
+    for col in columns:
+        got, want = df[col].to_numpy(), np.asarray(expected[col])
+        if want.dtype == object:
+            # 최근접 시설 ID (좌표 없는 건물은 결측)
+            assert [None if pd.isna(v) else v for v in got] == [None if pd.isna(v) else v for v in want], col
+        else:
+            np.testing.assert_allclose(got.astype(float), want.astype(float), rtol=1e-12, err_msg=col)
+
+
+def test_diff_facilities():
+    rng = np.random.default_rng(1)
+    old = _facilities(rng, 50, "F", types=True)
+    new = _change(rng, old, types=True)
+    removed, added = du.diff_facilities(old, new, "시설번호")
+    assert set(removed["시설번호"]) == {"F3", "F7", "F0", "F12", "F22", "F32"}
+    assert set(added["시설번호"]) == {"NEW0", "NEW1", "F0", "F12", "F22", "F32"}
+    with pytest.raises(ValueError):
+        du.diff_facilities(old, pd.concat([new, new.iloc[:1]]), "시설번호")
+
+
+def test_snapshot_roundtrip_has_no_spurious_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(nf, "FACILITY_SNAPSHOT", str(tmp_path / "{name}.csv"))
+    fac = _facilities(np.random.default_rng(2), 2000, "F", types=True)
+    nf.save_facility_snapshot("hydrants", fac)
+    removed, added = du.diff_facilities(nf.load_facility_snapshot("hydrants"), fac, "시설번호")
+    assert len(removed) == 0 and len(added) == 0
@@ -0,0 +1,44 @@
+import json
+
+import pandas as pd
+
+from address_normalize import canonicalize_addresses
+from geocode_cache import GeocodeCache, open_cache
+
+
+def _write_legacy(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def test_legacy_json_hit_through_canonical_key(tmp_path):
+    legacy = str(tmp_path / "kakao_geocode_cache.json")
+    _write_legacy(legacy, {
+        "대구광역시 달서구 진천동 0833 - 03번지 외 2필지": {"lat": 35.81, "lon": 128.52},
+        "대구광역시 중구 동인동1가 (동인아파트) 12번지": None,  # 이전에 결과 없음으로 캐시된 주소
+    })
+    cache = open_cache(str(tmp_path / "cache.sqlite"), legacy_json_path=legacy)
+
+    raw = pd.Series(["대구광역시  달서구 진천동 833-3", "대구광역시 중구 동인동1가 12"])
+    _, keys = canonicalize_addresses(raw, verbose=False)
+    assert all(k in cache for k in keys)
+    assert cache[keys[0]] == {"lat": 35.81, "lon": 128.52}
+    assert cache[keys[1]] is None
+    cache.close()
+
+    # 다시 열면 SQLite에서 그대로 조회 (재이관 없음)
+    with GeocodeCache(str(tmp_path / "cache.sqlite")) as reopened:
+        assert reopened[keys[0]] == {"lat": 35.81, "lon": 128.52}
+
+
+def test_legacy_collisions_keep_first_coordinates(tmp_path):
+    legacy = str(tmp_path / "legacy.json")
+    _write_legacy(legacy, {
+        "대구광역시 달서구 진천동 833번지": None,
+        "대구광역시 달서구 진천동 0833": {"lat": 1.0, "lon": 2.0},
+        "대구광역시 달서구 진천동 833 ": {"lat": 3.0, "lon": 4.0},
+        "": {"lat": 5.0, "lon": 6.0},
+    })
+    with GeocodeCache(str(tmp_path / "cache.sqlite")) as cache:
+        assert cache.import_json(legacy) == 1
+        assert cache["대구광역시 달서구 진천동 833"] == {"lat": 1.0, "lon": 2.0}
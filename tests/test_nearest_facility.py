@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+import nearest_facility as nf
+
+pytestmark = pytest.mark.skipif(not nf.HAS_TREE, reason="scipy/pyproj 없음")
+
+
+# 대구 범위 임의 좌표 (일부 결측, 같은 좌표 시설 포함)
+def _points(rng, n, missing=0.05):
+    lat = rng.uniform(35.75, 35.95, n)
+    lon = rng.uniform(128.45, 128.75, n)
+    lat[rng.random(n) < missing] = np.nan
+    return lat, lon
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    lat, lon = _points(rng, 2000)
+    fac_lat, fac_lon = _points(rng, 400)
+    fac_lat[10], fac_lon[10] = fac_lat[11], fac_lon[11]
+    return lat, lon, fac_lat, fac_lon
+
+
+def _expected_nearest(lat, lon, fac_lat, fac_lon):
+    rows, fac = ~np.isnan(lat), ~np.isnan(fac_lat)
+    out = np.full(len(lat), np.nan)
+    out[rows] = nf.haversine(lat[rows, None], lon[rows, None], fac_lat[None, fac], fac_lon[None, fac]).min(axis=1)
+    return out
+
+
+@pytest.mark.parametrize("method", ["tree", "brute"])
+def test_nearest_distances_match_haversine(points, method):
+    lat, lon, fac_lat, fac_lon = points
+    got = nf.nearest_distances(lat, lon, fac_lat, fac_lon, method=method)
+    np.testing.assert_allclose(got, _expected_nearest(lat, lon, fac_lat, fac_lon), rtol=1e-12)
+
+
+def test_tree_matches_brute_features(points):
+    lat, lon, fac_lat, fac_lon = points
+    kwargs = {"k": 3, "radii": (300, 800, 1500)}
+    t_dist, t_idx, t_counts = nf.nearest_features(lat, lon, fac_lat, fac_lon, method="tree", **kwargs)
+    b_dist, b_idx, b_counts = nf.nearest_features(lat, lon, fac_lat, fac_lon, method="brute", **kwargs)
+    np.testing.assert_allclose(t_dist, b_dist, rtol=1e-12)
+    np.testing.assert_array_equal(t_idx, b_idx)
+    for r in kwargs["radii"]:
+        np.testing.assert_array_equal(t_counts[r], b_counts[r])
+    # 결측 건물: 거리 NaN, 시설 -1, 반경 수 0
+    missing = np.isnan(lat)
+    assert np.isnan(t_dist[missing]).all() and (t_idx[missing] == -1).all()
+    assert all((c[missing] == 0).all() for c in t_counts.values())
+
+
+def test_brute_chunking_does_not_change_results(points):
+    lat, lon, fac_lat, fac_lon = points
+    full = nf.nearest_features_brute(lat, lon, fac_lat, fac_lon, k=2, radii=(500,))
+    small = nf.nearest_features_brute(lat, lon, fac_lat, fac_lon, k=2, radii=(500,),
+                                      memory_budget=1, max_workers=3)
+    np.testing.assert_array_equal(full[0], small[0])
+    np.testing.assert_array_equal(full[1], small[1])
+    np.testing.assert_array_equal(full[2][500], small[2][500])
+
+
+def test_k_larger_than_facilities():
+    lat, lon = np.array([35.87]), np.array([128.60])
+    dist, idx, _ = nf.nearest_features(lat, lon, [35.88, np.nan], [128.61, 128.62], k=2, method="tree")
+    assert idx[0, 0] == 0 and idx[0, 1] == -1
+    assert np.isnan(dist[0, 1])
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, dijkstra
+
+import road_network as rn
+from nearest_facility import haversine
+
+# 4×4 격자 도로 (노드 1~16, 약 100m 간격, 조금씩 어긋나게 해 동률 방지)
+# - 가로: 0행 residential, 1행 primary(maxspeed 60), 2행 secondary('30 mph'), 3행 residential
+# - 세로: 0·2열 양방향, 1열 일방통행(아래→위), 3열 oneway=-1(위→아래)
+# - 17: 16에서만 들어가는 일방통행 막다른 길 → 가장 큰 강한 연결 요소 밖
+# - 18~19: 떨어진 도로 조각, 20~21: footway(차량 도로 아님)
+_RNG = np.random.default_rng(0)
+NODES = {
+    1 + 4 * r + c: (35.870 + 0.001 * r + _RNG.uniform(-1e-4, 1e-4), 128.600 + 0.0012 * c + _RNG.uniform(-1e-4, 1e-4))
+    for r in range(4) for c in range(4)
+}
+NODES.update({17: (35.8740, 128.6062), 18: (35.900, 128.650), 19: (35.901, 128.651),
+              20: (35.8705, 128.6005), 21: (35.8715, 128.6017)})
+WAYS = [
+    ([1, 2, 3, 4], {"highway": "residential"}),
+    ([5, 6, 7, 8], {"highway": "primary", "maxspeed": "60"}),
+    ([9, 10, 11, 12], {"highway": "secondary", "maxspeed": "30 mph"}),
+    ([13, 14, 15, 16], {"highway": "residential"}),
+    ([1, 5, 9, 13], {"highway": "tertiary"}),
+    ([3, 7, 11, 15], {"highway": "tertiary"}),
+    ([2, 6, 10, 14], {"highway": "unclassified", "oneway": "yes"}),
+    ([4, 8, 12, 16], {"highway": "unclassified", "oneway": "-1"}),
+    ([16, 17], {"highway": "service", "oneway": "yes"}),
+    ([18, 19], {"highway": "residential"}),
+    ([20, 21], {"highway": "footway"}),
+]
+
+
+@pytest.fixture
+def osm_path(tmp_path):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<osm version="0.6">']
+    lines += [f'  <node id="{i}" lat="{lat!r}" lon="{lon!r}"/>' for i, (lat, lon) in NODES.items()]
+    for w, (refs, tags) in enumerate(WAYS):
+        lines.append(f'  <way id="{100 + w}">')
+        lines += [f'    <nd ref="{r}"/>' for r in refs]
+        lines += [f'    <tag k="{k}" v="{v}"/>' for k, v in tags.items()]
+        lines.append("  </way>")
+    lines.append("</osm>")
+    path = tmp_path / "roads.osm"
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return str(path)
+
+
+# 도로망 엔진 없이 csgraph.dijkstra로 계산한 기준값 (시설별 Dijkstra → 최소)
+def _reference(osm_path, lat, lon, fac_lat, fac_lon):
+    n_lat, n_lon, src, dst, speed = rn.read_osm(osm_path)
+    n = len(n_lat)
+    length = haversine(n_lat[src], n_lon[src], n_lat[dst], n_lon[dst])
+    _, labels = connected_components(csr_matrix((np.ones(len(src)), (src, dst)), shape=(n, n)),
+                                     directed=True, connection="strong")
+    main = np.flatnonzero(labels == np.bincount(labels).argmax())
+
+    # 간선 (u, v) → (가장 짧은 길이, 그 간선 속도)
+    edges = {}
+    for u, v, d, s in zip(src, dst, length, speed):
+        if u in main and v in main and ((u, v) not in edges or d < edges[u, v][0]):
+            edges[u, v] = (d, s)
+    u, v = np.array(list(edges)).T
+    graph = csr_matrix(([d for d, _ in edges.values()], (u, v)), shape=(n, n))
+
+    def snap(a, b):
+        d = haversine(a, b, n_lat[main], n_lon[main])
+        return main[np.argmin(d)], d.min()
+
+    access = rn.ACCESS_SPEED_KMH / 3.6
+    out = []
+    for b_lat, b_lon in zip(lat, lon):
+        if np.isnan(b_lat):
+            out.append((np.nan, np.nan, -1))
+            continue
+        b_node, b_access = snap(b_lat, b_lon)
+        best = None
+        for i, (f_lat, f_lon) in enumerate(zip(fac_lat, fac_lon)):
+            f_node, f_access = snap(f_lat, f_lon)
+            dist, pred = dijkstra(graph, indices=f_node, return_predecessors=True)
+            total = f_access + dist[b_node] + b_access
+            if best is None or total < best[0]:
+                seconds, node = (f_access + b_access) / access, b_node
+                while node != f_node:
+                    d, s = edges[pred[node], node]
+                    seconds += d / (s / 3.6)
+                    node = pred[node]
+                best = (total, seconds, i)
+        out.append(best)
+    return tuple(np.array(col) for col in zip(*out))
+
+
+def test_osm_parsing(osm_path):
+    lat, lon, src, dst, speed = rn.read_osm(osm_path)
+    assert len(lat) == 19  # footway 노드 제외
+    pairs = set(zip(src.tolist(), dst.tolist()))
+    assert len(pairs) == len(src)
+    assert np.isclose(speed.max(), 60) and np.isclose(speed.min(), min(20, 30 * 1.609))
+
+
+def test_network_matches_csgraph_dijkstra(osm_path):
+    network = rn.RoadNetwork.from_osm(osm_path)
+    assert len(network) == 16  # 막다른 일방통행(17)과 떨어진 도로(18, 19) 제외
+
+    fac_lat = np.array([NODES[1][0] + 2e-5, NODES[16][0] - 3e-5])
+    fac_lon = np.array([NODES[1][1] - 2e-5, NODES[16][1] + 1e-5])
+    lat = np.array([NODES[6][0], NODES[11][0] + 1e-4, NODES[17][0], NODES[4][0], np.nan, NODES[13][0]])
+    lon = np.array([NODES[6][1], NODES[11][1], NODES[17][1], NODES[4][1] + 2e-4, 128.6, NODES[13][1]])
+
+    dist, seconds, source = network.query(lat, lon, fac_lat, fac_lon)
+    ref_dist, ref_seconds, ref_source = _reference(osm_path, lat, lon, fac_lat, fac_lon)
+    np.testing.assert_allclose(dist, ref_dist, rtol=1e-9, atol=1e-4)
+    np.testing.assert_allclose(seconds, ref_seconds, rtol=1e-9, atol=1e-4)
+    np.testing.assert_array_equal(source, ref_source)
+    # 17번 노드 위치의 건물도 연결 요소 안 노드로 스냅되어 거리가 있음
+    assert np.isfinite(dist[2]) and source[4] == -1
+
+
+def test_station_features_and_save_load(osm_path, tmp_path):
+    network = rn.load_road_network(osm_path, str(tmp_path / "roads.npz"))
+    loaded = rn.load_road_network(osm_path, str(tmp_path / "roads.npz"))
+    stations = pd.DataFrame({"119안전센터명": ["가센터", "나센터"],
+                             "위도": [NODES[1][0], NODES[16][0]], "경도": [NODES[1][1], NODES[16][1]]})
+    df = pd.DataFrame({"위도": [NODES[2][0], NODES[15][0], np.nan], "경도": [NODES[2][1], NODES[15][1], 128.6]})
+    features = rn.station_network_features(df, network, stations)
+    again = rn.station_network_features(df, loaded, stations)
+    assert list(features["최근접소방서(도로)"]) == ["가센터", "나센터", None]
+    for col in ("소방서도로거리", "소방서도로소요시간"):
+        np.testing.assert_array_equal(features[col], again[col])
+    _, seconds, _ = network.query(df["위도"], df["경도"], stations["위도"], stations["경도"])
+    np.testing.assert_allclose(features["소방서도로소요시간"], seconds / 60)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from score_matrix import ScoreMatrix, load_score_matrix
+
+
+@pytest.fixture
+def scores():
+    rng = np.random.default_rng(0)
+    n = 1000
+    df = pd.DataFrame({
+        "a": rng.integers(0, 6, n).astype(float),
+        "b": rng.uniform(0, 9, n),
+        "c": rng.integers(1, 6, n).astype(float),
+    })
+    df.loc[rng.random(n) < 0.05, "c"] = np.nan
+    return df
+
+
+@pytest.fixture
+def groups(scores):
+    rng = np.random.default_rng(1)
+    gu = pd.Series(rng.choice(["중구", "동구", "서구", None], len(scores)), dtype=object, name="구군")
+    dong = pd.Series(rng.choice(["가동", "나동", "다동"], len(scores)), dtype=object, name="동")
+    return gu, dong
+
+
+def test_total_matches_weighted_sum(scores):
+    matrix = ScoreMatrix.from_scores(scores)
+    weights = {"a": 2.0, "c": 0.5}  # 없는 요소(b)는 가중치 0
+    expected = scores["a"] * 2 + scores["b"] * 0 + scores["c"] * 0.5
+    np.testing.assert_allclose(matrix.total(weights), expected, rtol=1e-6)
+    np.testing.assert_allclose(matrix.total(), scores.sum(axis=1, skipna=False), rtol=1e-6)
+    assert matrix.total().dtype == np.float32
+    with pytest.raises(KeyError):
+        matrix.total({"없는점수": 1.0})
+
+
+def test_aggregate_matches_groupby(scores, groups):
+    gu, dong = groups
+    matrix = ScoreMatrix.from_scores(scores)
+    matrix.add_groups("구군", gu)
+    matrix.add_groups("동", pd.DataFrame({"구군": gu, "동": dong}))
+    weights = {"a": 1.0, "b": 2.0, "c": 1.0}
+    total = pd.Series(matrix.total(weights), dtype=float)
+
+    aggs = matrix.aggregates(weights)
+    for name, keys in (("구군", [gu]), ("동", [gu, dong])):
+        expected = total.groupby(keys).agg(["mean", "count"])
+        expected = expected[expected["count"] > 0]
+        got = aggs[name].sort_index()
+        assert list(got.index.names) == list(expected.index.names)
+        np.testing.assert_allclose(got["종합점수_평균"], expected["mean"].sort_index(), rtol=1e-6)
+        np.testing.assert_array_equal(got["건물수"], expected["count"].sort_index())
+    assert "중구" in aggs["구군"].index and aggs["구군"].index.name == "구군"
+
+
+def test_aggregate_with_precomputed_total(scores, groups):
+    matrix = ScoreMatrix.from_scores(scores)
+    matrix.add_groups("구군", groups[0])
+    total = matrix.total({"a": 3.0})
+    pd.testing.assert_frame_equal(matrix.aggregate("구군", total=total), matrix.aggregate("구군", {"a": 3.0}))
+    with pytest.raises(ValueError):
+        matrix.add_groups("짧음", groups[0][:10])
+
+
+def test_save_and_load_score_matrix(scores, tmp_path):
+    path = str(tmp_path / "scores.npz")
+    ScoreMatrix.from_scores(scores, "sig-1").save(path)
+    loaded = ScoreMatrix.load(path)
+    assert loaded.names == ["a", "b", "c"] and loaded.signature == "sig-1"
+    np.testing.assert_array_equal(loaded.values, scores.to_numpy(dtype=np.float32))
+
+    assert load_score_matrix("sig-1", len(scores), path) is not None
+    assert load_score_matrix("sig-2", len(scores), path) is None
+    assert load_score_matrix("sig-1", len(scores) + 1, path) is None
+    assert load_score_matrix("sig-1", len(scores), str(tmp_path / "없음.npz")) is None
+
+
+def test_shape_mismatch():
+    with pytest.raises(ValueError):
+        ScoreMatrix(np.zeros((3, 2)), ["a"])
@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import scoring_spec
+from score_stream import RunningAggregates, stream_score_csv, write_aggregates
+
+pytestmark = pytest.mark.skipif(not scoring_spec.HAS_YAML, reason="PyYAML 없음")
+
+
+@pytest.fixture
+def src(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 103
+    df = pd.DataFrame({
+        "대지위치": [f"대구광역시 중구 동인동{i}가 {i}" for i in range(n)],
+        "사용승인년도": rng.choice(["1975", "1990.0", "2012", "", "2100"], n),
+        "지상층수": rng.choice(["3", "12", "지상 5층", "", "31"], n),
+        "지하층수": rng.choice(["B1", "0", "지하 2층", ""], n),
+        "주용도코드명": rng.choice(["공동주택", "공장", "숙박시설", "없는용도", ""], n),
+        "구조코드명": rng.choice(["철근콘크리트구조", "벽돌구조", "경량철골조", ""], n),
+        "비상용승강기수": rng.choice(["0", "1", "3", ""], n),
+        "소방서거리": np.where(rng.random(n) < 0.05, np.nan, rng.uniform(0, 12000, n)),
+        "소방용수시설거리": np.where(rng.random(n) < 0.05, np.nan, rng.uniform(0, 200, n)),
+        "구군": rng.choice(["중구", "동구", ""], n),
+        "ADM_DR_NM": rng.choice(["가동", "나동"], n),
+    })
+    path = str(tmp_path / "건축물대장_v0.4.csv")
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+    return path
+
+
+def _reference(src, model):
+    df = pd.read_csv(src, dtype=str, encoding="utf-8-sig")
+    for c in model.components:
+        if c.kind == "distance":
+            df[c.column] = df[c.column].astype(float)
+    scores = model.score(df)
+    df[model.names] = scores
+    df["종합점수"] = model.total(scores)
+    return df
+
+
+@pytest.mark.parametrize("chunksize", [7, 1000])
+def test_stream_matches_full_scoring(src, tmp_path, chunksize):
+    model = scoring_spec.load_scoring_model()
+    out = str(tmp_path / "건축물대장_v0.5.csv")
+    n_rows, aggregates = stream_score_csv(src, out, model, chunksize=chunksize)
+    expected = _reference(src, model)
+
+    assert n_rows == len(expected) and not os.path.exists(out + ".tmp")
+    got = pd.read_csv(out, dtype=str, encoding="utf-8-sig")
+    assert list(got.columns) == list(expected.columns)
+    # 원본 컬럼은 읽은 문자열 그대로
+    pd.testing.assert_series_equal(got["사용승인년도"], expected["사용승인년도"])
+    for col in [*model.names, "종합점수"]:
+        np.testing.assert_allclose(got[col].astype(float), expected[col].astype(float), equal_nan=True)
+
+    # 누적 집계 = 전체 결과의 groupby
+    for name, keys in (("구군", ["구군"]), ("동", ["구군", "ADM_DR_NM"])):
+        g = expected.groupby(keys, dropna=True)
+        table = aggregates.result(name).set_index(keys)
+        np.testing.assert_allclose(table["종합점수_평균"], g["종합점수"].mean().sort_index(), equal_nan=True)
+        np.testing.assert_array_equal(table["건물수"], g.size().sort_index())
+
+
+def test_write_aggregates(src, tmp_path):
+    model = scoring_spec.load_scoring_model()
+    out = str(tmp_path / "건축물대장_v0.5.csv")
+    _, aggregates = stream_score_csv(src, out, model, chunksize=50)
+    paths = write_aggregates(aggregates, out)
+    assert set(paths) == {"구군", "동"}
+    table = pd.read_csv(paths["동"], encoding="utf-8-sig")
+    assert {"구군", "ADM_DR_NM", "종합점수_평균", "건물수"} <= set(table.columns)
+
+
+def test_running_aggregates_without_chunks():
+    empty = RunningAggregates(["점수"], {"구군": ["구군"]}).result("구군")
+    assert empty.empty and list(empty.columns) == ["구군", "점수_평균", "건물수"]
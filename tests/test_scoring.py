@@ -0,0 +1,166 @@
+import math
+import re
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import scoring
+
+# 숫자/문자열/결측이 섞인 입력 (연도/층수/개수 파서 공통)
+MIXED_VALUES = [
+    None, np.nan, pd.NA, "", "  ", 0, 1, 3, 4.7, -2, 12, 25, 40, "1985", "1985.0", "+1985", "1,985.0",
+    "1985-01-01", "2030", "1700", "지상 12층", "-3", "B2", "B3F", "b 1", "지하3층", "지하 2", "１２", "abc",
+    "2", "5", "7대",
+]
+
+
+# ---- 값 하나씩 파싱하는 기준 구현 (벡터화 파서와 결과가 같아야 함, None = 값 없음) ----
+def _text(value):
+    if value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    s = str(value).strip()
+    return s or None
+
+
+def _number_text(s):
+    s_num = s.replace(",", "")
+    return int(float(s_num)) if re.fullmatch(r"[+-]?\d+(\.\d+)?", s_num) else None
+
+
+def ref_year(value):
+    s = _text(value)
+    if s is None or isinstance(s, (int, float)):
+        return None if s is None else int(s)
+    n = _number_text(s)
+    if n is not None:
+        return n
+    m = re.search(r"(\d{4})", s)
+    return int(m.group(1)) if m else None
+
+
+def ref_floors(value):
+    s = _text(value)
+    if s is None:
+        return None
+    if isinstance(s, (int, float)):
+        n = int(float(s))
+    else:
+        n = _number_text(s)
+        if n is None:
+            m = re.search(r"(-?\d+)", s)
+            n = int(m.group(1)) if m else None
+    return n if n is not None and n >= 0 else None
+
+
+def ref_basement(value):
+    s = _text(value)
+    if s is None:
+        return None
+    if isinstance(s, (int, float)):
+        return abs(int(float(s)))
+    for pattern, text, match in ((r"[Bb]\s*(\d+)\s*[Ff]?", s, re.fullmatch), (r"지하\s*(\d+)", s, re.search),
+                                 (r"(-?\d+)", s.replace(",", ""), re.search)):
+        m = match(pattern, text)
+        if m:
+            return abs(int(m.group(1)))
+    return None
+
+
+def ref_count(value):
+    s = _text(value)
+    if s is None:
+        return None
+    if isinstance(s, (int, float)):
+        n = int(float(s))
+        return n if n >= 0 else None
+    m = re.search(r"(\d+)", s.replace(",", ""))
+    return int(m.group(1)) if m else None
+
+
+def ref_bin(x, bins, scores, edge="upper"):
+    i = sum(x >= b if edge == "upper" else x > b for b in bins)
+    return scores[i]
+
+
+PARSERS = {
+    "years": (scoring._parse_years, ref_year),
+    "floors": (scoring._parse_floor_counts, ref_floors),
+    "basement": (scoring._parse_basement_floor_counts, ref_basement),
+    "count": (scoring._parse_nonneg_int_counts, ref_count),
+}
+
+
+@pytest.mark.parametrize("name", list(PARSERS))
+def test_parsers_match_reference(name):
+    vector, ref = PARSERS[name]
+    values = [v for v in MIXED_VALUES if _text(v) is not None]  # 결측은 _score_by_value가 먼저 거름
+    expected = np.array([np.nan if ref(v) is None else ref(v) for v in values], dtype=float)
+    np.testing.assert_array_equal(vector(np.asarray(values, dtype=object)), expected)
+
+
+@pytest.mark.parametrize("parser", ["floors", "basement", "count"])
+def test_count_scores(parser):
+    bins, scores = [1, 3, 10], [0.0, 1.0, 2.0, 3.0]
+    ref = PARSERS[parser][1] if parser != "count" else ref_count
+    expected = [-1.0 if ref(v) is None else ref_bin(ref(v), bins, scores) for v in MIXED_VALUES]
+    got = scoring.count_scores(pd.Series(MIXED_VALUES, dtype=object), parser, bins, scores, missing=-1.0)
+    np.testing.assert_array_equal(got, expected)
+
+
+def test_aging_scores():
+    bins, scores, year = [10, 20, 30, 40], [1, 2, 3, 4, 5], date.today().year
+
+    def ref(v):
+        y = ref_year(v)
+        if y is None or y > year or y < 1800:
+            return 0
+        return ref_bin(year - y, bins, scores)
+
+    got = scoring.aging_scores(pd.Series(MIXED_VALUES, dtype=object), bins, scores, min_year=1800, missing=0)
+    np.testing.assert_array_equal(got, [ref(v) for v in MIXED_VALUES])
+    assert got.dtype.kind == "i"  # 정수 점수 → 정수 컬럼
+    categorical = pd.Series(["1985", None, "2001", "1985"], dtype="category")
+    np.testing.assert_array_equal(scoring.aging_scores(categorical, bins, scores),
+                                  [ref(v) for v in categorical.astype(object)])
+
+
+def test_lookup_scores():
+    table = {"공동주택": 2.0, "공장": 8.0}
+    keywords = [(("목", "통나무"), 5.0), (("콘크리트",), 0.5)]
+    values = [None, np.nan, "", " 공동주택 ", "공장", "일반목구조", "철근콘크리트 목조", "콘크리트", "없음", 3]
+    # 결측/빈 문자열/표와 키워드에 없는 값은 default, 키워드는 앞에서부터 처음 맞는 것
+    expected = [9.0, 9.0, 9.0, 2.0, 8.0, 5.0, 5.0, 0.5, 9.0, 9.0]
+    got = scoring.lookup_scores(pd.Series(values, dtype=object), table, keywords, default=9.0)
+    np.testing.assert_array_equal(got, expected)
+
+
+def test_distance_scores():
+    dist = np.array([np.nan, -1.0, 0.0, 30.0, 30.5, 200.0])
+    upper = scoring.distance_scores(dist, [30, 60], [1.0, 2.0, 3.0], edge="upper", missing=9.0)
+    lower = scoring.distance_scores(dist, [30, 60], [1.0, 2.0, 3.0], edge="lower", missing=np.nan)
+    np.testing.assert_array_equal(upper, [9.0, 9.0, 1.0, 2.0, 2.0, 3.0])
+    np.testing.assert_array_equal(lower, [np.nan, np.nan, 1.0, 1.0, 2.0, 3.0])
+    keep = scoring.distance_scores(dist, [30, 60], [1.0, 2.0, 3.0], invalid_to_nan=False, missing=9.0)
+    assert keep[1] == 1.0
+    with pytest.raises(ValueError):
+        scoring.distance_scores(dist, [30, 60], [1.0, 2.0])
+
+
+@pytest.mark.parametrize("kernel", [
+    lambda v: scoring.aging_scores(v, [10], [1, 2], missing=7),
+    lambda v: scoring.count_scores(v, "floors", [1], [0, 1], missing=7),
+    lambda v: scoring.count_scores(v, "basement", [1], [0, 1], missing=7),
+    lambda v: scoring.count_scores(v, "count", [1], [0.0, 1.0], missing=7),
+    lambda v: scoring.lookup_scores(v, {"a": 1.0}, [(("b",), 2.0)], default=7),
+], ids=["age", "floors", "basement", "count", "lookup"])
+@pytest.mark.parametrize("values", [
+    pd.Series([np.nan] * 4),
+    pd.Series([None] * 4, dtype=object),
+    pd.Series([], dtype=object),
+], ids=["nan", "none", "empty"])
+def test_all_missing_column(kernel, values):
+    np.testing.assert_array_equal(kernel(values), np.full(len(values), 7.0))
@@ -0,0 +1,118 @@
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import scoring_spec
+from scoring_spec import compile_spec
+
+needs_yaml = pytest.mark.skipif(not scoring_spec.HAS_YAML, reason="PyYAML 없음")
+
+YEAR = date.today().year
+
+# 기본 점수 정의(scoring_spec.yaml)로 손으로 계산한 기대 점수
+BUILDINGS = pd.DataFrame({
+    "사용승인년도": [str(YEAR - 45), None, f"{YEAR - 15}-03-01", "2100"],
+    "지상층수": [3, "지상 12층", 35, None],
+    "지하층수": ["B1", 0, "지하 3층", "x"],
+    "주용도코드명": ["공동주택", "공장", "없는용도", " 숙박시설 "],
+    "구조코드명": ["철근콘크리트구조", "벽돌구조", "경량철골조", "통나무집"],
+    "비상용승강기수": [0, 2, "7대", None],
+    "소방서거리": [500.0, 3000.0, np.nan, -5.0],
+    "소방용수시설거리": [30.0, 61.0, 200.0, np.nan],
+})
+EXPECTED = pd.DataFrame({
+    "건물노후도점수": [5, 0, 2, 0],
+    "지상층수점수": [1, 3, 5, 0],
+    "지하층수점수": [1, 0, 3, 0],
+    "주용도점수": [2.0, 8.0, 0.0, 9.0],
+    "구조점수": [0.0, 4.0, 2.0, 5.0],          # 표에 없는 구조명은 키워드(철골/통나무)
+    "비상용승강기점수": [5.0, 3.0, 0.0, 0.0],
+    "소방서거리점수": [1.0, 3.0, 5.0, 5.0],     # 경계값은 위 구간, 거리 없음/음수는 5
+    "소방용수시설거리점수": [1.0, 3.0, 5.0, np.nan],  # 경계값은 아래 구간, 거리 없음은 NaN
+})
+
+
+def _spec(**component):
+    return {"components": {"점수": {"column": "값", **component}}}
+
+
+@needs_yaml
+def test_shipped_spec_scores():
+    model = scoring_spec.load_scoring_model()
+    assert model.names == list(EXPECTED.columns)
+    scores = model.score(BUILDINGS)
+    pd.testing.assert_frame_equal(scores, EXPECTED, check_dtype=False)
+    # 정수 점수 정의는 정수 컬럼 (기존 v0.5와 같은 타입)
+    assert [scores[c].dtype.kind for c in model.names[:3]] == ["i", "i", "i"]
+    np.testing.assert_array_equal(model.total(scores), [16.0, 24.0, 22.0, np.nan])
+
+
+def test_weighted_total_and_signature():
+    spec = {"components": {
+        "a": {"column": "x", "kind": "distance", "bins": [10], "scores": [1.0, 2.0]},
+        "b": {"column": "y", "kind": "distance", "bins": [10], "scores": [1.0, 2.0], "weight": 3},
+    }}
+    model = compile_spec(spec)
+    df = pd.DataFrame({"x": [5.0, 20.0, np.nan], "y": [20.0, 5.0, 5.0]})
+    scores = model.score(df)
+    np.testing.assert_array_equal(model.total(scores), [7.0, 5.0, 3.0])  # x 결측 → missing 0
+    np.testing.assert_array_equal(model.total(scores, {"a": 1, "b": 1}), [3.0, 3.0, 1.0])
+    with pytest.raises(ValueError):
+        model.total(scores, {"a": 1})
+
+    # 가중치만 다르면 signature 같음, 구간이 다르면 다름
+    spec["components"]["b"]["weight"] = 5
+    assert compile_spec(spec).signature == model.signature
+    spec["components"]["b"]["bins"] = [20]
+    assert compile_spec(spec).signature != model.signature
+
+
+@pytest.mark.parametrize("spec", [
+    {"components": {}},
+    {"components": {"점수": {"kind": "distance", "bins": [1], "scores": [0, 1]}}},  # column 없음
+    _spec(kind="unknown"),
+    _spec(kind="distance", bins=[2, 1], scores=[0, 1, 2]),
+    _spec(kind="distance", bins=[1, 2], scores=[0, 1]),
+    _spec(kind="distance", bins=[1], scores=[0, 1], edge="middle"),
+    _spec(kind="distance", bins=[1], scores=[0, 1], parser="floors"),
+    _spec(kind="count", parser="rooms", bins=[1], scores=[0, 1]),
+    _spec(kind="lookup", table={1.0: ["a"], 2.0: ["a"]}),
+], ids=["empty", "no-column", "kind", "bins-order", "scores-length", "edge", "extra-key", "parser",
+        "duplicate-value"])
+def test_invalid_spec(spec):
+    with pytest.raises(ValueError):
+        compile_spec(spec)
+
+
+def test_missing_source_column_raises_keyerror():
+    model = compile_spec(_spec(kind="distance", bins=[1], scores=[0, 1]))
+    with pytest.raises(KeyError):
+        model.score(pd.DataFrame({"다른컬럼": [1.0]}))
+
+
+def test_describe_lists_every_component():
+    model = compile_spec({"components": {
+        "a": {"column": "x", "kind": "lookup", "table": {1.0: ["가"]}, "keywords": [[2.0, ["나"]]]},
+        "b": {"column": "y", "kind": "age", "bins": [10], "scores": [1, 2], "weight": 2},
+    }})
+    text = model.describe()
+    assert "**a** (x)" in text and "**b** (y)" in text and "가중합" in text
+
+
+@needs_yaml
+def test_load_scoring_model_reloads_on_change(tmp_path):
+    path = str(tmp_path / "spec.yaml")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("components:\n  a: {column: x, kind: distance, bins: [10], scores: [1.0, 2.0]}\n")
+    first = scoring_spec.load_scoring_model(path)
+    assert scoring_spec.load_scoring_model(path) is first
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("components:\n  a: {column: x, kind: distance, bins: [10], scores: [1.0, 2.0], weight: 2}\n")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    second = scoring_spec.load_scoring_model(path)
+    assert second is not first and second.weights["a"] == 2.0